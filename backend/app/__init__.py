@@ -1,7 +1,8 @@
 """
 Flask Application Factory
 """
-from flask import Flask, jsonify
+import hmac
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from app.config import config, Config
 
@@ -22,28 +23,61 @@ def create_app(config_name='development'):
         r"/api/*": {
             "origins": Config.CORS_ORIGINS,
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization", "If-None-Match"],
+            "expose_headers": ["ETag", "Server-Timing"]
         }
     })
     
+    # Request latency and database round-trip metrics
+    from app.middleware.metrics import init_metrics
+    init_metrics(app)
+    
+    # Keep caches and change feeds consistent across worker processes
+    if Config.BROADCAST_DATABASE_URL:
+        from app.services.supabase import SupabaseService
+        SupabaseService.start_broadcast()
+    
+    # Background job workers (jobs left queued by an earlier process resume here)
+    if Config.JOB_WORKERS:
+        from app.services.supabase import SupabaseService
+        SupabaseService.get_jobs().start()
+    
     # Register blueprints
     from app.routes.auth import auth_bp
     from app.routes.projects import projects_bp
     from app.routes.tasks import tasks_bp
     from app.routes.members import members_bp
     from app.routes.files import files_bp
+    from app.routes.dashboard import dashboard_bp
+    from app.routes.search import search_bp
+    from app.routes.jobs import jobs_bp
     
     app.register_blueprint(auth_bp, url_prefix=f"{Config.API_PREFIX}/auth")
     app.register_blueprint(projects_bp, url_prefix=f"{Config.API_PREFIX}/projects")
     app.register_blueprint(tasks_bp, url_prefix=f"{Config.API_PREFIX}")
     app.register_blueprint(members_bp, url_prefix=f"{Config.API_PREFIX}")
     app.register_blueprint(files_bp, url_prefix=f"{Config.API_PREFIX}")
+    app.register_blueprint(dashboard_bp, url_prefix=f"{Config.API_PREFIX}")
+    app.register_blueprint(search_bp, url_prefix=f"{Config.API_PREFIX}")
+    app.register_blueprint(jobs_bp, url_prefix=f"{Config.API_PREFIX}")
     
     # Health check endpoint
     @app.route('/health')
     def health():
         return jsonify({'status': 'healthy'}), 200
     
+    # Prometheus metrics endpoint
+    @app.route('/metrics')
+    def prometheus_metrics():
+        from app.services.metrics import REGISTRY
+        
+        if Config.METRICS_TOKEN:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            if not hmac.compare_digest(supplied, Config.METRICS_TOKEN):
+                return jsonify({'error': 'Unauthorized'}), 401
+        
+        return Response(REGISTRY.render(), content_type=REGISTRY.content_type)
+    
     # Root endpoint
     @app.route('/')
     def index():
@@ -55,7 +89,8 @@ def create_app(config_name='development'):
                 'projects': f"{Config.API_PREFIX}/projects",
                 'tasks': f"{Config.API_PREFIX}/tasks",
                 'members': f"{Config.API_PREFIX}/members",
-                'files': f"{Config.API_PREFIX}/files"
+                'files': f"{Config.API_PREFIX}/files",
+                'dashboard': f"{Config.API_PREFIX}/dashboard"
             }
         }), 200
     
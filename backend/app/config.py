@@ -20,24 +20,140 @@ class Config:
     SUPABASE_KEY = os.getenv('SUPABASE_KEY')
     SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
     
+    # Supabase HTTP transport
+    SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', 100))
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('SUPABASE_MAX_KEEPALIVE_CONNECTIONS', 20))
+    SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', 30))
+    SUPABASE_HTTP2 = os.getenv('SUPABASE_HTTP2', 'true').lower() == 'true'
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT', 5))
+    SUPABASE_READ_TIMEOUT = float(os.getenv('SUPABASE_READ_TIMEOUT', 30))
+    # 'process' shares one client per process; 'thread' gives each worker thread its own
+    SUPABASE_CLIENT_SCOPE = os.getenv('SUPABASE_CLIENT_SCOPE', 'process')
+    
+    # Database engine: 'postgrest' (Supabase REST API) or 'postgres' (direct connection;
+    # file storage still goes through SUPABASE_URL/SUPABASE_KEY)
+    DB_ENGINE = os.getenv('DB_ENGINE', 'postgrest').lower()
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    DATABASE_POOL_MIN_SIZE = int(os.getenv('DATABASE_POOL_MIN_SIZE', 2))
+    DATABASE_POOL_MAX_SIZE = int(os.getenv('DATABASE_POOL_MAX_SIZE', 20))
+    # Executions before a statement is prepared server-side; 'none' disables (e.g. behind PgBouncer)
+    DATABASE_PREPARE_THRESHOLD = os.getenv('DATABASE_PREPARE_THRESHOLD', '2')
+    DATABASE_PREPARE_THRESHOLD = (
+        None if DATABASE_PREPARE_THRESHOLD.lower() == 'none' else int(DATABASE_PREPARE_THRESHOLD)
+    )
+    
     # CORS
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:5173').split(',')
     
     # File Upload
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf', 'doc', 'docx', 'xls', 'xlsx', 'txt'}
+    STORAGE_BUCKET = os.getenv('STORAGE_BUCKET', 'project-files')
+    MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 10 * 1024 * 1024))  # 10MB
+    ALLOWED_EXTENSIONS = set(os.getenv(
+        'ALLOWED_EXTENSIONS', 'png,jpg,jpeg,gif,pdf,doc,docx,xls,xlsx,txt'
+    ).lower().split(','))
+    # Files larger than this go up in resumable chunks of this size (Supabase TUS uses 6MB)
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 6 * 1024 * 1024))
+    # Signed upload tokens are valid for 2 hours; sessions expire with them
+    UPLOAD_SESSION_TTL = float(os.getenv('UPLOAD_SESSION_TTL', 2 * 60 * 60))
+    # Objects per storage remove call when purging (Supabase Storage accepts up to 1000)
+    STORAGE_REMOVE_BATCH_SIZE = int(os.getenv('STORAGE_REMOVE_BATCH_SIZE', 1000))
+    
+    # Background jobs (storage cleanup): a SQLite file shared by the processes of one host.
+    # JOB_WORKERS=0 only queues jobs; run worker.py to process them
+    JOB_DB_PATH = os.getenv('JOB_DB_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'jobs.sqlite3'))
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 10))
+    # Retry backoff doubles from JOB_RETRY_DELAY up to JOB_RETRY_MAX_DELAY seconds
+    JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', 5))
+    JOB_RETRY_MAX_DELAY = float(os.getenv('JOB_RETRY_MAX_DELAY', 3600))
+    # A job not finished within its lease (e.g. its process died) runs again
+    JOB_LEASE = float(os.getenv('JOB_LEASE', 300))
+    JOB_RETENTION_DAYS = float(os.getenv('JOB_RETENTION_DAYS', 7))
     
     # API
     API_PREFIX = '/api'
+    PAGE_DEFAULT_LIMIT = int(os.getenv('PAGE_DEFAULT_LIMIT', 100))
+    PAGE_MAX_LIMIT = int(os.getenv('PAGE_MAX_LIMIT', 500))
+    BATCH_MAX_OPERATIONS = int(os.getenv('BATCH_MAX_OPERATIONS', 500))
+    # Assigned tasks included in GET /api/dashboard (the rest via /my-tasks?cursor=)
+    DASHBOARD_TASK_LIMIT = int(os.getenv('DASHBOARD_TASK_LIMIT', 50))
+    # Rows per query when streaming a project export
+    EXPORT_PAGE_SIZE = int(os.getenv('EXPORT_PAGE_SIZE', 500))
+    # Task import: rows per insert, and how many row errors the summary lists
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 100))
+    
+    # Async data path
+    ASYNC_QUERY_TIMEOUT = float(os.getenv('ASYNC_QUERY_TIMEOUT', 30))
+    ASGI_WORKER_THREADS = int(os.getenv('ASGI_WORKER_THREADS', 32))
+    
+    # Caching
+    # Cache invalidations and change events reach the app's other processes by
+    # LISTEN/NOTIFY on this database (a session connection, not a transaction pooler)
+    BROADCAST_DATABASE_URL = os.getenv('BROADCAST_DATABASE_URL', DATABASE_URL)
+    ACCESS_CACHE_SIZE = int(os.getenv('ACCESS_CACHE_SIZE', 4096))
+    ACCESS_CACHE_TTL = float(os.getenv('ACCESS_CACHE_TTL', 60))
+    PROJECT_INDEX_CACHE_SIZE = int(os.getenv('PROJECT_INDEX_CACHE_SIZE', 4096))
+    PROJECT_INDEX_CACHE_TTL = float(os.getenv('PROJECT_INDEX_CACHE_TTL', 10))
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    TOKEN_CACHE_TTL = float(os.getenv('TOKEN_CACHE_TTL', 300))
+    # Write-through task lists: total rows held, TTL for writes made elsewhere, largest project cached
+    TASK_CACHE_ROWS = int(os.getenv('TASK_CACHE_ROWS', 50000))
+    TASK_CACHE_TTL = float(os.getenv('TASK_CACHE_TTL', 10))
+    TASK_CACHE_PROJECT_ROWS = int(os.getenv('TASK_CACHE_PROJECT_ROWS', 5000))
+    
+    # Task delta sync (?since=): tombstone retention (at most the 30 days kept by
+    # migrations/0004_task_sync.sql) and how far each cursor reaches back for late commits
+    TASK_SYNC_RETENTION_DAYS = float(os.getenv('TASK_SYNC_RETENTION_DAYS', 30))
+    TASK_SYNC_OVERLAP = float(os.getenv('TASK_SYNC_OVERLAP', 5))
+    
+    # Search (GET /api/search): page size and how deep results can be paged
+    SEARCH_DEFAULT_LIMIT = int(os.getenv('SEARCH_DEFAULT_LIMIT', 20))
+    SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 500))
+    SEARCH_MAX_QUERY_LENGTH = int(os.getenv('SEARCH_MAX_QUERY_LENGTH', 200))
+    
+    # Realtime change feed (served by asgi.py)
+    REALTIME_QUEUE_SIZE = int(os.getenv('REALTIME_QUEUE_SIZE', 256))
+    REALTIME_BACKLOG = int(os.getenv('REALTIME_BACKLOG', 100))
+    REALTIME_IDLE_CHANNELS = int(os.getenv('REALTIME_IDLE_CHANNELS', 1024))
+    REALTIME_HEARTBEAT = float(os.getenv('REALTIME_HEARTBEAT', 25))
+    
+    # Metrics: when set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'true').lower() == 'true'
+    # Requests at least this slow are logged with their phase breakdown (0 disables)
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 1000))
+    SLOW_REQUEST_SAMPLE_RATE = float(os.getenv('SLOW_REQUEST_SAMPLE_RATE', 1.0))
     
     @staticmethod
     def validate():
         """Validate required configuration"""
-        required_vars = ['SUPABASE_URL', 'SUPABASE_KEY']
+        if Config.DB_ENGINE not in ('postgrest', 'postgres'):
+            raise ValueError(f"DB_ENGINE must be 'postgrest' or 'postgres', not '{Config.DB_ENGINE}'")
+        
+        # With DB_ENGINE=postgres only file storage needs the Supabase API;
+        # require_supabase() checks for it when storage is first used
+        if Config.DB_ENGINE == 'postgres':
+            required_vars = ['DATABASE_URL']
+        else:
+            required_vars = ['SUPABASE_URL', 'SUPABASE_KEY']
+        
         missing = [var for var in required_vars if not os.getenv(var)]
         
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+    
+    @staticmethod
+    def require_supabase():
+        """Check the Supabase API settings before a client is created (a server
+        error, so RuntimeError rather than the ValueError of a bad request)"""
+        missing = [var for var in ('SUPABASE_URL', 'SUPABASE_KEY') if not getattr(Config, var)]
+        
+        if missing:
+            message = f"Missing required environment variables: {', '.join(missing)}"
+            if Config.DB_ENGINE == 'postgres':
+                message += ' (file storage uses the Supabase API even with DB_ENGINE=postgres)'
+            raise RuntimeError(message)
 
 
 class DevelopmentConfig(Config):
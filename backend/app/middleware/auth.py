@@ -4,6 +4,7 @@ Authentication Middleware
 from functools import wraps
 from flask import request, jsonify
 from app.services.supabase import SupabaseService
+from app.services.metrics import phase
 
 
 def require_auth(f):
@@ -23,14 +24,15 @@ def require_auth(f):
             return jsonify({'error': 'Invalid authorization header format'}), 401
         
         # Verify token with Supabase
-        user = SupabaseService.verify_user(token)
+        with phase('auth'):
+            user = SupabaseService.verify_user(token)
         
         if not user:
             return jsonify({'error': 'Invalid or expired token'}), 401
         
         # Attach user to request
-        request.user = user.user
-        request.user_id = user.user.id
+        request.user = user
+        request.user_id = user.id
         
         return f(*args, **kwargs)
     
@@ -0,0 +1,59 @@
+"""
+Conditional GET Middleware
+"""
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from app.middleware.auth import get_current_user_id
+
+
+def etag(f=None, *, version=None):
+    """Decorator adding a strong ETag and If-None-Match handling.
+
+    Successful GET responses get an ETag computed from the serialized body;
+    a request whose If-None-Match matches receives 304 with no body.
+
+    With version (called with the view's arguments, returning a validator
+    of the underlying data or None), the ETag is derived from the validator,
+    the user and the URL instead, and a matching request gets its 304
+    before the view runs.
+    """
+    if f is None:
+        return lambda f: etag(f, version=version)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        tag = None
+        if version is not None and request.method in ('GET', 'HEAD'):
+            validator = version(*args, **kwargs)
+            if validator is not None:
+                tag = _tag(validator)
+                if tag in request.if_none_match:
+                    return _conditional(make_response('', 200), tag)
+
+        response = make_response(f(*args, **kwargs))
+
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            _conditional(response, tag)
+
+        return response
+
+    return decorated_function
+
+
+def _tag(validator: str) -> str:
+    """ETag for a data validator as seen by this user at this URL"""
+    key = '\0'.join((validator, str(get_current_user_id()), request.full_path))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _conditional(response, tag=None):
+    if tag is None:
+        response.add_etag()
+    else:
+        response.set_etag(tag)
+    response.vary.add('Authorization')
+    # Per-user data: browsers may keep it but must revalidate
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
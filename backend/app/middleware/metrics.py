@@ -0,0 +1,91 @@
+"""
+Request Metrics Middleware
+"""
+import json
+import random
+import time
+from flask import g, request
+from flask.json.provider import DefaultJSONProvider
+from app.config import Config
+from app.services import metrics
+
+# Server-Timing phases in display order
+PHASES = ('auth', 'access-check', 'query', 'serialize')
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider timing response encoding as the 'serialize' phase"""
+
+    def dumps(self, obj, **kwargs):
+        with metrics.phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+def server_timing(log: metrics.RequestLog, total: float) -> str:
+    """Server-Timing header value for a request"""
+    entries = []
+    for name in PHASES:
+        seconds = log.timings.get(name)
+        if seconds is None:
+            continue
+        entries.append(f'{name};dur={seconds * 1000:.1f}')
+    entries.append(f'total;dur={total * 1000:.1f};desc="{log.count} db round trips"')
+    return ', '.join(entries)
+
+
+def log_slow_request(log: metrics.RequestLog, total: float, status: int):
+    """Write one structured (JSON) line describing a slow request"""
+    print(json.dumps({
+        'event': 'slow_request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': log.endpoint,
+        'status': status,
+        'user_id': getattr(request, 'user_id', None),
+        'duration_ms': round(total * 1000, 1),
+        'phases_ms': {name: round(seconds * 1000, 1) for name, seconds in log.timings.items()},
+        'queries': log.count,
+        'query_breakdown': {f'{table}.{operation}': n for (table, operation), n in sorted(log.queries.items())}
+    }), flush=True)
+
+
+def init_metrics(app):
+    """Record request latency per endpoint and database round trips per request.
+
+    Also adds a Server-Timing header (auth, access-check, query, serialize)
+    and logs requests slower than Config.SLOW_REQUEST_MS.
+    """
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        g.metrics_token = metrics.begin_request(request.endpoint or 'unmatched')
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+
+        total = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'
+        metrics.HTTP_DURATION.observe(total, endpoint=endpoint, method=request.method)
+        metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+
+        log = metrics.current_log()
+        if log is not None:
+            if Config.SERVER_TIMING:
+                response.headers['Server-Timing'] = server_timing(log, total)
+
+            if (Config.SLOW_REQUEST_MS and total * 1000 >= Config.SLOW_REQUEST_MS
+                    and random.random() < Config.SLOW_REQUEST_SAMPLE_RATE):
+                log_slow_request(log, total, response.status_code)
+
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(error=None):
+        token = g.pop('metrics_token', None)
+        if token is not None:
+            metrics.end_request(token)
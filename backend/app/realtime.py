@@ -0,0 +1,204 @@
+"""
+Realtime - WebSocket and Server-Sent Events feed of a project's changes
+
+    GET /api/projects/<id>/events
+
+A WebSocket upgrade receives one JSON event per message; a plain GET
+receives text/event-stream (the fallback where WebSockets are blocked).
+Both authenticate with the same Supabase JWT as require_auth, sent as the
+Authorization header, as the WebSocket subprotocols ["bearer", <token>], or
+as ?access_token= (browsers cannot set headers on WebSocket or EventSource).
+Reconnecting clients resume with ?since=<last event id> or Last-Event-ID.
+
+Served by the ASGI entry point (asgi.py): subscribers wait on the server's
+event loop instead of holding one of the Flask worker threads.
+"""
+import asyncio
+import re
+import time
+from urllib.parse import parse_qs
+from app.config import Config
+from app.services import events
+from app.services.access import GUEST_ROLE
+from app.services.supabase import SupabaseService
+
+EVENTS_PATH = re.compile(rf'{re.escape(Config.API_PREFIX)}/projects/(\d+)/events/?')
+
+# WebSocket close codes for final events (4000-4999 are application defined)
+CLOSE_CODES = {
+    events.RESYNC: 4409,
+    events.REVOKED: 4403,
+    events.EXPIRED: 4401,
+    events.PROJECT_DELETED: 4404
+}
+
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream'),
+    (b'cache-control', b'no-cache'),
+    # Stop nginx from buffering the stream
+    (b'x-accel-buffering', b'no')
+]
+
+
+def _credentials(headers: dict, query: dict) -> tuple:
+    """(token, subprotocol to accept) from the Authorization header, subprotocols or query"""
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    if authorization.startswith('Bearer '):
+        return authorization[7:], None
+
+    protocols = [p.strip() for p in headers.get(b'sec-websocket-protocol', b'').decode('latin-1').split(',')]
+    if len(protocols) == 2 and protocols[0] == 'bearer':
+        return protocols[1], 'bearer'
+
+    return (query.get('access_token') or [None])[0], None
+
+
+def _since(headers: dict, query: dict):
+    """Last event id the client saw (None for a fresh subscription)"""
+    value = (query.get('since') or [None])[0] or headers.get(b'last-event-id', b'').decode('latin-1')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+class RealtimeMiddleware:
+    """ASGI middleware serving project event streams; everything else goes to app"""
+
+    def __init__(self, app, bus: events.EventBus = None):
+        self.app = app
+        self.bus = bus or SupabaseService.get_events()
+
+    async def __call__(self, scope, receive, send):
+        match = None
+        if scope['type'] in ('http', 'websocket'):
+            match = EVENTS_PATH.fullmatch(scope['path'])
+
+        if scope['type'] == 'websocket':
+            if match is None:
+                await receive()
+                return await send({'type': 'websocket.close', 'code': 4404})
+            return await self._websocket(scope, receive, send, int(match.group(1)))
+
+        if match is not None and scope['method'] == 'GET':
+            return await self._sse(scope, receive, send, int(match.group(1)))
+
+        return await self.app(scope, receive, send)
+
+    async def _authorize(self, headers: dict, query: dict, project_id: int):
+        """(user, role, subprotocol, None) or (None, None, None, HTTP status)"""
+        origin = headers.get(b'origin', b'').decode('latin-1')
+        if origin and origin not in Config.CORS_ORIGINS:
+            return None, None, None, 403
+
+        token, subprotocol = _credentials(headers, query)
+        user = SupabaseService.verify_user(token) if token else None
+        if not user:
+            return None, None, None, 401
+
+        # Access checks may query the database; keep them off the event loop
+        role = await asyncio.to_thread(SupabaseService.get_reader_role, project_id, user.id, user.email)
+        if not role:
+            return None, None, None, 403
+
+        return user, role, subprotocol, None
+
+    def _subscribe(self, project_id: int, user, role: str, since, transport: str):
+        # Guests are revoked by email (EventBus.revoke_guest) when their invitation is removed
+        guest_email = user.email if role == GUEST_ROLE else None
+        return self.bus.subscribe(project_id, user.id, since, transport, guest_email)
+
+    async def _websocket(self, scope, receive, send, project_id: int):
+        if (await receive())['type'] != 'websocket.connect':
+            return
+
+        headers = dict(scope['headers'])
+        query = parse_qs(scope['query_string'].decode('latin-1'))
+        user, role, subprotocol, status = await self._authorize(headers, query, project_id)
+
+        if status:
+            # Closing before accept rejects the handshake with 403
+            return await send({'type': 'websocket.close', 'code': 4000 + status})
+
+        subscription = self._subscribe(project_id, user, role, _since(headers, query), 'websocket')
+        await send({'type': 'websocket.accept', 'subprotocol': subprotocol})
+
+        async def write(batch):
+            for event in batch:
+                await send({'type': 'websocket.send', 'text': event.json})
+            if batch[-1].final:
+                await send({'type': 'websocket.close', 'code': CLOSE_CODES.get(batch[-1].type, 1000)})
+
+        async def ping():
+            # The server sends WebSocket pings itself
+            pass
+
+        await self._pump(subscription, user, receive, 'websocket.disconnect', write, ping)
+
+    async def _sse(self, scope, receive, send, project_id: int):
+        headers = dict(scope['headers'])
+        query = parse_qs(scope['query_string'].decode('latin-1'))
+        user, role, _, status = await self._authorize(headers, query, project_id)
+
+        cors = []
+        if headers.get(b'origin', b'').decode('latin-1') in Config.CORS_ORIGINS:
+            cors = [(b'access-control-allow-origin', headers[b'origin']), (b'vary', b'Origin')]
+
+        if status:
+            await send({'type': 'http.response.start', 'status': status,
+                        'headers': [(b'content-type', b'application/json')] + cors})
+            error = 'Invalid or expired token' if status == 401 else 'Access denied'
+            return await send({'type': 'http.response.body', 'body': f'{{"error": "{error}"}}'.encode()})
+
+        subscription = self._subscribe(project_id, user, role, _since(headers, query), 'sse')
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS + cors})
+
+        async def write(batch):
+            # Everything queued goes out in one chunk
+            await send({
+                'type': 'http.response.body',
+                'body': b''.join(event.sse() for event in batch),
+                'more_body': not batch[-1].final
+            })
+
+        async def ping():
+            # Comment line keeps proxies from timing out an idle stream
+            await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+
+        await self._pump(subscription, user, receive, 'http.disconnect', write, ping)
+
+    async def _pump(self, subscription, user, receive, disconnect: str, write, ping):
+        """Forward events until the client leaves, the subscription ends or the token expires"""
+        async def until_disconnect():
+            while (await receive())['type'] != disconnect:
+                pass
+
+        leaving = asyncio.ensure_future(until_disconnect())
+        try:
+            while True:
+                timeout = Config.REALTIME_HEARTBEAT
+                if user.exp:
+                    timeout = min(timeout, user.exp - time.time())
+                if timeout <= 0:
+                    return await write([events.control(subscription.project_id, events.EXPIRED)])
+
+                getting = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait({getting, leaving}, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if getting not in done:
+                    getting.cancel()
+                    if leaving in done:
+                        return
+                    await ping()
+                    continue
+
+                batch = getting.result()
+                await write(batch)
+                if batch[-1].final:
+                    return
+        except OSError:
+            # Client disconnected mid-write
+            pass
+        finally:
+            leaving.cancel()
+            self.bus.unsubscribe(subscription)
@@ -0,0 +1,23 @@
+"""
+Dashboard Routes
+"""
+from flask import Blueprint, jsonify
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.middleware.etag import etag
+from app.services.supabase import SupabaseService
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+
+@dashboard_bp.route('/dashboard', methods=['GET'])
+@require_auth
+@etag
+def get_dashboard():
+    """Get the user's projects with task/member rollups and their assigned tasks in one response"""
+    user_id = get_current_user_id()
+    
+    try:
+        dashboard = SupabaseService.get_dashboard(user_id, email=get_current_user().email)
+        return jsonify(dashboard), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -2,20 +2,33 @@
 Files Routes
 """
 from flask import Blueprint, request, jsonify
-from app.middleware.auth import require_auth, get_current_user_id
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.middleware.etag import etag
 from app.services.supabase import SupabaseService
+from app.services.pagination import parse_page_args
+from app.services.fields import parse_fields
+from app.services.uploads import UploadError
 
 files_bp = Blueprint('files', __name__)
 
 
 @files_bp.route('/projects/<int:project_id>/files', methods=['GET'])
 @require_auth
+@etag
 def get_project_files(project_id):
-    """Get all files for a project"""
+    """Get files for a project (paginated with ?limit=&cursor=, narrowed with ?fields=)"""
     user_id = get_current_user_id()
     
     try:
-        files = SupabaseService.get_project_files(project_id, user_id)
+        limit, cursor = parse_page_args(request.args)
+        fields = parse_fields('files', request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        files = SupabaseService.get_project_files(
+            project_id, user_id, limit, cursor, fields, email=get_current_user().email
+        )
         
         if files is None:
             return jsonify({'error': 'Project not found or access denied'}), 404
@@ -25,50 +38,60 @@ def get_project_files(project_id):
         return jsonify({'error': str(e)}), 500
 
 
-@files_bp.route('/projects/<int:project_id>/files', methods=['POST'])
+@files_bp.route('/projects/<int:project_id>/uploads', methods=['POST'])
 @require_auth
-def upload_file(project_id):
-    """Upload file to project"""
+def create_upload(project_id):
+    """Start a direct-to-storage upload: returns a session with a signed upload URL"""
     user_id = get_current_user_id()
+    data = request.get_json() or {}
+    
+    # Validate required fields
+    required_fields = ['filename', 'file_size']
+    missing = [f for f in required_fields if f not in data]
+    if missing:
+        return jsonify({'error': f'Missing required fields: {missing}'}), 400
     
     try:
-        print(f"\n=== FILE UPLOAD DEBUG ===")
-        print(f"Project ID: {project_id}")
-        print(f"User ID: {user_id}")
-        
-        data = request.get_json()
-        print(f"Request Data Keys: {data.keys() if data else 'None'}")
-        print(f"Request Data: {data}")
+        session = SupabaseService.create_upload_session(project_id, data, user_id)
         
-        # Validate required fields
-        required_fields = ['filename', 'file_path', 'file_size']
-        if not all(field in data for field in required_fields):
-            missing = [f for f in required_fields if f not in data]
-            print(f"Missing fields: {missing}")
-            return jsonify({'error': f'Missing required fields: {missing}'}), 400
+        if not session:
+            return jsonify({'error': 'Project not found or access denied'}), 404
         
-        print(f"Calling SupabaseService.upload_file...")
+        return jsonify(session), 201
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@files_bp.route('/projects/<int:project_id>/files', methods=['POST'])
+@require_auth
+def upload_file(project_id):
+    """Upload file to project: finalize an upload session ({"session_id"}) or record metadata"""
+    user_id = get_current_user_id()
+    data = request.get_json() or {}
+    
+    # Validate required fields
+    required_fields = ['session_id'] if 'session_id' in data else ['filename', 'file_path', 'file_size']
+    missing = [f for f in required_fields if f not in data]
+    if missing:
+        return jsonify({'error': f'Missing required fields: {missing}'}), 400
+    
+    try:
         file_record = SupabaseService.upload_file(project_id, data, user_id)
         
-        print(f"File record result: {file_record}")
-        
         if not file_record:
-            print("File record is None - access denied or project not found")
             return jsonify({'error': 'Project not found or access denied'}), 404
         
-        print(f"Success! Returning file record")
         return jsonify(file_record), 201
-        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
     except Exception as e:
-        print(f"\n=== ERROR IN UPLOAD ===")
-        print(f"Error Type: {type(e).__name__}")
-        print(f"Error Message: {str(e)}")
-        
-        import traceback
-        print("\n=== FULL TRACEBACK ===")
-        traceback.print_exc()
-        print("=" * 50)
-        
+        print(f"File upload error: {type(e).__name__}: {e}")
         return jsonify({'error': str(e)}), 500
 
 @files_bp.route('/files/<int:file_id>', methods=['DELETE'])
@@ -78,21 +101,12 @@ def delete_file(file_id):
     user_id = get_current_user_id()
     
     try:
+        # The storage object is removed by a background job
         file_path = SupabaseService.delete_file(file_id, user_id)
         
         if not file_path:
             return jsonify({'error': 'File not found or access denied'}), 404
         
-        # Delete from Supabase Storage
-        client = SupabaseService.get_client()
-        bucket_name = 'project-files'
-        
-        try:
-            client.storage.from_(bucket_name).remove([file_path])
-        except Exception as storage_error:
-            # Log error but don't fail the request
-            print(f"Storage deletion error: {storage_error}")
-        
         return jsonify({'message': 'File deleted successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Job Routes
+"""
+from flask import Blueprint, jsonify
+from app.middleware.auth import require_auth, get_current_user_id
+from app.services.supabase import SupabaseService
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_job(job_id):
+    """Get status and progress of a background job (e.g. a project's storage purge)"""
+    user_id = get_current_user_id()
+    
+    try:
+        job = SupabaseService.get_job(job_id, user_id)
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -2,20 +2,33 @@
 Project Members Routes
 """
 from flask import Blueprint, request, jsonify
-from app.middleware.auth import require_auth, get_current_user_id
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.middleware.etag import etag
 from app.services.supabase import SupabaseService
+from app.services.supabase_async import AsyncSupabaseService
+from app.services.fields import parse_fields
 
 members_bp = Blueprint('members', __name__)
 
 
 @members_bp.route('/projects/<int:project_id>/members', methods=['GET'])
 @require_auth
+@etag
 def get_project_members(project_id):
-    """Get all members (auth + guest)"""
+    """Get all members (auth + guest), narrowed with ?fields="""
     user_id = get_current_user_id()
     
     try:
-        members = SupabaseService.get_all_project_members(project_id, user_id)
+        fields = parse_fields('members', request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        members = AsyncSupabaseService.run(
+            AsyncSupabaseService.get_all_project_members(
+                project_id, user_id, fields, email=get_current_user().email
+            )
+        )
         
         if members is None:
             return jsonify({'error': 'Project not found or access denied'}), 404
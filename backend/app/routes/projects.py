@@ -1,21 +1,34 @@
 """
 Projects Routes
 """
-from flask import Blueprint, request, jsonify
-from app.middleware.auth import require_auth, get_current_user_id
+from flask import Blueprint, Response, request, jsonify
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.middleware.etag import etag
 from app.services.supabase import SupabaseService
+from app.services.supabase_async import AsyncSupabaseService
+from app.services.fields import parse_fields
+from app.services.export import EXPORT_FORMATS, ndjson_lines, zip_export
 
 projects_bp = Blueprint('projects', __name__)
 
 
 @projects_bp.route('', methods=['GET'])
 @require_auth
+@etag
 def get_projects():
-    """Get all projects for current user"""
+    """Get all projects for current user (?fields= narrows the representation)"""
     user_id = get_current_user_id()
+    email = get_current_user().email
     
     try:
-        projects = SupabaseService.get_projects(user_id)
+        fields = parse_fields('projects', request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        projects = AsyncSupabaseService.run(
+            AsyncSupabaseService.get_projects(user_id, fields, email)
+        )
         return jsonify(projects), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -48,12 +61,13 @@ def create_project():
 
 @projects_bp.route('/<int:project_id>', methods=['GET'])
 @require_auth
+@etag
 def get_project(project_id):
     """Get project details"""
     user_id = get_current_user_id()
     
     try:
-        project = SupabaseService.get_project_by_id(project_id, user_id)
+        project = SupabaseService.get_project_by_id(project_id, user_id, get_current_user().email)
         
         if not project:
             return jsonify({'error': 'Project not found or access denied'}), 404
@@ -63,6 +77,24 @@ def get_project(project_id):
         return jsonify({'error': str(e)}), 500
 
 
+@projects_bp.route('/<int:project_id>/stats', methods=['GET'])
+@require_auth
+@etag
+def get_project_stats(project_id):
+    """Get project statistics"""
+    user_id = get_current_user_id()
+    
+    try:
+        stats = SupabaseService.get_project_stats(project_id, user_id, get_current_user().email)
+        
+        if stats is None:
+            return jsonify({'error': 'Project not found or access denied'}), 404
+        
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @projects_bp.route('/<int:project_id>', methods=['PUT'])
 @require_auth
 def update_project(project_id):
@@ -88,11 +120,48 @@ def delete_project(project_id):
     user_id = get_current_user_id()
     
     try:
-        success = SupabaseService.delete_project(project_id, user_id)
+        result = SupabaseService.delete_project(project_id, user_id)
         
-        if not success:
+        if not result:
             return jsonify({'error': 'Project not found or insufficient permissions'}), 404
         
-        return jsonify({'message': 'Project deleted successfully'}), 200
+        # Stored files are purged in the background (progress at GET /api/jobs/<purge_job_id>)
+        return jsonify({'message': 'Project deleted successfully', **result}), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+@projects_bp.route('/<int:project_id>/export', methods=['GET'])
+@require_auth
+def export_project(project_id):
+    """Stream a project export: NDJSON records, or ?format=zip with the stored files too"""
+    user_id = get_current_user_id()
+    email = get_current_user().email
+    export_format = request.args.get('format', 'ndjson')
+    
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    try:
+        records = SupabaseService.export_project(project_id, user_id, email=email)
+        
+        if records is None:
+            return jsonify({'error': 'Project not found or access denied'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    # Generated while the response is sent, one page of rows at a time
+    if export_format == 'zip':
+        body = zip_export(
+            records,
+            lambda: SupabaseService.export_project(project_id, user_id, ['file'], email) or (),
+            lambda file_path: SupabaseService.read_stored_file(project_id, file_path)
+        )
+        mimetype = 'application/zip'
+    else:
+        body = ndjson_lines(records)
+        mimetype = 'application/x-ndjson'
+    
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="project-{project_id}.{export_format}"'
+    })
@@ -0,0 +1,45 @@
+"""
+Search Routes
+"""
+from flask import Blueprint, request, jsonify
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.services.supabase import SupabaseService, SEARCH_TYPES
+from app.services.pagination import parse_page_args
+from app.config import Config
+
+search_bp = Blueprint('search', __name__)
+
+
+@search_bp.route('/search', methods=['GET'])
+@require_auth
+def search():
+    """Search tasks, files and project names (?q=, optional ?type=task,file,project, ?limit=&cursor=)"""
+    user_id = get_current_user_id()
+    query = (request.args.get('q') or '').strip()
+    types = request.args.get('type')
+    
+    # Validate query parameters
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    
+    if len(query) > Config.SEARCH_MAX_QUERY_LENGTH:
+        return jsonify({'error': f'q must be at most {Config.SEARCH_MAX_QUERY_LENGTH} characters'}), 400
+    
+    if types:
+        types = [t.strip() for t in types.split(',') if t.strip()]
+        unknown = [t for t in types if t not in SEARCH_TYPES]
+        if unknown:
+            return jsonify({'error': f"Unknown type: {', '.join(unknown)}"}), 400
+    
+    try:
+        limit, cursor = parse_page_args(request.args)
+        results = SupabaseService.search(user_id, query, get_current_user().email, types, limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    if results is None:
+        return jsonify({'error': 'Search is not available'}), 503
+    
+    return jsonify(results), 200
@@ -2,25 +2,68 @@
 Tasks Routes
 """
 from flask import Blueprint, request, jsonify
-from app.middleware.auth import require_auth, get_current_user_id
+from app.middleware.auth import require_auth, get_current_user, get_current_user_id
+from app.middleware.etag import etag
 from app.services.supabase import SupabaseService
+from app.services.pagination import parse_page_args, decode_sync_cursor
+from app.services.fields import parse_fields
+from app.services.filters import parse_task_filters, parse_task_sort
+from app.services.imports import parse_import_format, read_rows
+from app.config import Config
 
 tasks_bp = Blueprint('tasks', __name__)
 
 
+def task_list_version(project_id):
+    """Validator of a project's full task list (sync requests are not prechecked)"""
+    if 'since' in request.args:
+        return None
+    return SupabaseService.get_task_list_version(project_id, get_current_user_id(), get_current_user().email)
+
+
 @tasks_bp.route('/projects/<int:project_id>/tasks', methods=['GET'])
 @require_auth
+@etag(version=task_list_version)
 def get_project_tasks(project_id):
-    """Get all tasks for a project"""
+    """Get tasks for a project (paginated with ?limit=&cursor=, narrowed with ?fields=,
+    filtered with ?status=&priority=&assigned_to=&due_after=&due_before=&overdue=,
+    ordered with ?sort=).
+    
+    With ?since=<sync cursor> only the changes since that cursor are returned;
+    an empty ?since= returns the full list with a first cursor.
+    """
     user_id = get_current_user_id()
+    email = get_current_user().email
+    since = request.args.get('since')
     
     try:
-        tasks = SupabaseService.get_project_tasks(project_id, user_id)
+        limit, cursor = parse_page_args(request.args)
+        fields = parse_fields('tasks', request.args.get('fields'))
+        filters = parse_task_filters(request.args, user_id)
+        sort = parse_task_sort(request.args.get('sort'), None)
+        
+        if since is not None:
+            if limit is not None or filters is not None or sort is not None:
+                raise ValueError('since cannot be combined with limit, cursor, filters or sort')
+            since = decode_sync_cursor(since) if since else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        if 'since' in request.args:
+            tasks = SupabaseService.get_task_changes(project_id, user_id, since, fields, email)
+        else:
+            tasks = SupabaseService.get_project_tasks(
+                project_id, user_id, limit, cursor, fields, filters, sort, email
+            )
         
         if tasks is None:
             return jsonify({'error': 'Project not found or access denied'}), 404
         
         return jsonify(tasks), 200
+    except ValueError as e:
+        # Cursor that does not match the requested order
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -47,6 +90,68 @@ def create_task(project_id):
         return jsonify({'error': str(e)}), 500
 
 
+@tasks_bp.route('/projects/<int:project_id>/tasks/batch', methods=['POST'])
+@require_auth
+def batch_tasks(project_id):
+    """Apply a list of create/update/delete task operations"""
+    user_id = get_current_user_id()
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+    
+    # Validate request body
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations must be a non-empty list'}), 400
+    
+    if len(operations) > Config.BATCH_MAX_OPERATIONS:
+        return jsonify({'error': f'At most {Config.BATCH_MAX_OPERATIONS} operations per batch'}), 400
+    
+    try:
+        results = SupabaseService.batch_tasks(project_id, operations, user_id)
+        
+        if results is None:
+            return jsonify({'error': 'Project not found or access denied'}), 404
+        
+        return jsonify({'results': results}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@tasks_bp.route('/projects/<int:project_id>/tasks/import', methods=['POST'])
+@require_auth
+def import_tasks(project_id):
+    """Create tasks from a CSV or NDJSON file, sent as the request body or as a
+    multipart "file" (format from ?format=, the content type or the file name).
+    
+    Columns: title (required), description, status, priority, due_date, and
+    assignee (a member's email) or assigned_to (a user id). Rows are read as
+    they arrive and inserted in batches; invalid rows are reported by line.
+    """
+    user_id = get_current_user_id()
+    upload = request.files.get('file')
+    
+    if upload is not None:
+        stream, content_type, filename = upload.stream, upload.mimetype, upload.filename
+    elif request.content_length:
+        stream, content_type, filename = request.stream, request.mimetype, None
+    else:
+        return jsonify({'error': 'A CSV or NDJSON file is required'}), 400
+    
+    try:
+        import_format = parse_import_format(request.args.get('format'), content_type, filename)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        summary = SupabaseService.import_tasks(project_id, read_rows(stream, import_format), user_id)
+    
+        if summary is None:
+            return jsonify({'error': 'Project not found or access denied'}), 404
+    
+        return jsonify(summary), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @tasks_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 @require_auth
 def update_task(task_id):
@@ -84,12 +189,24 @@ def delete_task(task_id):
 
 @tasks_bp.route('/my-tasks', methods=['GET'])
 @require_auth
+@etag
 def get_my_tasks():
-    """Get all tasks assigned to current user"""
+    """Get tasks assigned to current user (paginated with ?limit=&cursor=, narrowed with ?fields=,
+    filtered and ordered like project tasks)"""
     user_id = get_current_user_id()
     
     try:
-        tasks = SupabaseService.get_user_tasks(user_id)
+        limit, cursor = parse_page_args(request.args)
+        fields = parse_fields('tasks', request.args.get('fields'))
+        filters = parse_task_filters(request.args, user_id)
+        sort = parse_task_sort(request.args.get('sort'), None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        tasks = SupabaseService.get_user_tasks(user_id, limit, cursor, fields, filters, sort)
         return jsonify(tasks), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+Project Access Resolver - cached "what is this user's role in project X"
+"""
+from app.services.broadcast import broadcast
+from app.services.cache import TTLCache
+from app.services.metrics import phase
+
+ADMIN_ROLES = ('owner', 'admin')
+
+# Read-only role of a user invited to a project as a guest (by email)
+GUEST_ROLE = 'guest'
+
+# Cached marker for "no such project" / "not a member" (None means "not cached")
+_NO_PROJECT = ''
+
+
+class ProjectAccessResolver:
+    """Resolve a user's effective role in a project from a bounded TTL/LRU cache.
+
+    Project creators resolve to 'owner'; everyone else gets their
+    project_members role, or None when they have no access. reader_role()
+    also lets in guests (matched by email) as 'guest', a role that no write
+    check accepts. Mutations that change ownership or membership must call
+    the invalidate_* hooks.
+    """
+
+    def __init__(self, get_db, maxsize: int = 4096, ttl: float = 60):
+        self._get_db = get_db
+        self._owners = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._roles = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._guests = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _store_owner(self, project_id: int, owner):
+        owner = owner or _NO_PROJECT
+        self._owners.set(project_id, owner)
+        return owner
+
+    def _store_role(self, project_id: int, user_id: str, role):
+        role = role or _NO_PROJECT
+        self._roles.set((project_id, user_id), role)
+        return role
+
+    def _store_guest(self, project_id: int, email: str, role):
+        role = role or _NO_PROJECT
+        self._guests.set((project_id, email), role)
+        return role
+
+    def _store_access(self, project_id: int, user_id: str, access):
+        owner, role = access
+        return self._store_owner(project_id, owner), self._store_role(project_id, user_id, role)
+
+    @staticmethod
+    def _role_for(owner, role, user_id: str):
+        if not owner:
+            return None
+        if owner == user_id:
+            return 'owner'
+        return role or None
+
+    def get_owner(self, project_id: int):
+        """Get the creator of a project (None if the project does not exist)"""
+        owner = self._owners.get(project_id)
+
+        if owner is None:
+            with phase('access-check'):
+                owner = self._store_owner(project_id, self._get_db().fetch_owner(project_id))
+
+        return owner or None
+
+    def resolve(self, project_id: int, user_id: str):
+        """Get the user's role in a project (None if no access)"""
+        with phase('access-check'):
+            owner = self._owners.get(project_id)
+            role = self._roles.get((project_id, user_id))
+
+            if owner is None and role is None:
+                # Creator and membership in one round trip
+                owner, role = self._store_access(
+                    project_id, user_id, self._get_db().fetch_access(project_id, user_id)
+                )
+            elif owner is None:
+                owner = self._store_owner(project_id, self._get_db().fetch_owner(project_id))
+
+            if owner and owner != user_id and role is None:
+                role = self._store_role(
+                    project_id, user_id, self._get_db().fetch_role(project_id, user_id)
+                )
+
+            return self._role_for(owner, role, user_id)
+
+    async def aresolve(self, db, project_id: int, user_id: str):
+        """Async resolve() using an async repository"""
+        with phase('access-check'):
+            owner = self._owners.get(project_id)
+            role = self._roles.get((project_id, user_id))
+
+            if owner is None and role is None:
+                owner, role = self._store_access(
+                    project_id, user_id, await db.fetch_access(project_id, user_id)
+                )
+            elif owner is None:
+                owner = self._store_owner(project_id, await db.fetch_owner(project_id))
+
+            if owner and owner != user_id and role is None:
+                role = self._store_role(project_id, user_id, await db.fetch_role(project_id, user_id))
+
+            return self._role_for(owner, role, user_id)
+
+    def reader_role(self, project_id: int, user_id: str, email: str = None):
+        """Get the user's role for reading a project: resolve(), else 'guest' when
+        their email is invited as a guest (None if no access)"""
+        role = self.resolve(project_id, user_id)
+        if role or not email or not self.get_owner(project_id):
+            return role
+
+        email = email.lower()
+        guest = self._guests.get((project_id, email))
+
+        if guest is None:
+            with phase('access-check'):
+                guest = self._store_guest(project_id, email, self._get_db().fetch_guest_role(project_id, email))
+
+        return GUEST_ROLE if guest else None
+
+    async def areader_role(self, db, project_id: int, user_id: str, email: str = None):
+        """Async reader_role() using an async repository"""
+        role = await self.aresolve(db, project_id, user_id)
+        if role or not email:
+            return role
+
+        with phase('access-check'):
+            owner = self._owners.get(project_id)
+            if owner is None:
+                owner = self._store_owner(project_id, await db.fetch_owner(project_id))
+            if not owner:
+                return None
+
+            email = email.lower()
+            guest = self._guests.get((project_id, email))
+            if guest is None:
+                guest = self._store_guest(project_id, email, await db.fetch_guest_role(project_id, email))
+
+            return GUEST_ROLE if guest else None
+
+    def is_admin(self, project_id: int, user_id: str) -> bool:
+        """Check whether the user is the creator or an owner/admin member"""
+        return self.resolve(project_id, user_id) in ADMIN_ROLES
+
+    # Priming - record facts already fetched by other queries
+    def prime_owner(self, project_id: int, created_by: str):
+        """Remember a project's creator"""
+        self._owners.set(project_id, created_by)
+
+    def prime_role(self, project_id: int, user_id: str, role: str):
+        """Remember a member's role"""
+        self._roles.set((project_id, user_id), role)
+
+    def prime_guest(self, project_id: int, email: str, role: str):
+        """Remember a guest's role"""
+        self._guests.set((project_id, email.lower()), role)
+
+    # Invalidation hooks
+    @broadcast()
+    def invalidate_member(self, project_id: int, user_id: str):
+        """Forget one user's role in a project"""
+        self._roles.pop((project_id, user_id))
+
+    @broadcast()
+    def invalidate_project(self, project_id: int):
+        """Forget everything cached about a project"""
+        self._owners.pop(project_id)
+        self._roles.discard_where(lambda key: key[0] == project_id)
+        self._guests.discard_where(lambda key: key[0] == project_id)
+
+    @broadcast()
+    def invalidate_guests(self, project_id: int):
+        """Forget the guest grants to a project (guest added, changed or removed)"""
+        self._guests.discard_where(lambda key: key[0] == project_id)
+
+    def clear(self):
+        """Forget everything"""
+        self._owners.clear()
+        self._roles.clear()
+        self._guests.clear()
+
+    def stats(self) -> dict:
+        """Cache statistics"""
+        return {
+            'owners': self._owners.stats(),
+            'roles': self._roles.stats(),
+            'guests': self._guests.stats()
+        }
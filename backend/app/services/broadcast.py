@@ -0,0 +1,199 @@
+"""
+Process Broadcast - cache invalidations and change events shared by the app's processes (Postgres LISTEN/NOTIFY)
+"""
+import functools
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+CHANNEL = 'app_broadcast'
+
+# NOTIFY payloads must stay under 8000 bytes
+MAX_PAYLOAD = 7900
+
+
+def broadcast(remote=None, oversized=None):
+    """Decorator for cache invalidation hooks and event publishing: after the
+    call runs here it is sent to the app's other processes, which run the
+    undecorated method with the same arguments.
+
+    remote maps the arguments to the (method, args) other processes run
+    instead, e.g. invalidate a listing that was patched here; oversized
+    does the same for calls whose arguments do not fit in a notification.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            result = method(self, *args)
+
+            channel = getattr(self, 'broadcast', None)
+            if channel is not None:
+                name, sent = remote(*args) if remote else (method.__name__, args)
+                fallback = oversized(*args) if oversized else None
+                channel.send(self, name, sent, fallback)
+
+            return result
+
+        wrapper.broadcast = True
+        return wrapper
+
+    return decorate
+
+
+class ProcessBroadcast:
+    """Runs @broadcast calls made in other processes of the app.
+
+    Each process listens on a Postgres channel and sends its own calls
+    from a background thread, so a write never waits for the database.
+    A process skips its own messages. After the listening connection is
+    lost, messages may have been missed, so every target is reset (caches
+    emptied, realtime clients told to resync).
+
+    Threads restart in forked children, which get their own origin.
+    """
+
+    def __init__(self, dsn: str, channel: str = CHANNEL, reconnect_delay: float = 1.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._targets = {}
+        self._names = {}
+        self._resets = []
+        self._pid = None
+        self._stopped = threading.Event()
+        self.sent = self.received = self.dropped = self.resets = 0
+
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def register(self, name: str, target, reset=None):
+        """Share target's @broadcast calls; reset (no arguments) runs after missed messages"""
+        self._targets[name] = target
+        self._names[id(target)] = name
+        if reset is not None:
+            self._resets.append(reset)
+        target.broadcast = self
+
+    def start(self):
+        """Start the listener and sender threads (once per process)"""
+        if self._pid == os.getpid():
+            return
+
+        self._pid = os.getpid()
+        self.origin = uuid.uuid4().hex
+        self._outbox = queue.SimpleQueue()
+        self._stopped.clear()
+
+        for target in (self._listen, self._send_loop):
+            threading.Thread(target=target, name=f'broadcast-{target.__name__.strip("_")}', daemon=True).start()
+
+    def _after_fork(self):
+        if self._pid is not None:
+            self._pid = None
+            self.start()
+
+    def stop(self):
+        """Stop the threads (they exit within reconnect_delay)"""
+        self._stopped.set()
+
+    # Sending
+    def send(self, target, method: str, args, fallback=None):
+        """Queue a call for the other processes"""
+        if self._pid != os.getpid():
+            return
+
+        payload = self._encode(target, method, args)
+        if len(payload.encode()) > MAX_PAYLOAD:
+            if fallback is None:
+                self.dropped += 1
+                return
+            payload = self._encode(target, *fallback)
+
+        self._outbox.put(payload)
+
+    def _encode(self, target, method: str, args) -> str:
+        return json.dumps(
+            {'o': self.origin, 't': self._names[id(target)], 'm': method, 'a': list(args)},
+            separators=(',', ':'), default=str
+        )
+
+    def _send_loop(self):
+        import psycopg
+
+        conn = None
+        while not self._stopped.is_set():
+            try:
+                payloads = [self._outbox.get(timeout=self.reconnect_delay)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    payloads.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                if conn is None or conn.closed:
+                    conn = psycopg.connect(self.dsn, autocommit=True)
+                # Everything queued goes out in one round trip
+                conn.execute(
+                    'SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload',
+                    (self.channel, payloads)
+                )
+                self.sent += len(payloads)
+            except Exception as e:
+                print(f"Error broadcasting {len(payloads)} messages: {str(e)}")
+                self.dropped += len(payloads)
+                conn = None
+
+    # Listening
+    def _listen(self):
+        import psycopg
+
+        connected_before = False
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f'LISTEN {self.channel}')
+                    if connected_before:
+                        self._reset()
+                    connected_before = True
+
+                    while not self._stopped.is_set():
+                        for notify in conn.notifies(timeout=self.reconnect_delay):
+                            self._apply(notify.payload)
+            except Exception as e:
+                print(f"Broadcast listener disconnected: {str(e)}")
+                self._stopped.wait(self.reconnect_delay)
+
+    def _apply(self, payload: str):
+        try:
+            message = json.loads(payload)
+            if message['o'] == self.origin:
+                return
+
+            target = self._targets[message['t']]
+            method = getattr(type(target), message['m'])
+            if not getattr(method, 'broadcast', False):
+                raise ValueError(f"{message['m']} is not broadcast")
+
+            # Run the undecorated method: it must not be sent on again
+            method.__wrapped__(target, *message['a'])
+            self.received += 1
+        except Exception as e:
+            print(f"Error applying broadcast message: {str(e)}")
+
+    def _reset(self):
+        self.resets += 1
+        for reset in self._resets:
+            try:
+                reset()
+            except Exception as e:
+                print(f"Error resetting after missed broadcasts: {str(e)}")
+
+    def stats(self) -> dict:
+        """Message counts"""
+        return {'sent': self.sent, 'received': self.received, 'dropped': self.dropped, 'resets': self.resets}
@@ -0,0 +1,135 @@
+"""
+In-process caching primitives
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    maxsize bounds the number of entries, or with weigh (value -> int) the
+    total weight of the entries, e.g. rows held across cached lists.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, weigh=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._weigh = weigh or (lambda value: 1)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key, value, expires_at: float):
+        weight = self._weigh(value)
+        self._remove(key)
+        self._data[key] = (value, expires_at, weight)
+        self.weight += weight
+
+    def _remove(self, key):
+        entry = self._data.pop(key, _MISSING)
+        if entry is not _MISSING:
+            self.weight -= entry[2]
+        return entry
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """Store value under key; ttl overrides the cache default"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._store(key, value, expires_at)
+            self._evict()
+
+    def _evict(self):
+        # Least recently used first
+        while self.weight > self.maxsize and self._data:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def update(self, key, fn) -> bool:
+        """Replace a live entry's value with fn(value), keeping its expiry and LRU position.
+
+        fn returning None drops the entry. Returns False when key was absent.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[1] <= time.monotonic():
+                return False
+
+            value = fn(entry[0])
+            if value is None:
+                self._remove(key)
+            else:
+                weight = self._weigh(value)
+                self.weight += weight - entry[2]
+                self._data[key] = (value, entry[1], weight)
+                self._evict()
+            return True
+
+    def pop(self, key, default=None):
+        """Remove key and return its value (expired or not)"""
+        with self._lock:
+            entry = self._remove(key)
+        return default if entry is _MISSING else entry[0]
+
+    def discard_where(self, predicate):
+        """Remove every entry whose key matches predicate"""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    def discard_values_where(self, predicate):
+        """Remove every entry whose value matches predicate (scans the whole cache)"""
+        with self._lock:
+            stale = [key for key, (value, _, _) in self._data.items() if predicate(value)]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'weight': self.weight,
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,264 @@
+"""
+Event Bus - per-project change events fanned out to realtime subscribers
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from app.services import metrics
+from app.services.broadcast import broadcast
+
+# Control events sent by the server itself
+RESYNC = 'resync'          # events were missed; refetch the project's lists
+REVOKED = 'revoked'        # the subscriber lost access to the project
+EXPIRED = 'expired'        # the subscriber's token expired; reconnect with a fresh one
+
+# Ends every subscription to the project
+PROJECT_DELETED = 'project.deleted'
+
+# Ids increase across channels and restarts, so a stale ?since= is never mistaken for a current one
+_ids = itertools.count(time.time_ns() // 1000)
+
+
+class Event:
+    """One change event, serialized once for every subscriber"""
+
+    __slots__ = ('id', 'project_id', 'type', 'json', 'final', '_sse')
+
+    def __init__(self, event_id: int, project_id: int, event_type: str, data=None, final: bool = False):
+        self.id = event_id
+        self.project_id = project_id
+        self.type = event_type
+        self.final = final
+        self.json = json.dumps(
+            {'id': event_id, 'type': event_type, 'project_id': project_id, 'data': data},
+            separators=(',', ':'), default=str
+        )
+        self._sse = None
+
+    def sse(self) -> bytes:
+        """Server-Sent Events frame"""
+        if self._sse is None:
+            self._sse = f'id: {self.id}\nevent: {self.type}\ndata: {self.json}\n\n'.encode()
+        return self._sse
+
+    def __repr__(self):
+        return f'Event({self.id}, {self.project_id!r}, {self.type!r})'
+
+
+def control(project_id: int, event_type: str, final: bool = True) -> Event:
+    """Server-generated event without data (RESYNC, REVOKED, EXPIRED)"""
+    return Event(next(_ids), project_id, event_type, final=final)
+
+
+class Subscription:
+    """A subscriber's bounded queue of events, consumed on its event loop"""
+
+    __slots__ = ('project_id', 'user_id', 'guest_email', 'transport', 'loop', 'closed', 'active', '_queue')
+
+    def __init__(self, project_id: int, user_id: str, transport: str, loop, maxsize: int,
+                 guest_email: str = None):
+        self.project_id = project_id
+        self.user_id = user_id
+        # Set when the subscriber reads the project as an invited guest
+        self.guest_email = guest_email.lower() if guest_email else None
+        self.transport = transport
+        self.loop = loop
+        self.closed = False
+        self.active = True
+        # One slot is kept for the closing event
+        self._queue = asyncio.Queue(maxsize + 1)
+
+    def _put(self, event: Event) -> bool:
+        """Queue an event (on the subscription's loop); False when the queue is full"""
+        if self.closed:
+            return True
+        if self._queue.qsize() >= self._queue.maxsize - 1 and not event.final:
+            return False
+
+        self._queue.put_nowait(event)
+        self.closed = event.final
+        return True
+
+    def _close(self, event: Event):
+        """Drop queued events and end with event (on the subscription's loop)"""
+        if self.closed:
+            return
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._put(event)
+
+    async def get(self) -> list:
+        """Wait for events; returns every queued event"""
+        events = [await self._queue.get()]
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+
+
+class _Channel:
+    """Subscribers of one project and its recent events"""
+
+    __slots__ = ('subscribers', 'backlog', 'floor')
+
+    def __init__(self, backlog: int):
+        self.subscribers = set()
+        self.backlog = deque(maxlen=backlog)
+        # Every event after this id is still in the backlog
+        self.floor = next(_ids)
+
+
+class EventBus:
+    """In-process publish/subscribe of project change events.
+
+    publish() may be called from any thread; each event is serialized once
+    and handed to every subscriber's loop in a single callback. Subscribers
+    that fall behind by more than queue_size events are closed with a
+    'resync' event rather than slowing publishers down. Recent events are
+    kept per project so a reconnecting client can resume from its last id.
+
+    With a ProcessBroadcast registered, publish() and revoke() also run
+    in the app's other processes, reaching their subscribers.
+    """
+
+    def __init__(self, queue_size: int = 256, backlog: int = 100, idle_channels: int = 1024):
+        self.queue_size = queue_size
+        self.backlog = backlog
+        self.idle_channels = idle_channels
+        self._channels = {}
+        # Channels without subscribers, kept (least recently used first) so clients can resume
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+
+    def subscribe(self, project_id: int, user_id: str, since: int = None, transport: str = 'websocket',
+                  guest_email: str = None):
+        """Subscribe the running event loop to a project's events.
+
+        With since (the last event id a client saw) the events it missed are
+        queued first, or a 'resync' event when they are no longer kept.
+        guest_email is given when the subscriber's access is a guest invitation.
+        """
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(project_id, user_id, transport, loop, self.queue_size, guest_email)
+
+        with self._lock:
+            channel = self._channels.get(project_id) or self._idle.pop(project_id, None)
+            if channel is None:
+                channel = _Channel(self.backlog)
+            self._channels[project_id] = channel
+            channel.subscribers.add(subscription)
+
+            if since is not None:
+                missed = [event for event in channel.backlog if event.id > since]
+                if since < channel.floor or len(missed) > self.queue_size:
+                    missed = [control(project_id, RESYNC, final=False)]
+                for event in missed:
+                    subscription._put(event)
+
+        metrics.REALTIME_SUBSCRIBERS.inc(transport=transport)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription (idempotent)"""
+        with self._lock:
+            if not subscription.active:
+                return
+            subscription.active = False
+
+            channel = self._channels.get(subscription.project_id)
+            if channel is not None and subscription in channel.subscribers:
+                channel.subscribers.discard(subscription)
+                if not channel.subscribers:
+                    del self._channels[subscription.project_id]
+                    self._idle[subscription.project_id] = channel
+                    while len(self._idle) > self.idle_channels:
+                        self._idle.popitem(last=False)
+
+        metrics.REALTIME_SUBSCRIBERS.dec(transport=subscription.transport)
+
+    # Events too large to relay reach other processes' subscribers as a resync
+    @broadcast(oversized=lambda project_id, *_: ('publish', (project_id, RESYNC)))
+    def publish(self, project_id: int, event_type: str, data=None):
+        """Send an event to a project's subscribers; returns it (None when nobody is listening)"""
+        with self._lock:
+            channel = self._channels.get(project_id) or self._idle.get(project_id)
+            if channel is None:
+                return None
+
+            event = Event(next(_ids), project_id, event_type, data, final=event_type == PROJECT_DELETED)
+            if len(channel.backlog) == channel.backlog.maxlen:
+                channel.floor = channel.backlog[0].id
+            channel.backlog.append(event)
+
+            if event.final:
+                self._channels.pop(project_id, None)
+                self._idle.pop(project_id, None)
+
+            # One callback per event loop, however many subscribers it serves
+            by_loop = {}
+            for subscription in channel.subscribers:
+                by_loop.setdefault(subscription.loop, []).append(subscription)
+
+        metrics.REALTIME_EVENTS.inc(type=event_type)
+        for loop, subscriptions in by_loop.items():
+            self._call(loop, self._deliver, subscriptions, event)
+        return event
+
+    @broadcast()
+    def revoke(self, project_id: int, user_id: str):
+        """Close a user's subscriptions to a project (membership removed)"""
+        self._revoke(project_id, lambda subscription: subscription.user_id == user_id)
+
+    @broadcast()
+    def revoke_guest(self, project_id: int, email: str):
+        """Close the guest subscriptions of an email to a project (guest removed)"""
+        email = (email or '').lower()
+        self._revoke(project_id, lambda subscription: subscription.guest_email == email)
+
+    def _revoke(self, project_id: int, match):
+        with self._lock:
+            channel = self._channels.get(project_id)
+            revoked = [s for s in channel.subscribers if match(s)] if channel else []
+
+        for subscription in revoked:
+            self._call(subscription.loop, subscription._close, control(project_id, REVOKED))
+
+    def resync_all(self):
+        """Tell every subscriber to refetch (events may have been missed)"""
+        with self._lock:
+            project_ids = list(self._channels)
+
+        for project_id in project_ids:
+            self.publish.__wrapped__(self, project_id, RESYNC)
+
+    def _deliver(self, subscriptions: list, event: Event):
+        for subscription in subscriptions:
+            if not subscription._put(event):
+                # Too slow: stop buffering and let the client refetch
+                metrics.REALTIME_DROPPED.inc()
+                subscription._close(control(event.project_id, RESYNC))
+
+    @staticmethod
+    def _call(loop, callback, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The subscriber's loop has shut down
+            pass
+
+    def stats(self) -> dict:
+        """Channel and subscriber counts"""
+        with self._lock:
+            return {
+                'channels': len(self._channels),
+                'idle_channels': len(self._idle),
+                'subscribers': sum(len(c.subscribers) for c in self._channels.values())
+            }
+
+    def clear(self):
+        """Forget every channel (subscriptions are not notified)"""
+        with self._lock:
+            self._channels.clear()
+            self._idle.clear()
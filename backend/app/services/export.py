@@ -0,0 +1,109 @@
+"""
+Project export - stream a project's records as NDJSON, or as a ZIP that also holds its stored files
+"""
+import io
+import json
+import re
+import zipfile
+from collections import Counter
+
+EXPORT_FORMATS = ('ndjson', 'zip')
+
+# Bytes collected before a ZIP chunk is sent
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+def ndjson_lines(records):
+    """One JSON line per (type, record) pair, then an "end" line with counts.
+
+    A failure part-way (the response has already started) ends the
+    stream with an "error" line instead, so a client can tell a
+    truncated export from a complete one.
+    """
+    counts = Counter()
+
+    try:
+        for kind, record in records:
+            counts[kind] += 1
+            yield _line(kind, record)
+    except Exception as e:
+        print(f"Export failed after {sum(counts.values())} records: {e}")
+        yield _line('error', {'message': str(e)})
+        return
+
+    yield _line('end', {'counts': dict(counts)})
+
+
+def _line(kind: str, data) -> bytes:
+    return json.dumps({'type': kind, 'data': data}, separators=(',', ':'), default=str).encode() + b'\n'
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only, unseekable stream whose bytes are handed to the response"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def _archive_name(record: dict) -> str:
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', record.get('filename') or '').strip('._') or 'file'
+    return f"files/{record['id']}-{name}"
+
+
+def zip_export(records, file_records, read_file):
+    """ZIP of project.ndjson (the records) and files/<id>-<name> for every stored file.
+
+    file_records is called once project.ndjson is written and returns the
+    (type, record) pairs again with the file records among them, so file
+    metadata is never held in memory; read_file(path) returns a file's
+    contents as an iterator of chunks, and raises FileNotFoundError when
+    it is gone or PermissionError when it may not be read (either way it
+    is listed in missing-files.txt). Yields the archive in chunks of about
+    ZIP_CHUNK_SIZE bytes.
+    """
+    out = _Chunks()
+    missing = []
+
+    # An unseekable stream makes zipfile write sizes after each entry (data descriptors)
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('project.ndjson', 'w', force_zip64=True) as entry:
+            for line in ndjson_lines(records):
+                entry.write(line)
+                if out.size >= ZIP_CHUNK_SIZE:
+                    yield out.drain()
+
+        for kind, record in file_records():
+            if kind != 'file':
+                continue
+
+            try:
+                chunks = read_file(record['file_path'])
+            except (FileNotFoundError, PermissionError):
+                missing.append(record['file_path'])
+                continue
+
+            with archive.open(_archive_name(record), 'w') as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    if out.size >= ZIP_CHUNK_SIZE:
+                        yield out.drain()
+
+        if missing:
+            archive.writestr('missing-files.txt', '\n'.join(missing) + '\n')
+
+    yield out.drain()
@@ -0,0 +1,74 @@
+"""
+Sparse fieldsets - turn ?fields= into narrow PostgREST selects
+"""
+
+USER_EMBED = '(id, email, first_name, last_name)'
+
+# Selectable columns and embeds per resource
+RESOURCES = {
+    'tasks': {
+        'columns': ('id', 'project_id', 'title', 'description', 'status', 'assigned_to',
+                    'due_date', 'priority', 'priority_rank', 'created_by', 'created_at', 'updated_at'),
+        'embeds': {
+            'assignee': f'assignee:assigned_to{USER_EMBED}',
+            'projects': 'projects(name)'
+        }
+    },
+    'files': {
+        'columns': ('id', 'project_id', 'filename', 'file_path', 'file_size', 'file_type',
+                    'uploaded_by', 'uploaded_at'),
+        'embeds': {
+            'uploader': f'uploader:uploaded_by{USER_EMBED}'
+        }
+    },
+    'projects': {
+        'columns': ('id', 'name', 'description', 'status', 'start_date', 'end_date',
+                    'created_by', 'created_at', 'updated_at'),
+        'embeds': {}
+    },
+    'members': {
+        'columns': ('id', 'user_id', 'role', 'type'),
+        'embeds': {
+            'user': f'users{USER_EMBED}'
+        }
+    }
+}
+
+
+def parse_fields(resource: str, value: str):
+    """Validate a comma-separated ?fields= value against the resource whitelist.
+
+    Returns a tuple of field names, or None when no fields were requested
+    (meaning "default representation"). Raises ValueError on unknown fields.
+    """
+    if value is None:
+        return None
+
+    spec = RESOURCES[resource]
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(',') if f.strip()))
+
+    if not fields:
+        raise ValueError('fields must list at least one field')
+
+    unknown = [f for f in fields if f not in spec['columns'] and f not in spec['embeds']]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+
+    return fields
+
+
+def build_select(resource: str, fields, default: str, required=()) -> str:
+    """Build a PostgREST select for fields, always including required columns"""
+    if fields is None:
+        return default
+
+    spec = RESOURCES[resource]
+    columns = [c for c in dict.fromkeys((*required, *fields)) if c in spec['columns']]
+    embeds = [spec['embeds'][f] for f in fields if f in spec['embeds']]
+
+    return ', '.join(columns + embeds)
+
+
+def wants(fields, name: str) -> bool:
+    """Check whether a field is part of the requested representation"""
+    return fields is None or name in fields
@@ -0,0 +1,149 @@
+"""
+Task filters and sorting - turn ?status=&priority=&...&sort= into PostgREST filters and orderings
+"""
+import uuid
+from datetime import date, datetime, timezone
+
+# Accepted values of list filters
+TASK_FILTER_VALUES = {
+    'status': ('todo', 'in_progress', 'done'),
+    'priority': ('low', 'medium', 'high')
+}
+
+# ?sort= keys -> column (priority orders by rank, not alphabetically)
+TASK_SORT_KEYS = {
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'due_date': 'due_date',
+    'priority': 'priority_rank',
+    'status': 'status',
+    'title': 'title'
+}
+
+
+def overdue_cutoff() -> str:
+    """The overdue rule: a task is overdue when it is not done and its due
+    date is before this date (today, UTC) - a task due today is not.
+    Statistics, dashboard rollups and ?overdue= all use it (and
+    migrations/0009_overdue_rule.sql in SQL)."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def is_overdue(task: dict, cutoff: str = None) -> bool:
+    """The overdue rule applied to a task row"""
+    due_date = task.get('due_date')
+    return bool(due_date) and task.get('status') != 'done' and due_date[:10] < (cutoff or overdue_cutoff())
+
+
+def _values(value: str) -> list:
+    return list(dict.fromkeys(v.strip() for v in value.split(',') if v.strip()))
+
+
+def _date(name: str, value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+
+
+def parse_task_filters(args, user_id: str):
+    """Validate task filter parameters.
+
+    assigned_to takes user ids plus 'me' (the caller) and 'none'
+    (unassigned); overdue=true means due before today and not done.
+    Returns a dict of filters, or None when no filter was given. Raises
+    ValueError on invalid input.
+    """
+    filters = {}
+
+    for name, allowed in TASK_FILTER_VALUES.items():
+        if args.get(name):
+            values = _values(args[name])
+            unknown = [v for v in values if v not in allowed]
+            if unknown:
+                raise ValueError(f"Unknown {name}: {', '.join(unknown)}")
+            filters[name] = values
+
+    if args.get('assigned_to'):
+        assignees = []
+        for value in _values(args['assigned_to']):
+            if value == 'me':
+                value = user_id
+            elif value != 'none':
+                try:
+                    value = str(uuid.UUID(value))
+                except ValueError:
+                    raise ValueError("assigned_to must list user ids, 'me' or 'none'")
+            assignees.append(value)
+        filters['assigned_to'] = assignees
+
+    for name in ('due_after', 'due_before'):
+        if args.get(name):
+            filters[name] = _date(name, args[name])
+
+    overdue = args.get('overdue')
+    if overdue:
+        if overdue not in ('true', 'false'):
+            raise ValueError('overdue must be true or false')
+        filters['overdue'] = overdue == 'true'
+
+    return filters or None
+
+
+def apply_task_filters(query, filters):
+    """Add parsed task filters to a PostgREST query"""
+    if not filters:
+        return query
+
+    for name in TASK_FILTER_VALUES:
+        if name in filters:
+            query = query.in_(name, filters[name])
+
+    if 'assigned_to' in filters:
+        users = [v for v in filters['assigned_to'] if v != 'none']
+        unassigned = 'none' in filters['assigned_to']
+
+        if users and unassigned:
+            query = query.or_(f"assigned_to.is.null,assigned_to.in.({','.join(users)})")
+        elif unassigned:
+            query = query.is_('assigned_to', 'null')
+        else:
+            query = query.in_('assigned_to', users)
+
+    if 'due_after' in filters:
+        query = query.gte('due_date', filters['due_after'])
+    if 'due_before' in filters:
+        query = query.lte('due_date', filters['due_before'])
+
+    # The overdue rule (see overdue_cutoff)
+    if 'overdue' in filters:
+        cutoff = overdue_cutoff()
+        if filters['overdue']:
+            query = query.lt('due_date', cutoff).neq('status', 'done')
+        else:
+            query = query.or_(f'due_date.is.null,due_date.gte.{cutoff},status.eq.done')
+
+    return query
+
+
+def parse_task_sort(value: str, default):
+    """Parse ?sort=key,-key into keyset sort keys ending with id.
+
+    Returns default when no sort was given. Raises ValueError on unknown
+    keys.
+    """
+    keys = _values(value or '')
+    if not keys:
+        return default
+
+    sort_keys = []
+    for key in keys:
+        desc = key.startswith('-')
+        column = TASK_SORT_KEYS.get(key.lstrip('-'))
+        if column is None:
+            raise ValueError(f"Unknown sort key: {key.lstrip('-')} (use {', '.join(TASK_SORT_KEYS)})")
+        if column not in (c for c, _ in sort_keys):
+            sort_keys.append((column, desc))
+
+    # A unique last key keeps pages stable
+    return sort_keys + [('id', sort_keys[-1][1])]
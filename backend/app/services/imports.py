@@ -0,0 +1,147 @@
+"""
+Task import - read tasks from a CSV or NDJSON upload one row at a time and validate them
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import date
+from app.services.filters import TASK_FILTER_VALUES
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Content types and file extensions that name a format when ?format= is not given
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson'
+}
+IMPORT_EXTENSIONS = {'csv': 'csv', 'ndjson': 'ndjson', 'jsonl': 'ndjson'}
+
+
+def parse_import_format(requested: str = None, content_type: str = None, filename: str = None) -> str:
+    """The upload's format: ?format=, else its content type, else its file extension.
+    Raises ValueError when none of them names one."""
+    if requested:
+        if requested not in IMPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+        return requested
+
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in IMPORT_CONTENT_TYPES:
+        return IMPORT_CONTENT_TYPES[content_type]
+
+    extension = (filename or '').rpartition('.')[2].lower()
+    if extension in IMPORT_EXTENSIONS:
+        return IMPORT_EXTENSIONS[extension]
+
+    raise ValueError(f"Cannot tell the file format; pass ?format= ({', '.join(IMPORT_FORMATS)})")
+
+
+def read_rows(stream, import_format: str):
+    """(row number, row) pairs from a binary stream, read incrementally.
+
+    Row numbers are line numbers in the file (a CSV header is line 1). A
+    row that cannot be parsed comes back as a ValueError instead of a
+    dict; input that cannot be read any further (not UTF-8, a broken CSV
+    quote) ends the rows with one.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    rows = _csv_rows(text) if import_format == 'csv' else _ndjson_rows(text)
+
+    try:
+        yield from rows
+    except (UnicodeDecodeError, csv.Error) as e:
+        message = 'File must be UTF-8 encoded' if isinstance(e, UnicodeDecodeError) else f'Invalid CSV: {e}'
+        yield None, ValueError(message)
+    finally:
+        # Leave the request stream open for Flask
+        text.detach()
+
+
+def _csv_rows(text):
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [name.strip().lower() for name in header]
+
+    while True:
+        # A quoted value can span lines; report the line the row starts on
+        number = reader.line_num + 1
+        values = next(reader, None)
+        if values is None:
+            return
+        if any(value.strip() for value in values):
+            yield number, dict(zip(columns, values))
+
+
+def _ndjson_rows(text):
+    for number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, ValueError('Invalid JSON')
+            continue
+
+        if not isinstance(row, dict):
+            yield number, ValueError('Each line must be a JSON object')
+        elif 'type' in row and 'data' in row:
+            # A line of a project export: only its tasks are imported
+            if row['type'] == 'task' and isinstance(row['data'], dict):
+                yield number, row['data']
+        else:
+            yield number, row
+
+
+def _text(row: dict, name: str):
+    """A column's value, stripped; None when missing or empty"""
+    value = row.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f'{name} must be a string')
+    return value.strip() or None
+
+
+def parse_task_row(row: dict) -> dict:
+    """Validate an imported row. Returns the task's data, with the assignee
+    as 'assigned_to' (a user id) or 'assignee' (an email, resolved by the
+    caller). Raises ValueError."""
+    title = _text(row, 'title')
+    if not title:
+        raise ValueError('Task title is required')
+
+    task = {'title': title, 'description': _text(row, 'description') or ''}
+
+    for name, allowed in TASK_FILTER_VALUES.items():
+        value = _text(row, name)
+        if value is not None:
+            if value not in allowed:
+                raise ValueError(f"{name} must be one of: {', '.join(allowed)}")
+            task[name] = value
+
+    due_date = _text(row, 'due_date')
+    if due_date is not None:
+        try:
+            task['due_date'] = date.fromisoformat(due_date[:10]).isoformat()
+        except ValueError:
+            raise ValueError('due_date must be a date (YYYY-MM-DD)')
+
+    assigned_to = _text(row, 'assigned_to')
+    assignee = _text(row, 'assignee')
+    if assigned_to is not None:
+        try:
+            task['assigned_to'] = str(uuid.UUID(assigned_to))
+        except ValueError:
+            raise ValueError('assigned_to must be a user id')
+    elif assignee is not None:
+        task['assignee'] = assignee.lower()
+
+    return task
+
@@ -0,0 +1,348 @@
+"""
+Job Queue - durable background jobs for slow, non-critical side effects (storage cleanup)
+
+Jobs live in a local SQLite file so retries survive restarts, and every
+process using the same file shares the queue. A claimed job is leased:
+if its process dies, the job becomes due again when the lease runs out.
+Failed jobs are retried with exponential backoff; after max_attempts
+they stay in the file as dead letters until retried by hand
+(python worker.py --dead / --retry ID).
+"""
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from app.services import metrics
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+DEAD = 'dead'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at REAL NOT NULL,           -- when due; while running, when the lease expires
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,                     -- user who may read the job's status
+    progress TEXT                   -- JSON reported by the handler, kept across retries
+);
+CREATE INDEX IF NOT EXISTS jobs_due_idx ON jobs (status, run_at);
+"""
+
+# Columns added since the first version of the file
+UPGRADES = {'owner': 'ALTER TABLE jobs ADD COLUMN owner TEXT',
+            'progress': 'ALTER TABLE jobs ADD COLUMN progress TEXT'}
+
+COLUMNS = 'id, kind, payload, status, attempts, run_at, last_error, created_at, updated_at, owner, progress'
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _job(row) -> dict:
+    job = dict(zip(COLUMNS.split(', '), row))
+    job['payload'] = json.loads(job['payload'])
+    job['progress'] = json.loads(job['progress']) if job['progress'] else None
+    return job
+
+
+class LeaseLost(Exception):
+    """The job's lease ran out and another worker claimed it; stop working on it"""
+
+
+class RunningJob:
+    """A handler's view of its job: which attempt this is and the progress saved so far.
+
+    report() and heartbeat() extend the lease; a handler that runs longer
+    than the lease must call one of them in time, or the job is claimed
+    again and the next call raises LeaseLost.
+    """
+
+    __slots__ = ('id', 'kind', 'attempts', 'progress', '_queue')
+
+    def __init__(self, queue, job: dict):
+        self.id = job['id']
+        self.kind = job['kind']
+        self.attempts = job['attempts']
+        self.progress = job['progress']
+        self._queue = queue
+
+    def report(self, **progress):
+        """Save progress and extend the lease; a retry sees it in .progress and can resume from there"""
+        self._extend(', progress = ?', (_dumps(progress),))
+        self.progress = progress
+
+    def heartbeat(self):
+        """Extend the lease"""
+        self._extend('', ())
+
+    def _extend(self, assignments: str, params: tuple):
+        now = time.time()
+        # attempts identifies this claim: a job claimed again since has a higher count
+        updated = self._queue._conn.execute(
+            f'UPDATE jobs SET run_at = ?, updated_at = ?{assignments} WHERE id = ? AND status = ? AND attempts = ?',
+            (now + self._queue.lease, now) + params + (self.id, RUNNING, self.attempts)
+        ).rowcount
+        if not updated:
+            raise LeaseLost(f'Job {self.kind} {self.id} was claimed by another worker')
+
+
+class JobQueue:
+    """SQLite-backed job queue worked by a pool of daemon threads.
+
+    register() a handler per job kind, then enqueue() jobs; a handler gets
+    the job's payload and a RunningJob, and raises to have the job retried. With workers=0
+    nothing runs in this process (run_pending() or worker.py drain the
+    queue instead).
+    """
+
+    def __init__(self, path: str, workers: int = 2, max_attempts: int = 10, base_delay: float = 5.0,
+                 max_delay: float = 3600.0, lease: float = 300.0, retention: float = 7 * 86400,
+                 poll_interval: float = 5.0):
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self._handlers = {}
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._threads = []
+        self._stopping = False
+        self._pruned_at = 0.0
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+        for column, statement in UPGRADES.items():
+            if column not in existing:
+                conn.execute(statement)
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def register(self, kind: str, handler):
+        """Run handler(payload, job) for jobs of this kind"""
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: dict, delay: float = 0.0, owner: str = None, progress: dict = None) -> str:
+        """Store a job (durably) and wake a worker; returns the job id"""
+        if kind not in self._handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn.execute(
+            f'INSERT INTO jobs ({COLUMNS}) VALUES (?, ?, ?, ?, 0, ?, NULL, ?, ?, ?, ?)',
+            (job_id, kind, _dumps(payload), PENDING, now + delay, now, now, owner,
+             _dumps(progress) if progress is not None else None)
+        )
+
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str):
+        """A job as a dict, or None"""
+        row = self._conn.execute(f'SELECT {COLUMNS} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return _job(row) if row else None
+
+    def dead(self, limit: int = 100) -> list:
+        """Jobs that failed max_attempts times, most recent first"""
+        rows = self._conn.execute(
+            f'SELECT {COLUMNS} FROM jobs WHERE status = ? ORDER BY updated_at DESC LIMIT ?', (DEAD, limit)
+        ).fetchall()
+        return [_job(row) for row in rows]
+
+    def retry(self, job_id: str) -> bool:
+        """Make a dead job due again with a fresh attempt count"""
+        now = time.time()
+        updated = self._conn.execute(
+            'UPDATE jobs SET status = ?, attempts = 0, run_at = ?, updated_at = ? WHERE id = ? AND status = ?',
+            (PENDING, now, now, job_id, DEAD)
+        ).rowcount
+        if updated:
+            self.start()
+            with self._wakeup:
+                self._wakeup.notify()
+        return bool(updated)
+
+    def counts(self) -> dict:
+        """Number of jobs per status"""
+        return dict(self._conn.execute('SELECT status, count(*) FROM jobs GROUP BY status').fetchall())
+
+    def _claim(self):
+        """Lease the next due job (pending, or running with an expired lease)"""
+        conn = self._conn
+        now = time.time()
+
+        # IMMEDIATE takes the write lock up front, so two processes never claim the same job
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                f'SELECT {COLUMNS} FROM jobs WHERE status IN (?, ?) AND run_at <= ? ORDER BY run_at LIMIT 1',
+                (PENDING, RUNNING, now)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = attempts + 1, run_at = ?, updated_at = ? WHERE id = ?',
+                    (RUNNING, now + self.lease, now, row[0])
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        if row is None:
+            return None
+        job = _job(row)
+        job['attempts'] += 1
+        return job
+
+    def _finish(self, job: dict, error: Exception = None):
+        now = time.time()
+
+        # Only while this claim still holds the job (see RunningJob._extend)
+        claim = 'id = ? AND status = ? AND attempts = ?'
+        claim_params = (job['id'], RUNNING, job['attempts'])
+
+        if error is None:
+            self._conn.execute(
+                f'UPDATE jobs SET status = ?, last_error = NULL, updated_at = ? WHERE {claim}', (DONE, now) + claim_params
+            )
+            metrics.JOBS_COMPLETED.inc(kind=job['kind'])
+            return
+
+        message = f'{type(error).__name__}: {error}'
+        if job['attempts'] >= self.max_attempts:
+            status, run_at = DEAD, now
+            metrics.JOBS_DEAD.inc(kind=job['kind'])
+            print(f"Job {job['kind']} {job['id']} failed {job['attempts']} times, giving up: {message}")
+        else:
+            # Exponential backoff with jitter so failing jobs don't retry in lockstep
+            delay = min(self.max_delay, self.base_delay * 2 ** (job['attempts'] - 1))
+            status, run_at = PENDING, now + delay * random.uniform(0.5, 1.0)
+            metrics.JOBS_RETRIED.inc(kind=job['kind'])
+            print(f"Job {job['kind']} {job['id']} failed (attempt {job['attempts']}), retrying: {message}")
+
+        self._conn.execute(
+            f'UPDATE jobs SET status = ?, run_at = ?, last_error = ?, updated_at = ? WHERE {claim}',
+            (status, run_at, message[:2000], now) + claim_params
+        )
+
+    def run_one(self) -> bool:
+        """Run the next due job in this thread; False when none is due"""
+        job = self._claim()
+        if job is None:
+            return False
+
+        handler = self._handlers.get(job['kind'])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job kind {job['kind']}")
+            handler(job['payload'], RunningJob(self, job))
+        except LeaseLost as e:
+            # The worker that claimed it again owns the job now
+            print(e)
+        except Exception as e:
+            self._finish(job, e)
+        else:
+            self._finish(job)
+        return True
+
+    def run_pending(self, limit: int = None) -> int:
+        """Run due jobs in this thread until none is due (or limit ran); returns how many ran"""
+        ran = 0
+        while (limit is None or ran < limit) and self.run_one():
+            ran += 1
+        return ran
+
+    def _next_due(self) -> float:
+        row = self._conn.execute(
+            'SELECT min(run_at) FROM jobs WHERE status IN (?, ?)', (PENDING, RUNNING)
+        ).fetchone()
+        return row[0] if row and row[0] is not None else float('inf')
+
+    def prune(self) -> int:
+        """Delete finished jobs older than the retention period"""
+        return self._conn.execute(
+            'DELETE FROM jobs WHERE status = ? AND updated_at < ?', (DONE, time.time() - self.retention)
+        ).rowcount
+
+    def _work(self):
+        while not self._stopping:
+            try:
+                if self.run_one():
+                    continue
+
+                if time.time() - self._pruned_at > 3600:
+                    self._pruned_at = time.time()
+                    self.prune()
+
+                timeout = min(self.poll_interval, max(0.0, self._next_due() - time.time()))
+            except sqlite3.Error as e:
+                print(f'Job queue error: {e}')
+                timeout = self.poll_interval
+
+            with self._wakeup:
+                if not self._stopping:
+                    self._wakeup.wait(timeout)
+
+    def start(self):
+        """Start the worker threads (once per process; a no-op with workers=0)"""
+        if self._threads or not self.workers:
+            return
+
+        with self._wakeup:
+            if self._threads:
+                return
+            self._stopping = False
+            self._threads = [
+                threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def serve(self):
+        """Work the queue in the calling thread until interrupted (worker.py)"""
+        self.workers = 0
+        try:
+            self._work()
+        except KeyboardInterrupt:
+            pass
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker threads after their current job"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
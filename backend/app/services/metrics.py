@@ -0,0 +1,381 @@
+"""
+Metrics - Prometheus counters/histograms and per-request database query and phase timings
+"""
+import abc
+import contextlib
+import contextvars
+import threading
+import time
+from collections import Counter as _Tally
+from urllib.parse import unquote
+
+# Default Prometheus latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# Label used for queries made outside of an HTTP request
+NO_ENDPOINT = 'none'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(abc.ABC):
+    """Base for a labelled metric family"""
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    @abc.abstractmethod
+    def samples(self):
+        """(sample name, label names, label values, extra label, value) tuples to render"""
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(
+            f'{name}{_labels(names, values, extra)} {_number(value)}'
+            for name, names, values, extra, value in self.samples()
+        )
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f'{self.name}_total', self.labelnames, key, '', value
+
+
+class Gauge(Metric):
+    """Value that goes up and down per label set"""
+
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, self.labelnames, key, '', value
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def get(self, **labels):
+        """(count, sum) for a label set"""
+        entry = self._values.get(self._key(labels))
+        return (entry[2], entry[1]) if entry else (0, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(b), s, c)) for key, (b, s, c) in self._values.items())
+        for key, (buckets, total, count) in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets, buckets):
+                cumulative += hits
+                yield f'{self.name}_bucket', self.labelnames, key, f'le="{_number(bound)}"', cumulative
+            yield f'{self.name}_sum', self.labelnames, key, '', total
+            yield f'{self.name}_count', self.labelnames, key, '', count
+
+
+class Registry:
+    """Set of metric families rendered in the Prometheus text format"""
+
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+# Metrics are per process; scrape every worker (or run a single worker) for totals
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'teamcamp_http_requests', 'HTTP requests by endpoint, method and status',
+    ('endpoint', 'method', 'status')
+)
+HTTP_DURATION = REGISTRY.histogram(
+    'teamcamp_http_request_duration_seconds', 'HTTP request latency by endpoint',
+    ('endpoint', 'method')
+)
+DB_QUERIES = REGISTRY.counter(
+    'teamcamp_db_queries', 'Database round trips by table, operation and calling endpoint',
+    ('table', 'operation', 'endpoint')
+)
+DB_ERRORS = REGISTRY.counter(
+    'teamcamp_db_errors', 'Database round trips that failed, by table and operation',
+    ('table', 'operation')
+)
+DB_DURATION = REGISTRY.histogram(
+    'teamcamp_db_query_duration_seconds', 'Database round-trip latency by table and operation',
+    ('table', 'operation')
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    'teamcamp_db_queries_per_request', 'Database round trips made while serving one request',
+    ('endpoint',), QUERY_COUNT_BUCKETS
+)
+
+REALTIME_SUBSCRIBERS = REGISTRY.gauge(
+    'teamcamp_realtime_subscribers', 'Open realtime subscriptions by transport',
+    ('transport',)
+)
+REALTIME_EVENTS = REGISTRY.counter(
+    'teamcamp_realtime_events', 'Change events published to subscribed projects, by type',
+    ('type',)
+)
+REALTIME_DROPPED = REGISTRY.counter(
+    'teamcamp_realtime_dropped', 'Subscriptions closed because the client fell behind'
+)
+
+JOBS_COMPLETED = REGISTRY.counter(
+    'teamcamp_jobs_completed', 'Background jobs completed by this process, by kind',
+    ('kind',)
+)
+JOBS_RETRIED = REGISTRY.counter(
+    'teamcamp_jobs_retried', 'Background job attempts that failed and were rescheduled, by kind',
+    ('kind',)
+)
+JOBS_DEAD = REGISTRY.counter(
+    'teamcamp_jobs_dead', 'Background jobs given up after their last attempt, by kind',
+    ('kind',)
+)
+
+
+class RequestLog:
+    """Database round trips and phase timings of one request.
+
+    timings holds seconds per phase: 'query' is database time outside any
+    other phase, the rest are added by phase().
+    """
+
+    __slots__ = ('endpoint', 'queries', 'seconds', 'timings', '_lock')
+
+    def __init__(self, endpoint: str = NO_ENDPOINT):
+        self.endpoint = endpoint
+        self.queries = _Tally()
+        self.seconds = 0.0
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return sum(self.queries.values())
+
+    def add(self, table: str, operation: str, seconds: float, phase: str = None):
+        # Sub-queries of one request may run on several threads
+        with self._lock:
+            self.queries[(table, operation)] += 1
+            self.seconds += seconds
+            if phase is None:
+                self.timings['query'] = self.timings.get('query', 0.0) + seconds
+
+    def time(self, phase: str, seconds: float):
+        with self._lock:
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+
+_current = contextvars.ContextVar('request_log', default=None)
+_phase = contextvars.ContextVar('request_phase', default=None)
+
+
+def current_log() -> RequestLog:
+    """RequestLog of the request being served, or None"""
+    return _current.get()
+
+
+def begin_request(endpoint: str):
+    """Start a RequestLog for the current context; returns a token for end_request"""
+    return _current.set(RequestLog(endpoint or NO_ENDPOINT))
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Time the enclosed block as a named phase of the current request.
+
+    Database time inside the block counts towards this phase rather than
+    'query'. Nested phases are absorbed by the outermost one.
+    """
+    log = _current.get()
+    if log is None or _phase.get() is not None:
+        yield
+        return
+
+    token = _phase.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phase.reset(token)
+        log.time(name, time.perf_counter() - start)
+
+
+def end_request(token) -> RequestLog:
+    """Close the current RequestLog and record its query count"""
+    log = _current.get()
+    _current.reset(token)
+
+    if log is not None:
+        DB_QUERIES_PER_REQUEST.observe(log.count, endpoint=log.endpoint)
+    return log
+
+
+async def bound(coro, log: RequestLog):
+    """Await coro with log as the current RequestLog (for work handed to another loop)"""
+    if log is not None:
+        _current.set(log)
+    return await coro
+
+
+def record_query(table: str, operation: str, seconds: float, failed: bool = False):
+    """Account one database round trip"""
+    log = _current.get()
+    endpoint = log.endpoint if log is not None else NO_ENDPOINT
+
+    DB_QUERIES.inc(table=table, operation=operation, endpoint=endpoint)
+    DB_DURATION.observe(seconds, table=table, operation=operation)
+    if failed:
+        DB_ERRORS.inc(table=table, operation=operation)
+
+    if log is not None:
+        log.add(table, operation, seconds, _phase.get())
+
+
+# Supabase HTTP instrumentation
+_OPERATIONS = {'GET': 'select', 'HEAD': 'select', 'POST': 'insert', 'PATCH': 'update', 'PUT': 'upsert',
+               'DELETE': 'delete'}
+
+
+def classify(request) -> tuple:
+    """(table, operation) of a Supabase REST or storage request"""
+    parts = [unquote(part) for part in request.url.path.split('/') if part]
+
+    if 'rest' in parts:
+        rest = parts[parts.index('rest') + 2:]
+        if rest[:1] == ['rpc'] and len(rest) > 1:
+            return rest[1], 'rpc'
+
+        operation = _OPERATIONS.get(request.method, request.method.lower())
+        if operation == 'insert' and 'resolution=' in request.headers.get('prefer', ''):
+            operation = 'upsert'
+        return (rest[0] if rest else ''), operation
+
+    if 'storage' in parts:
+        return 'storage', request.method.lower()
+
+    return request.url.host, request.method.lower()
+
+
+def _on_request(request):
+    request.extensions['metrics_start'] = time.perf_counter()
+
+
+def _on_response(response):
+    start = response.request.extensions.get('metrics_start')
+    if start is not None:
+        table, operation = classify(response.request)
+        record_query(table, operation, time.perf_counter() - start, response.status_code >= 400)
+
+
+async def _on_request_async(request):
+    _on_request(request)
+
+
+async def _on_response_async(response):
+    _on_response(response)
+
+
+def http_hooks(is_async: bool = False) -> dict:
+    """httpx event hooks recording every Supabase round trip"""
+    if is_async:
+        return {'request': [_on_request_async], 'response': [_on_response_async]}
+    return {'request': [_on_request], 'response': [_on_response]}
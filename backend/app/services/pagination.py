@@ -0,0 +1,145 @@
+"""
+Keyset (cursor) pagination helpers for PostgREST queries
+"""
+import base64
+import json
+from datetime import datetime
+from app.config import Config
+
+
+def parse_page_args(args):
+    """Parse ?limit= and ?cursor= from request args.
+
+    Returns (limit, cursor); limit is None when the caller asked for an
+    unpaginated listing. Raises ValueError on invalid input.
+    """
+    limit = args.get('limit')
+    cursor = args.get('cursor') or None
+
+    if limit is None:
+        return (Config.PAGE_DEFAULT_LIMIT if cursor else None), cursor
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+
+    if not 1 <= limit <= Config.PAGE_MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {Config.PAGE_MAX_LIMIT}')
+
+    return limit, cursor
+
+
+def encode_cursor(sort_keys, row: dict) -> str:
+    """Build an opaque cursor pointing just after row"""
+    payload = {
+        'k': [f"{'-' if desc else ''}{column}" for column, desc in sort_keys],
+        'v': [row.get(column) for column, _ in sort_keys]
+    }
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(sort_keys, cursor: str) -> list:
+    """Decode a cursor into sort-key values; raises ValueError if it is invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        keys, values = payload['k'], payload['v']
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+    expected = [f"{'-' if desc else ''}{column}" for column, desc in sort_keys]
+    if keys != expected or len(values) != len(expected):
+        raise ValueError('Cursor does not match the requested sort order')
+
+    return values
+
+
+def encode_sync_cursor(timestamp: datetime) -> str:
+    """Build an opaque delta-sync cursor for changes after timestamp"""
+    raw = json.dumps({'s': timestamp.isoformat()}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_sync_cursor(cursor: str) -> datetime:
+    """Decode a delta-sync cursor; raises ValueError if it is invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp = datetime.fromisoformat(json.loads(raw)['s'])
+    except Exception:
+        raise ValueError('Invalid sync cursor')
+
+    if timestamp.tzinfo is None:
+        raise ValueError('Invalid sync cursor')
+
+    return timestamp
+
+
+def _quote(value) -> str:
+    """Quote a value for use inside a PostgREST logic tree"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _equal(column, value) -> str:
+    return f'{column}.is.null' if value is None else f'{column}.eq.{_quote(value)}'
+
+
+def _after(column, value, desc: bool):
+    """Condition for 'column sorts strictly after value' (PostgREST defaults:
+    NULLS LAST when ascending, NULLS FIRST when descending)"""
+    if desc:
+        return f'{column}.not.is.null' if value is None else f'{column}.lt.{_quote(value)}'
+
+    if value is None:
+        return None
+    return f'or({column}.gt.{_quote(value)},{column}.is.null)'
+
+
+def keyset_filter(sort_keys, values) -> str:
+    """Build a PostgREST or= filter selecting rows after the given key values"""
+    branches = []
+
+    for i, (column, desc) in enumerate(sort_keys):
+        after = _after(column, values[i], desc)
+        if after is None:
+            continue
+
+        conditions = [_equal(c, values[j]) for j, (c, _) in enumerate(sort_keys[:i])]
+        conditions.append(after)
+        branches.append(conditions[0] if len(conditions) == 1 else f"and({','.join(conditions)})")
+
+    # None means no row can sort after the cursor
+    return ','.join(branches) or None
+
+
+def paginate(query, sort_keys, limit: int = None, cursor: str = None):
+    """Order query by sort_keys and fetch one keyset page.
+
+    sort_keys is a list of (column, descending) pairs and must end with a
+    unique column (usually id). Without a limit the full ordered result
+    is returned as a list; otherwise a page dict with items/next_cursor.
+    """
+    for column, desc in sort_keys:
+        query = query.order(column, desc=desc, nullsfirst=desc)
+
+    if limit is None:
+        return query.execute().data
+
+    if cursor:
+        after = keyset_filter(sort_keys, decode_cursor(sort_keys, cursor))
+        if after is None:
+            return {'items': [], 'next_cursor': None}
+        query = query.or_(after)
+
+    rows = query.limit(limit + 1).execute().data or []
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        'items': rows,
+        'next_cursor': encode_cursor(sort_keys, rows[-1]) if has_more else None
+    }
@@ -0,0 +1,690 @@
+"""
+Direct PostgreSQL engine - PostgREST-style queries over a pooled psycopg connection
+"""
+import re
+import threading
+from time import perf_counter
+from datetime import date, datetime, time
+from app.config import Config
+from app.services.access import ADMIN_ROLES
+from app.services.metrics import record_query
+from app.services.repository import Repository, RepositoryError
+
+try:
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import ConnectionPool
+except ImportError:  # only required when DB_ENGINE=postgres
+    Jsonb = ConnectionPool = None
+
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+SELECT_ITEM = re.compile(r'^(?:(\w+)\s*:\s*)?(\w+)\s*(?:\((.*)\))?$', re.S)
+LOGIC_GROUP = re.compile(r'^(not\.)?(and|or)\((.*)\)$', re.S)
+
+COMPARISONS = {
+    'eq': '=', 'neq': '<>', 'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=',
+    'like': 'LIKE', 'ilike': 'ILIKE'
+}
+IS_VALUES = {'null': 'NULL', 'true': 'TRUE', 'false': 'FALSE', 'unknown': 'UNKNOWN'}
+
+SCHEMA_FOREIGN_KEYS = """
+    SELECT src.relname, sa.attname, dst.relname, da.attname
+    FROM pg_constraint c
+    JOIN pg_class src ON src.oid = c.conrelid
+    JOIN pg_class dst ON dst.oid = c.confrelid
+    JOIN pg_attribute sa ON sa.attrelid = c.conrelid AND sa.attnum = c.conkey[1]
+    JOIN pg_attribute da ON da.attrelid = c.confrelid AND da.attnum = c.confkey[1]
+    WHERE c.contype = 'f' AND cardinality(c.conkey) = 1
+      AND src.relnamespace = current_schema()::regnamespace
+"""
+SCHEMA_COLUMNS = """
+    SELECT cl.relname, a.attname, format_type(a.atttypid, a.atttypmod)
+    FROM pg_attribute a
+    JOIN pg_class cl ON cl.oid = a.attrelid
+    WHERE cl.relnamespace = current_schema()::regnamespace
+      AND cl.relkind IN ('r', 'p', 'v', 'm') AND a.attnum > 0 AND NOT a.attisdropped
+"""
+SCHEMA_FUNCTIONS = """
+    SELECT p.proname, p.proretset OR t.typtype = 'c'
+    FROM pg_proc p
+    JOIN pg_type t ON t.oid = p.prorettype
+    WHERE p.pronamespace = current_schema()::regnamespace
+"""
+
+OWNER_SQL = 'SELECT created_by::text FROM projects WHERE id = %s'
+ROLE_SQL = 'SELECT role FROM project_members WHERE project_id = %s AND user_id = %s'
+GUEST_ROLE_SQL = 'SELECT role FROM guest_members WHERE project_id = %s AND email = %s LIMIT 1'
+ACCESS_SQL = """
+    SELECT p.created_by::text, m.role
+    FROM projects AS p
+    LEFT JOIN project_members AS m ON m.project_id = p.id AND m.user_id = %s
+    WHERE p.id = %s
+"""
+
+
+def quote_ident(name: str) -> str:
+    """Quote an identifier, rejecting anything that is not a plain name"""
+    if not IDENTIFIER.match(name or ''):
+        raise RepositoryError(f'Invalid identifier: {name!r}')
+    return f'"{name}"'
+
+
+def split_top_level(text: str) -> list:
+    """Split on commas that are not inside parentheses or double quotes"""
+    parts, depth, quoted, escaped, start = [], 0, False, False, 0
+
+    for i, char in enumerate(text):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(text[start:i])
+            start = i + 1
+
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def _filter_value(value):
+    """Filter values travel as untyped text, so PostgreSQL infers the column type
+    (the same thing PostgREST does with query-string values)"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+class QueryResult:
+    """Result of an executed query (mirrors postgrest's APIResponse)"""
+
+    __slots__ = ('data', 'count')
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class Schema:
+    """Foreign keys, column types and functions of the current schema"""
+
+    def __init__(self, foreign_keys, columns, functions):
+        self.foreign_keys = foreign_keys
+        self.columns = columns
+        self.functions = functions
+
+    @classmethod
+    def load(cls, conn):
+        columns = {}
+        for table, column, type_name in conn.execute(SCHEMA_COLUMNS).fetchall():
+            columns.setdefault(table, {})[column] = type_name
+
+        return cls(
+            conn.execute(SCHEMA_FOREIGN_KEYS).fetchall(),
+            columns,
+            dict(conn.execute(SCHEMA_FUNCTIONS).fetchall())
+        )
+
+    def column_type(self, table: str, column: str) -> str:
+        try:
+            return self.columns[table][column]
+        except KeyError:
+            raise RepositoryError(f"Unknown column '{column}' on '{table}'")
+
+    def relation(self, table: str, name: str):
+        """Resolve an embed the way PostgREST does.
+
+        name is either a foreign-key column of table or a related table.
+        Returns (target table, local column, remote column, to_many).
+        """
+        for src, column, dst, dst_column in self.foreign_keys:
+            if src == table and column == name:
+                return dst, column, dst_column, False
+
+        outgoing = [fk for fk in self.foreign_keys if fk[0] == table and fk[2] == name]
+        incoming = [fk for fk in self.foreign_keys if fk[0] == name and fk[2] == table]
+
+        if len(outgoing) == 1 and not incoming:
+            _, column, dst, dst_column = outgoing[0]
+            return dst, column, dst_column, False
+
+        if len(incoming) == 1 and not outgoing:
+            src, column, _, dst_column = incoming[0]
+            return src, dst_column, column, True
+
+        raise RepositoryError(f"Could not find a unique relationship between '{table}' and '{name}'")
+
+
+class SqlBuilder:
+    """Accumulates SQL parameters and table aliases while a statement is compiled"""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.params = []
+        self._aliases = 0
+
+    def alias(self) -> str:
+        alias = f't{self._aliases}'
+        self._aliases += 1
+        return alias
+
+    def param(self, value) -> str:
+        self.params.append(value)
+        return '%s'
+
+    def value(self, table: str, column: str, value) -> str:
+        """Parameter for a column value (JSON columns get their values wrapped)"""
+        if isinstance(value, (dict, list)) and self.schema.column_type(table, column) in ('json', 'jsonb'):
+            value = Jsonb(value)
+        return self.param(value)
+
+    # Select lists and embeds
+    def select_list(self, table: str, select: str, alias: str) -> str:
+        items = []
+
+        for item in split_top_level(select or '*'):
+            if item == '*':
+                items.append(f'{alias}.*')
+                continue
+
+            match = SELECT_ITEM.match(item)
+            if not match:
+                raise RepositoryError(f'Unsupported select item: {item}')
+
+            label, name, embedded = match.groups()
+
+            if embedded is None:
+                column = f'{alias}.{quote_ident(name)}'
+                items.append(f'{column} AS {quote_ident(label)}' if label else column)
+            else:
+                items.append(f'{self.embed(table, name, embedded, alias)} AS {quote_ident(label or name)}')
+
+        return ', '.join(items)
+
+    def embed(self, table: str, name: str, select: str, parent: str) -> str:
+        target, local, remote, to_many = self.schema.relation(table, name)
+        alias = self.alias()
+
+        inner = (
+            f'SELECT {self.select_list(target, select, alias)} FROM {quote_ident(target)} AS {alias} '
+            f'WHERE {alias}.{quote_ident(remote)} = {parent}.{quote_ident(local)}'
+        )
+
+        if to_many:
+            return f"(SELECT coalesce(json_agg(_{alias}), '[]') FROM ({inner}) AS _{alias})"
+        return f'(SELECT row_to_json(_{alias}) FROM ({inner}) AS _{alias})'
+
+    # Filters
+    def condition(self, alias: str, column: str, operator: str, value, negate: bool = False) -> str:
+        target = f'{alias}.{quote_ident(column)}'
+
+        if operator in COMPARISONS:
+            if operator in ('like', 'ilike'):
+                value = str(value).replace('*', '%')
+            sql = f'{target} {COMPARISONS[operator]} {self.param(_filter_value(value))}'
+        elif operator == 'is':
+            keyword = IS_VALUES.get(str(value).lower() if value is not None else 'null')
+            if keyword is None:
+                raise RepositoryError(f'Invalid is. value: {value}')
+            sql = f'{target} IS {keyword}'
+        elif operator == 'in':
+            values = list(value)
+            if not values:
+                sql = 'FALSE'
+            else:
+                sql = f"{target} IN ({', '.join(self.param(_filter_value(v)) for v in values)})"
+        else:
+            raise RepositoryError(f'Unsupported filter operator: {operator}')
+
+        return f'NOT ({sql})' if negate else sql
+
+    def logic_tree(self, alias: str, text: str, joiner: str = 'OR') -> str:
+        """Compile a PostgREST logic tree such as or=(a.eq.1,and(b.gt.2,c.is.null))"""
+        conditions = []
+
+        for item in split_top_level(text):
+            group = LOGIC_GROUP.match(item)
+
+            if group:
+                negate, kind, inner = group.groups()
+                sql = f'({self.logic_tree(alias, inner, kind.upper())})'
+                conditions.append(f'NOT {sql}' if negate else sql)
+                continue
+
+            column, _, rest = item.partition('.')
+            negate = rest.startswith('not.')
+            operator, _, raw = rest[4:].partition('.') if negate else rest.partition('.')
+
+            if operator == 'in':
+                value = [_unquote(v) for v in split_top_level(raw.strip()[1:-1])]
+            else:
+                value = _unquote(raw)
+
+            conditions.append(self.condition(alias, column, operator, value, negate))
+
+        return f' {joiner} '.join(conditions) or 'TRUE'
+
+    def guard(self, project_ref: str, user_id: str, admin: bool) -> str:
+        """Condition: user_id is the creator or a member (an admin, if required) of the project"""
+        # Parameters are appended in the order they appear in the SQL
+        uid = _filter_value(user_id)
+        sql = (
+            f'EXISTS (SELECT 1 FROM projects AS _p WHERE _p.id = {project_ref} '
+            f'AND (_p.created_by = {self.param(uid)} OR EXISTS (SELECT 1 FROM project_members AS _m '
+            f'WHERE _m.project_id = _p.id AND _m.user_id = {self.param(uid)}'
+        )
+        if admin:
+            sql += f" AND _m.role IN ({', '.join(self.param(role) for role in ADMIN_ROLES)})"
+
+        return sql + ')))'
+
+
+class PostgresQuery:
+    """Fluent query builder compatible with the subset of postgrest-py the services use"""
+
+    def __init__(self, repository, table: str):
+        self._repository = repository
+        self._table = table
+        self._action = 'select'
+        self._columns = '*'
+        self._count = None
+        self._rows = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._single = False
+        self._guard = None
+        self._negate = False
+
+    # Actions
+    def select(self, *columns, count: str = None):
+        self._action = 'select'
+        self._columns = ', '.join(columns) or '*'
+        self._count = count
+        return self
+
+    def insert(self, json, **kwargs):
+        self._action = 'insert'
+        self._rows = json if isinstance(json, list) else [json]
+        return self
+
+    def upsert(self, json, on_conflict: str = '', ignore_duplicates: bool = False, **kwargs):
+        self.insert(json)
+        self._on_conflict = on_conflict or 'id'
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json: dict, **kwargs):
+        self._action = 'update'
+        self._rows = [json]
+        return self
+
+    def delete(self, **kwargs):
+        self._action = 'delete'
+        return self
+
+    # Filters
+    def _add(self, column: str, operator: str, value):
+        if '.' in column:
+            raise RepositoryError(f'Embedded filters are not supported: {column}')
+        self._filters.append(('condition', column, operator, value, self._negate))
+        self._negate = False
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def eq(self, column, value):
+        return self._add(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._add(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._add(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._add(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._add(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._add(column, 'lte', value)
+
+    def like(self, column, pattern):
+        return self._add(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._add(column, 'ilike', pattern)
+
+    def is_(self, column, value):
+        return self._add(column, 'is', 'null' if value is None else value)
+
+    def in_(self, column, values):
+        return self._add(column, 'in', list(values))
+
+    def filter(self, column, operator, criteria):
+        self._filters.append(('tree', f'{column}.{operator}.{criteria}'))
+        return self
+
+    def or_(self, filters: str, reference_table: str = None):
+        if reference_table:
+            raise RepositoryError('Embedded filters are not supported')
+        self._filters.append(('tree', filters))
+        return self
+
+    # Modifiers
+    def order(self, column: str, *, desc: bool = False, nullsfirst: bool = False, foreign_table: str = None):
+        if foreign_table:
+            raise RepositoryError('Ordering embedded resources is not supported')
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: str = None):
+        self._limit = int(size)
+        return self
+
+    def offset(self, size: int):
+        self._offset = int(size)
+        return self
+
+    def range(self, start: int, end: int, foreign_table: str = None):
+        self._offset = int(start)
+        self._limit = int(end) - int(start) + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def guard(self, user_id: str, admin: bool = False, column: str = 'project_id'):
+        """Only touch rows whose project (rows[column]) the user may change"""
+        self._guard = (user_id, admin, column)
+        return self
+
+    # Compilation
+    def _where(self, sql: SqlBuilder, alias: str) -> str:
+        conditions = []
+
+        for kind, *args in self._filters:
+            if kind == 'condition':
+                column, operator, value, negate = args
+                conditions.append(sql.condition(alias, column, operator, value, negate))
+            else:
+                conditions.append(f'({sql.logic_tree(alias, args[0])})')
+
+        if self._guard:
+            user_id, admin, column = self._guard
+            conditions.append(sql.guard(f'{alias}.{quote_ident(column)}', user_id, admin))
+
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+    def _select_sql(self, sql: SqlBuilder) -> str:
+        alias = sql.alias()
+        table = quote_ident(self._table)
+        columns = sql.select_list(self._table, self._columns, alias)
+        where = self._where(sql, alias)
+
+        order = ', '.join(
+            f"{alias}.{quote_ident(column)}{' DESC' if desc else ''}{' NULLS FIRST' if nullsfirst else ''}"
+            for column, desc, nullsfirst in self._order
+        )
+
+        inner = f'SELECT {columns} FROM {table} AS {alias}{where}'
+        if order:
+            inner += f' ORDER BY {order}'
+        if self._limit is not None:
+            inner += f' LIMIT {self._limit}'
+        if self._offset is not None:
+            inner += f' OFFSET {self._offset}'
+
+        data = f"SELECT coalesce(json_agg(_r), '[]') FROM ({inner}) AS _r"
+
+        if self._count:
+            count_alias = sql.alias()
+            return (
+                f'SELECT ({data}), (SELECT count(*) FROM {table} AS {count_alias}'
+                f'{self._where(sql, count_alias)})'
+            )
+
+        return data
+
+    def _insert_sql(self, sql: SqlBuilder) -> str:
+        table = quote_ident(self._table)
+        columns = list(dict.fromkeys(column for row in self._rows for column in row))
+        names = ', '.join(quote_ident(column) for column in columns)
+
+        if self._guard:
+            # INSERT ... SELECT needs explicit types; rows the user may not change are dropped
+            user_id, admin, guard_column = self._guard
+            alias = sql.alias()
+            values = ', '.join(
+                '(' + ', '.join(
+                    f'{sql.value(self._table, c, row.get(c))}::{sql.schema.column_type(self._table, c)}'
+                    for c in columns
+                ) + ')'
+                for row in self._rows
+            )
+            source = (
+                f'SELECT * FROM (VALUES {values}) AS {alias} ({names}) '
+                f'WHERE {sql.guard(f"{alias}.{quote_ident(guard_column)}", user_id, admin)}'
+            )
+        else:
+            source = 'VALUES ' + ', '.join(
+                '(' + ', '.join(
+                    sql.value(self._table, c, row[c]) if c in row else 'DEFAULT' for c in columns
+                ) + ')'
+                for row in self._rows
+            )
+
+        statement = f'INSERT INTO {table} ({names}) {source}'
+
+        if self._on_conflict:
+            conflict = [c.strip() for c in self._on_conflict.split(',')]
+            changes = [c for c in columns if c not in conflict]
+            target = ', '.join(quote_ident(c) for c in conflict)
+
+            if self._ignore_duplicates or not changes:
+                statement += f' ON CONFLICT ({target}) DO NOTHING'
+            else:
+                statement += f' ON CONFLICT ({target}) DO UPDATE SET ' + ', '.join(
+                    f'{quote_ident(c)} = EXCLUDED.{quote_ident(c)}' for c in changes
+                )
+
+        return statement
+
+    def _write_sql(self, sql: SqlBuilder) -> str:
+        table = quote_ident(self._table)
+
+        if self._action == 'insert':
+            statement = self._insert_sql(sql)
+        else:
+            alias = sql.alias()
+
+            if self._action == 'update':
+                assignments = ', '.join(
+                    f'{quote_ident(column)} = {sql.value(self._table, column, value)}'
+                    for column, value in self._rows[0].items()
+                )
+                statement = f'UPDATE {table} AS {alias} SET {assignments}'
+            else:
+                statement = f'DELETE FROM {table} AS {alias}'
+
+            where = self._where(sql, alias)
+            if not where:
+                # Same safeguard as Supabase (pg-safeupdate)
+                raise RepositoryError(f'{self._action.upper()} requires a WHERE clause')
+            statement += where
+
+        return (
+            f"WITH _w AS ({statement} RETURNING *) "
+            f"SELECT coalesce(json_agg(_w), '[]') FROM _w"
+        )
+
+    def compile(self, schema: Schema):
+        """Build (sql, params) for this query"""
+        sql = SqlBuilder(schema)
+
+        if self._action == 'select' or (self._action == 'update' and not self._rows[0]):
+            # An empty update changes nothing; answer with the matching rows
+            statement = self._select_sql(sql)
+        else:
+            statement = self._write_sql(sql)
+
+        return statement, sql.params
+
+    def execute(self) -> QueryResult:
+        if self._action == 'insert' and not self._rows:
+            return QueryResult([])
+
+        row = self._repository.fetch_one(self.compile, self._table, self._action)
+        data = row[0]
+        count = row[1] if len(row) > 1 else None
+
+        if self._single:
+            if len(data) != 1:
+                raise RepositoryError(f'Expected a single row, got {len(data)}')
+            data = data[0]
+
+        return QueryResult(data, count)
+
+
+class PostgresRpc:
+    """Call of a database function with named arguments.
+
+    Objects and lists of objects are passed as jsonb, lists of scalars as
+    arrays (e.g. bigint[]), like PostgREST does.
+    """
+
+    def __init__(self, repository, fn: str, params: dict):
+        self._repository = repository
+        self._fn = fn
+        self._params = params
+
+    @staticmethod
+    def _argument(value):
+        if isinstance(value, dict) or (
+            isinstance(value, list) and any(isinstance(item, (dict, list)) for item in value)
+        ):
+            return Jsonb(value)
+        return value
+
+    def compile(self, schema: Schema):
+        sql = SqlBuilder(schema)
+        arguments = ', '.join(
+            f'{quote_ident(name)} => {sql.param(self._argument(value))}'
+            for name, value in self._params.items()
+        )
+        call = f'{quote_ident(self._fn)}({arguments})'
+
+        if schema.functions.get(self._fn):
+            return f"SELECT coalesce(json_agg(_r), '[]') FROM {call} AS _r", sql.params
+        return f'SELECT to_json({call})', sql.params
+
+    def execute(self) -> QueryResult:
+        return QueryResult(self._repository.fetch_one(self.compile, self._fn, 'rpc')[0])
+
+
+class PostgresRepository(Repository):
+    """Repository talking to PostgreSQL directly through a connection pool.
+
+    Statements are prepared server-side once they have run
+    Config.DATABASE_PREPARE_THRESHOLD times on a connection. Results are
+    built as JSON by the database, so rows have the same shape as PostgREST
+    responses. Writes support guard() for single-statement access checks.
+    """
+
+    guarded_writes = True
+
+    def __init__(self, conninfo: str, min_size: int = None, max_size: int = None):
+        if ConnectionPool is None:
+            raise RuntimeError("DB_ENGINE=postgres requires psycopg: pip install 'psycopg[binary,pool]'")
+
+        self._pool = ConnectionPool(
+            conninfo,
+            min_size=min_size or Config.DATABASE_POOL_MIN_SIZE,
+            max_size=max_size or Config.DATABASE_POOL_MAX_SIZE,
+            kwargs={'autocommit': True, 'prepare_threshold': Config.DATABASE_PREPARE_THRESHOLD},
+            name='teamcamp',
+            open=True
+        )
+        self._schema = None
+        self._schema_lock = threading.Lock()
+
+    def connection(self):
+        """Borrow a pooled connection (context manager)"""
+        return self._pool.connection()
+
+    def get_schema(self, refresh: bool = False) -> Schema:
+        """Introspected schema, loaded on first use"""
+        if self._schema is None or refresh:
+            with self._schema_lock:
+                if self._schema is None or refresh:
+                    with self.connection() as conn:
+                        self._schema = Schema.load(conn)
+        return self._schema
+
+    def fetch_one(self, compile, name: str, operation: str = 'select'):
+        """Compile against the schema (reloading it once for unknown names) and fetch one row"""
+        schema = self.get_schema()
+        if name not in schema.columns and name not in schema.functions:
+            schema = self.get_schema(refresh=True)
+
+        statement, params = compile(schema)
+        return self._fetch_row(statement, params, name, operation)
+
+    def close(self):
+        self._pool.close()
+
+    def table(self, name: str) -> PostgresQuery:
+        return PostgresQuery(self, name)
+
+    def rpc(self, fn: str, params: dict = None) -> PostgresRpc:
+        return PostgresRpc(self, fn, params or {})
+
+    def _fetch_row(self, statement: str, params, table: str, operation: str):
+        """Run one statement and return its first row; the round trip is recorded in metrics"""
+        start = perf_counter()
+        failed = True
+        try:
+            with self.connection() as conn:
+                row = conn.execute(statement, params).fetchone()
+            failed = False
+            return row
+        finally:
+            record_query(table, operation, perf_counter() - start, failed)
+
+    def fetch_owner(self, project_id: int):
+        row = self._fetch_row(OWNER_SQL, (str(project_id),), 'projects', 'access')
+        return row[0] if row else None
+
+    def fetch_role(self, project_id: int, user_id: str):
+        row = self._fetch_row(ROLE_SQL, (str(project_id), str(user_id)), 'project_members', 'access')
+        return row[0] if row else None
+
+    def fetch_access(self, project_id: int, user_id: str):
+        row = self._fetch_row(ACCESS_SQL, (str(user_id), str(project_id)), 'projects', 'access')
+        return (row[0], row[1]) if row else (None, None)
+
+    def fetch_guest_role(self, project_id: int, email: str):
+        # Guest emails are stored lowercased
+        row = self._fetch_row(GUEST_ROLE_SQL, (str(project_id), email.lower()), 'guest_members', 'access')
+        return row[0] if row else None
@@ -0,0 +1,79 @@
+"""
+User Project Index - cached "which projects can this user see, and with which role"
+"""
+from app.services.broadcast import broadcast
+from app.services.cache import TTLCache
+
+# How a user reaches a project, strongest first
+SOURCES = ('owner', 'member', 'guest')
+
+
+def merge_grants(grants) -> list:
+    """Collapse (project, role, source) grants into one entry per project.
+
+    The first grant seen for a project wins, so grants must come strongest
+    source first. Linear in the number of grants.
+    """
+    merged = {}
+
+    for project, role, source in grants:
+        if project and project['id'] not in merged:
+            merged[project['id']] = {
+                **project,
+                'role': role,
+                'is_creator': source == 'owner',
+                'is_guest': source == 'guest'
+            }
+
+    return list(merged.values())
+
+
+class UserProjectIndex:
+    """Per-user project listings: created, member and guest projects with the effective role.
+
+    Entries are keyed by (user id, email) since guest access is granted by
+    email. They expire after a TTL, and services that change projects or
+    memberships must call the invalidate_* hooks.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 10):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(user_id: str, email: str = None) -> tuple:
+        return user_id, (email or '').lower()
+
+    def get(self, user_id: str, email: str = None):
+        """Copies of the cached projects (None if not cached)"""
+        projects = self._cache.get(self._key(user_id, email))
+        return None if projects is None else [dict(project) for project in projects]
+
+    def set(self, user_id: str, email: str, projects: list):
+        self._cache.set(self._key(user_id, email), tuple(dict(project) for project in projects))
+
+    # Invalidation hooks
+    @broadcast()
+    def invalidate_user(self, user_id: str):
+        """Forget a user's listing (membership added, changed or removed)"""
+        self._cache.discard_where(lambda key: key[0] == user_id)
+
+    @broadcast()
+    def invalidate_email(self, email: str):
+        """Forget listings of whoever signs in with this email (guest invited)"""
+        email = (email or '').lower()
+        self._cache.discard_where(lambda key: key[1] == email)
+
+    @broadcast()
+    def invalidate_project(self, project_id: int):
+        """Forget every listing that contains a project (project or guest changed)"""
+        self._cache.discard_values_where(
+            lambda projects: any(project['id'] == project_id for project in projects)
+        )
+
+    def clear(self):
+        """Forget everything"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Cache statistics"""
+        return self._cache.stats()
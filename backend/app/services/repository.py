@@ -0,0 +1,185 @@
+"""
+Data Repositories - engine-neutral access to the application tables
+"""
+import abc
+import asyncio
+
+
+class RepositoryError(Exception):
+    """Raised by an engine when a query cannot be answered as requested"""
+
+
+def missing_function(error: Exception) -> bool:
+    """Whether an rpc() failed because the database function is not installed"""
+    # PostgREST reports PGRST202; PostgreSQL raises undefined_function (42883)
+    return getattr(error, 'code', None) == 'PGRST202' or getattr(error, 'sqlstate', None) == '42883'
+
+
+def missing_table(error: Exception) -> bool:
+    """Whether a query failed because the table is not installed"""
+    # PostgREST reports PGRST205 (or passes through 42P01); PostgreSQL raises undefined_table
+    return getattr(error, 'code', None) in ('PGRST205', '42P01') or getattr(error, 'sqlstate', None) == '42P01'
+
+
+def _owner_from(data):
+    return data[0]['created_by'] if data else None
+
+
+def _role_from(data):
+    return data[0]['role'] if data else None
+
+
+def _access_from(data):
+    if not data:
+        return None, None
+    members = data[0].get('project_members') or []
+    return data[0]['created_by'], (members[0]['role'] if members else None)
+
+
+class Repository(abc.ABC):
+    """Data access used by SupabaseService, independent of the database engine.
+
+    table() and rpc() return PostgREST-style query builders (select, insert,
+    update, upsert, delete, filters, order, limit; execute() returns an object
+    with .data). The fetch_* methods answer access-control lookups, each in
+    one round trip.
+    """
+
+    # Engines that support query.guard(user_id, ...) run the access check and
+    # the write as a single statement
+    guarded_writes = False
+
+    @abc.abstractmethod
+    def table(self, name: str):
+        """Start a query on a table"""
+
+    @abc.abstractmethod
+    def rpc(self, fn: str, params: dict = None):
+        """Call a database function"""
+
+    @abc.abstractmethod
+    def fetch_owner(self, project_id: int):
+        """Get a project's creator (None if the project does not exist)"""
+
+    @abc.abstractmethod
+    def fetch_role(self, project_id: int, user_id: str):
+        """Get a user's project_members role (None if not a member)"""
+
+    @abc.abstractmethod
+    def fetch_access(self, project_id: int, user_id: str):
+        """Get (creator, member role) for a project in one round trip"""
+
+    @abc.abstractmethod
+    def fetch_guest_role(self, project_id: int, email: str):
+        """Get the guest_members role of an email (None if not invited)"""
+
+
+class PostgrestRepository(Repository):
+    """Repository over the Supabase client (PostgREST over HTTP)"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def table(self, name: str):
+        return self.client.table(name)
+
+    def rpc(self, fn: str, params: dict = None):
+        return self.client.rpc(fn, params or {})
+
+    def _owner_query(self, project_id: int):
+        return self.client.table('projects').select('created_by').eq('id', project_id)
+
+    def _role_query(self, project_id: int, user_id: str):
+        return self.client.table('project_members').select('role').eq(
+            'project_id', project_id
+        ).eq('user_id', user_id)
+
+    def _guest_query(self, project_id: int, email: str):
+        # Guest emails are stored lowercased
+        return self.client.table('guest_members').select('role').eq(
+            'project_id', project_id
+        ).eq('email', email.lower()).limit(1)
+
+    def _access_query(self, project_id: int, user_id: str):
+        # The embedded filter keeps only this user's membership row
+        return self.client.table('projects').select(
+            'created_by, project_members(role)'
+        ).eq('id', project_id).eq('project_members.user_id', user_id)
+
+    def fetch_owner(self, project_id: int):
+        return _owner_from(self._owner_query(project_id).execute().data)
+
+    def fetch_role(self, project_id: int, user_id: str):
+        return _role_from(self._role_query(project_id, user_id).execute().data)
+
+    def fetch_access(self, project_id: int, user_id: str):
+        return _access_from(self._access_query(project_id, user_id).execute().data)
+
+    def fetch_guest_role(self, project_id: int, email: str):
+        return _role_from(self._guest_query(project_id, email).execute().data)
+
+
+class AsyncPostgrestRepository(PostgrestRepository):
+    """Repository over the async Supabase client; execute() and fetch_* are awaitable"""
+
+    async def fetch_owner(self, project_id: int):
+        return _owner_from((await self._owner_query(project_id).execute()).data)
+
+    async def fetch_role(self, project_id: int, user_id: str):
+        return _role_from((await self._role_query(project_id, user_id).execute()).data)
+
+    async def fetch_access(self, project_id: int, user_id: str):
+        return _access_from((await self._access_query(project_id, user_id).execute()).data)
+
+    async def fetch_guest_role(self, project_id: int, email: str):
+        return _role_from((await self._guest_query(project_id, email).execute()).data)
+
+
+class _AsyncQuery:
+    """Query builder proxy whose execute() runs the blocking query in a worker thread"""
+
+    __slots__ = ('_query',)
+
+    def __init__(self, query):
+        self._query = query
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+
+        if not callable(attr):
+            return _AsyncQuery(attr) if hasattr(attr, 'execute') else attr
+
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return _AsyncQuery(result) if hasattr(result, 'execute') else result
+
+        return chained
+
+    async def execute(self):
+        return await asyncio.to_thread(self._query.execute)
+
+
+class AsyncRepository(Repository):
+    """Async facade over a blocking repository (e.g. the direct Postgres engine)"""
+
+    def __init__(self, repository: Repository):
+        self._repository = repository
+        self.guarded_writes = repository.guarded_writes
+
+    def table(self, name: str):
+        return _AsyncQuery(self._repository.table(name))
+
+    def rpc(self, fn: str, params: dict = None):
+        return _AsyncQuery(self._repository.rpc(fn, params))
+
+    async def fetch_owner(self, project_id: int):
+        return await asyncio.to_thread(self._repository.fetch_owner, project_id)
+
+    async def fetch_role(self, project_id: int, user_id: str):
+        return await asyncio.to_thread(self._repository.fetch_role, project_id, user_id)
+
+    async def fetch_access(self, project_id: int, user_id: str):
+        return await asyncio.to_thread(self._repository.fetch_access, project_id, user_id)
+
+    async def fetch_guest_role(self, project_id: int, email: str):
+        return await asyncio.to_thread(self._repository.fetch_guest_role, project_id, email)
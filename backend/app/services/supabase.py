@@ -1,29 +1,296 @@
 """
 Supabase Service - Database interactions
 """
-from supabase import create_client, Client
+import os
+import threading
+from supabase import Client
 from app.config import Config
+from app.services.transport import create_tuned_client
+from app.services.repository import Repository, PostgrestRepository, missing_function, missing_table
+from app.services.postgres import PostgresRepository
+from app.services.access import ProjectAccessResolver
+from app.services.project_index import UserProjectIndex, merge_grants
+from app.services.events import EventBus, RESYNC
+from app.services.broadcast import ProcessBroadcast
+from app.services.task_cache import ProjectTaskCache, list_version
+from app.services.tokens import UserPrincipal, VerifiedTokenCache
+from app.services.pagination import paginate, encode_cursor, decode_cursor, encode_sync_cursor
+from app.services.fields import build_select, wants
+from app.services.filters import apply_task_filters, is_overdue, overdue_cutoff
+from app.services.jobs import JobQueue
+from app.services.imports import parse_task_row
+from app.services.uploads import (
+    UploadError, FINALIZE_ERRORS, check_upload, check_file_path, in_project_folder, storage_path, upload_instructions
+)
+import base64
+import json
 import jwt
-from datetime import datetime
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from dateutil.parser import isoparse
+from urllib.parse import quote, unquote_to_bytes
+
+# Stable keyset orderings for paginated listings
+TASK_SORT = [('created_at', False), ('id', False)]
+FILE_SORT = [('uploaded_at', True), ('id', True)]
+# Search results are ordered by rank, so their cursors carry an offset instead
+SEARCH_PAGE = [('offset', False)]
+
+# Default representations for list endpoints
+TASK_SELECT = '*, assignee:assigned_to(id, email, first_name, last_name)'
+USER_TASK_SELECT = '*, projects(name)'
+FILE_SELECT = '*, uploader:uploaded_by(id, email, first_name, last_name)'
+
+# Task columns a client may change
+TASK_UPDATE_FIELDS = ('title', 'description', 'status', 'assigned_to', 'due_date', 'priority')
+
+# Task statuses counted separately in project rollups
+TASK_STATUSES = ('todo', 'in_progress', 'done')
+
+# Sync cursors are never older than this on the API host's clock (far more
+# than any clock difference with the database)
+SYNC_CURSOR_FLOOR = timedelta(days=1)
+
+# Kinds of search results
+SEARCH_TYPES = ('task', 'file', 'project')
+
+# Project export: record type -> (table, columns), streamed in this order after the project
+EXPORT_TABLES = {
+    'member': ('project_members', 'id, user_id, role, created_at, users(email, first_name, last_name)'),
+    'guest': ('guest_members', '*'),
+    'task': ('tasks', '*'),
+    'file': ('files', '*')
+}
 
 class SupabaseService:
     """Supabase database service"""
     
     _client: Client = None
+    _client_pid: int = None
+    _client_lock = threading.Lock()
+    _thread_clients = threading.local()
+    _db: Repository = None
+    _db_pid: int = None
+    _access: ProjectAccessResolver = None
+    _projects: UserProjectIndex = None
+    _events: EventBus = None
+    _tasks: ProjectTaskCache = None
+    _jobs: JobQueue = None
+    _jobs_pid: int = None
+    _broadcast: ProcessBroadcast = None
+    _missing_functions = set()
+    _missing_tables = set()
+    _tokens = VerifiedTokenCache(
+        maxsize=Config.TOKEN_CACHE_SIZE,
+        ttl=Config.TOKEN_CACHE_TTL
+    )
     
     @classmethod
     def get_client(cls) -> Client:
-        """Get or create Supabase client"""
-        if cls._client is None:
-            cls._client = create_client(
-                Config.SUPABASE_URL,
-                Config.SUPABASE_KEY
-            )
+        """Get or create Supabase client (per process, or per thread if configured).
+        
+        Clients are re-created after a fork so pre-fork workers never share
+        pooled connections with their parent.
+        """
+        pid = os.getpid()
+        
+        if Config.SUPABASE_CLIENT_SCOPE == 'thread':
+            local = cls._thread_clients
+            if getattr(local, 'client', None) is None or local.pid != pid:
+                local.client = create_tuned_client()
+                local.pid = pid
+            return local.client
+        
+        if cls._client is None or cls._client_pid != pid:
+            with cls._client_lock:
+                if cls._client is None or cls._client_pid != pid:
+                    cls._client = create_tuned_client()
+                    cls._client_pid = pid
         return cls._client
     
+    @classmethod
+    def get_db(cls) -> Repository:
+        """Get the data repository for Config.DB_ENGINE.
+        
+        'postgrest' goes through the Supabase client; 'postgres' connects to
+        DATABASE_URL directly with one connection pool per process. Storage
+        always uses get_client().
+        """
+        if Config.DB_ENGINE != 'postgres':
+            return PostgrestRepository(cls.get_client())
+        
+        pid = os.getpid()
+        if cls._db is None or cls._db_pid != pid:
+            with cls._client_lock:
+                if cls._db is None or cls._db_pid != pid:
+                    cls._db = PostgresRepository(Config.DATABASE_URL)
+                    cls._db_pid = pid
+        return cls._db
+    
+    @classmethod
+    def get_access(cls) -> ProjectAccessResolver:
+        """Get or create the shared project access resolver"""
+        if cls._access is None:
+            cls._access = ProjectAccessResolver(
+                cls.get_db,
+                maxsize=Config.ACCESS_CACHE_SIZE,
+                ttl=Config.ACCESS_CACHE_TTL
+            )
+        return cls._access
+    
+    @classmethod
+    def get_project_index(cls) -> UserProjectIndex:
+        """Get or create the shared per-user project index"""
+        if cls._projects is None:
+            cls._projects = UserProjectIndex(
+                maxsize=Config.PROJECT_INDEX_CACHE_SIZE,
+                ttl=Config.PROJECT_INDEX_CACHE_TTL
+            )
+        return cls._projects
+    
+    @classmethod
+    def get_events(cls) -> EventBus:
+        """Get or create the realtime event bus that mutations publish to"""
+        if cls._events is None:
+            cls._events = EventBus(
+                queue_size=Config.REALTIME_QUEUE_SIZE,
+                backlog=Config.REALTIME_BACKLOG,
+                idle_channels=Config.REALTIME_IDLE_CHANNELS
+            )
+        return cls._events
+    
+    @classmethod
+    def start_broadcast(cls):
+        """Share cache invalidations and change events with the app's other
+        processes over BROADCAST_DATABASE_URL; None (each process on its own)
+        when it is not set"""
+        if not Config.BROADCAST_DATABASE_URL:
+            return None
+        
+        with cls._client_lock:
+            if cls._broadcast is None:
+                broadcast = ProcessBroadcast(Config.BROADCAST_DATABASE_URL)
+                broadcast.register('access', cls.get_access(), cls.get_access().clear)
+                broadcast.register('projects', cls.get_project_index(), cls.get_project_index().clear)
+                broadcast.register('tasks', cls.get_task_cache(), cls.get_task_cache().clear)
+                broadcast.register('events', cls.get_events(), cls.get_events().resync_all)
+                cls._broadcast = broadcast
+        
+        cls._broadcast.start()
+        return cls._broadcast
+    
+    @classmethod
+    def get_jobs(cls) -> JobQueue:
+        """Get or create the background job queue (per process; its workers start with the first job)"""
+        pid = os.getpid()
+        
+        if cls._jobs is None or cls._jobs_pid != pid:
+            with cls._client_lock:
+                if cls._jobs is None or cls._jobs_pid != pid:
+                    jobs = JobQueue(
+                        Config.JOB_DB_PATH,
+                        workers=Config.JOB_WORKERS,
+                        max_attempts=Config.JOB_MAX_ATTEMPTS,
+                        base_delay=Config.JOB_RETRY_DELAY,
+                        max_delay=Config.JOB_RETRY_MAX_DELAY,
+                        lease=Config.JOB_LEASE,
+                        retention=Config.JOB_RETENTION_DAYS * 86400
+                    )
+                    jobs.register('storage.remove', cls._remove_storage_objects)
+                    cls._jobs = jobs
+                    cls._jobs_pid = pid
+        return cls._jobs
+    
+    @classmethod
+    def _remove_storage_objects(cls, payload: dict, job):
+        """Job: delete objects from a storage bucket in batched remove calls.
+        
+        Progress is saved after every batch, so a retry resumes after the
+        last batch removed (already-missing objects are not an error). Only
+        objects in the folder of the payload's project are removed.
+        """
+        bucket = cls.get_client().storage.from_(payload['bucket'])
+        paths = payload['paths']
+        if 'project_id' in payload:
+            paths = [path for path in paths if in_project_folder(payload['project_id'], path)]
+        removed = (job.progress or {}).get('removed', 0)
+        
+        while removed < len(paths):
+            bucket.remove(paths[removed:removed + Config.STORAGE_REMOVE_BATCH_SIZE])
+            removed = min(len(paths), removed + Config.STORAGE_REMOVE_BATCH_SIZE)
+            job.report(removed=removed, total=len(paths))
+    
+    @classmethod
+    def _queue_storage_removal(cls, paths: list, project_id: int, owner: str = None):
+        """Queue removal of a project's stored objects; returns the job id.
+        
+        Paths outside the project's folder (and data: URLs of old records,
+        which have no object) are left alone, whatever the records say.
+        """
+        paths = [path for path in paths if in_project_folder(project_id, path)]
+        if not paths:
+            return None
+        
+        try:
+            return cls.get_jobs().enqueue(
+                'storage.remove', {'bucket': Config.STORAGE_BUCKET, 'project_id': project_id, 'paths': paths},
+                owner=owner, progress={'removed': 0, 'total': len(paths)}
+            )
+        except Exception as e:
+            print(f"Could not queue storage deletion of {len(paths)} objects: {e}")
+            return None
+    
+    @classmethod
+    def get_task_cache(cls) -> ProjectTaskCache:
+        """Get or create the shared write-through cache of project task lists"""
+        if cls._tasks is None:
+            cls._tasks = ProjectTaskCache(
+                TASK_SORT,
+                max_rows=Config.TASK_CACHE_ROWS,
+                ttl=Config.TASK_CACHE_TTL,
+                max_project_rows=Config.TASK_CACHE_PROJECT_ROWS
+            )
+        return cls._tasks
+    
+    @classmethod
+    def get_project_role(cls, project_id: int, user_id: str):
+        """Get user's role in a project: 'owner', 'admin', 'member' or None"""
+        return cls.get_access().resolve(project_id, user_id)
+    
+    @classmethod
+    def get_reader_role(cls, project_id: int, user_id: str, email: str = None):
+        """Get user's role for reading a project: their project role, 'guest' when
+        their email is invited as a guest, or None"""
+        return cls.get_access().reader_role(project_id, user_id, email)
+    
+    @classmethod
+    def call_function(cls, fn: str, params: dict):
+        """Call a database function; None when it is not installed.
+        
+        Callers fall back to plain queries. A missing function is remembered
+        for the life of the process so the fallback costs no extra round trip.
+        """
+        if fn in cls._missing_functions:
+            return None
+        
+        try:
+            return cls.get_db().rpc(fn, params).execute().data
+        except Exception as e:
+            if not missing_function(e):
+                raise
+            print(f"Database function {fn} is not installed (see backend/migrations); using fallback")
+            cls._missing_functions.add(fn)
+            return None
+    
     @classmethod
     def verify_user(cls, access_token: str):
         """Verify user from Supabase JWT token"""
+        # Reuse a previous verification of the same token
+        user = cls._tokens.get(access_token)
+        if user is not None:
+            return user
+        
         try:
             # Decode and verify JWT token
             payload = jwt.decode(
@@ -38,17 +305,10 @@ class SupabaseService:
                 print("Token expired")
                 return None
             
-            # Create a user object similar to Supabase response
-            class User:
-                def __init__(self, payload):
-                    self.user = type('obj', (object,), {
-                        'id': payload.get('sub'),
-                        'email': payload.get('email'),
-                        'role': payload.get('role'),
-                        'user_metadata': payload.get('user_metadata', {})
-                    })
+            user = UserPrincipal(payload)
+            cls._tokens.set(access_token, user)
             
-            return User(payload)
+            return user
             
         except jwt.ExpiredSignatureError:
             print("Token has expired")
@@ -62,48 +322,85 @@ class SupabaseService:
     
     # Projects
     @classmethod
-    def get_projects(cls, user_id: str):
-        """Get all projects for a user (created by them OR where they're a member)"""
-        client = cls.get_client()
+    def get_projects(cls, user_id: str, fields=None, email: str = None):
+        """Get all projects for a user: created, member and guest (matched by email) ones.
         
-        # Get projects created by user
-        created_projects = client.table('projects').select('*').eq(
-            'created_by', user_id
-        ).execute()
+        Served from the per-user project index; on a miss the user_projects
+        database function resolves every grant with the effective role in
+        one query.
+        """
+        index = cls.get_project_index()
+        projects = index.get(user_id, email)
+        
+        if projects is None:
+            rows = cls.call_function('user_projects', {'p_user_id': user_id, 'p_email': email})
+            
+            if rows is None:
+                grants = cls._fetch_project_grants(user_id, email)
+            else:
+                grants = ((row['project'], row['role'], row['source']) for row in rows)
+            
+            projects = cls._index_projects(user_id, email, grants)
+        
+        return cls._project_fields(projects, fields)
+    
+    @classmethod
+    def _fetch_project_grants(cls, user_id: str, email: str = None):
+        """Owner, member and guest grants from separate queries (without user_projects)"""
+        client = cls.get_db()
+        
+        created = client.table('projects').select('*').eq('created_by', user_id).execute()
+        members = client.table('project_members').select('role, projects(*)').eq('user_id', user_id).execute()
+        guests = client.table('guest_members').select('role, projects(*)').eq(
+            'email', email.lower()
+        ).execute() if email else None
         
-        # Get projects where user is a member
-        member_response = client.table('project_members').select(
-            'project_id, role, projects(*)'
-        ).eq('user_id', user_id).execute()
-        
-        # Combine both lists
-        projects = []
-        
-        # Add created projects
-        if created_projects.data:
-            for project in created_projects.data:
-                project['role'] = 'owner'  # Creator is owner
-                project['is_creator'] = True
-                projects.append(project)
-        
-        # Add member projects (avoid duplicates)
-        project_ids = [p['id'] for p in projects]
-        if member_response.data:
-            for member in member_response.data:
-                if member.get('projects') and member['projects']['id'] not in project_ids:
-                    project = member['projects']
-                    project['role'] = member['role']
-                    project['is_creator'] = False
-                    projects.append(project)
+        return cls._project_grants(created, members, guests)
+    
+    @staticmethod
+    def _project_grants(created, members, guests=None):
+        """(project, role, source) grants from query responses, strongest source first"""
+        for project in created.data or []:
+            yield project, 'owner', 'owner'
+        
+        for member in members.data or []:
+            yield member.get('projects'), member['role'], 'member'
         
+        for guest in (guests.data if guests else None) or []:
+            yield guest.get('projects'), guest['role'], 'guest'
+    
+    @classmethod
+    def _index_projects(cls, user_id: str, email: str, grants) -> list:
+        """Merge grants into the user's project listing, cache it and prime the access cache"""
+        projects = merge_grants(grants)
+        access = cls.get_access()
+        
+        for project in projects:
+            access.prime_owner(project['id'], project['created_by'])
+            # Guests may read the project (reader_role) but never pass a member check
+            if project['is_guest']:
+                access.prime_guest(project['id'], email, project['role'])
+            elif not project['is_creator']:
+                access.prime_role(project['id'], user_id, project['role'])
+        
+        cls.get_project_index().set(user_id, email, projects)
         return projects
+    
+    @staticmethod
+    def _project_fields(projects: list, fields=None) -> list:
+        """Trim listed projects to a sparse fieldset (role flags are always kept)"""
+        if fields is None:
+            return projects
+        
+        keep = {*fields, 'id', 'created_by', 'role', 'is_creator', 'is_guest'}
+        return [{k: v for k, v in project.items() if k in keep} for project in projects]
 
     
     @classmethod
     def create_project(cls, data, user_id):
         """Create a new project"""
         try:
-            client = cls.get_client()
+            client = cls.get_db()
             
             # Insert project
             project_data = {
@@ -121,6 +418,8 @@ class SupabaseService:
                 raise Exception('Failed to create project')
             
             project = response.data[0]
+            cls.get_access().invalidate_project(project['id'])
+            cls.get_project_index().invalidate_user(user_id)
             
             # REMOVED: Don't auto-add creator as member
             # Let them manually invite people instead
@@ -132,9 +431,9 @@ class SupabaseService:
             raise
     
     @classmethod
-    def get_project_by_id(cls, project_id: int, user_id: str):
-        """Get project details"""
-        client = cls.get_client()
+    def get_project_by_id(cls, project_id: int, user_id: str, email: str = None):
+        """Get project details (guests invited by email may read them)"""
+        client = cls.get_db()
         
         # Get project
         project = client.table('projects').select('*').eq('id', project_id).execute()
@@ -142,15 +441,11 @@ class SupabaseService:
         if not project.data:
             return None
         
-        # Check if user is creator OR a member
-        if project.data[0]['created_by'] == user_id:
-            return project.data[0]
-        
-        member_check = client.table('project_members').select('*').eq(
-            'project_id', project_id
-        ).eq('user_id', user_id).execute()
+        # Check if user is creator, a member or a guest
+        access = cls.get_access()
+        access.prime_owner(project_id, project.data[0]['created_by'])
         
-        if member_check.data:
+        if access.reader_role(project_id, user_id, email):
             return project.data[0]
         
         return None
@@ -158,111 +453,460 @@ class SupabaseService:
     @classmethod
     def update_project(cls, project_id: int, data: dict, user_id: str):
         """Update project"""
-        client = cls.get_client()
+        client = cls.get_db()
+        query = client.table('projects').update(data).eq('id', project_id)
         
-        # Get project to check creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
-        
-        if not project.data:
+        # Allow creator OR admin/owner members
+        if client.guarded_writes:
+            query = query.guard(user_id, admin=True, column='id')
+        elif not cls.get_access().is_admin(project_id, user_id):
             return None
         
-        # Allow creator OR admin/owner members
-        if project.data[0]['created_by'] == user_id:
-            response = client.table('projects').update(data).eq('id', project_id).execute()
-            return response.data[0] if response.data else None
+        response = query.execute()
         
-        # Check if member is admin
-        member = client.table('project_members').select('role').eq(
-            'project_id', project_id
-        ).eq('user_id', user_id).execute()
+        # Listings embed the project's columns
+        cls.get_project_index().invalidate_project(project_id)
         
-        if member.data and member.data[0]['role'] in ['owner', 'admin']:
-            response = client.table('projects').update(data).eq('id', project_id).execute()
-            return response.data[0] if response.data else None
+        # Ownership transfer changes everyone's effective role
+        if 'created_by' in data:
+            cls.get_access().invalidate_project(project_id)
+            cls.get_project_index().invalidate_user(data['created_by'])
         
-        return None
+        if response.data:
+            cls.get_events().publish(project_id, 'project.updated', response.data[0])
+        
+        return response.data[0] if response.data else None
     
     @classmethod
     def delete_project(cls, project_id: int, user_id: str):
-        """Delete project - only creator can delete"""
-        client = cls.get_client()
-        
-        # Get project to check creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        """Delete project - only creator can delete.
         
-        if not project.data:
-            return False
+        The project's stored files are purged by a background job. Returns
+        {'purge_job_id': ...} (None when there was nothing to purge), or
+        False when the user may not delete the project.
+        """
+        client = cls.get_db()
         
         # Only creator can delete project
-        if project.data[0]['created_by'] != user_id:
+        if cls.get_access().get_owner(project_id) != user_id:
             return False
         
-        # Delete project (cascade will handle related records)
-        client.table('projects').delete().eq('id', project_id).execute()
+        # Delete project (cascade will handle related records) and collect its storage paths in one call
+        paths = cls.call_function('delete_project_files', {'p_project_id': project_id})
         
-        return True
+        if paths is None:
+            paths = cls._project_file_paths(project_id)
+            client.table('projects').delete().eq('id', project_id).execute()
+        
+        cls.get_access().invalidate_project(project_id)
+        cls.get_project_index().invalidate_project(project_id)
+        cls.get_task_cache().invalidate(project_id)
+        cls.get_events().publish(project_id, 'project.deleted', {'id': project_id})
+        
+        return {'purge_job_id': cls._queue_storage_removal(paths, project_id, owner=user_id)}
+    
+    @classmethod
+    def _project_file_paths(cls, project_id: int) -> list:
+        """Storage paths of a project's files"""
+        return [row['file_path'] for row in cls._iter_project_rows(
+            'files', 'id, file_path', project_id, Config.STORAGE_REMOVE_BATCH_SIZE
+        )]
+    
+    @classmethod
+    def _iter_project_rows(cls, table: str, columns: str, project_id: int, page_size: int):
+        """A project's rows of a table in id order, read lazily in keyset pages"""
+        client = cls.get_db()
+        last_id = 0
+        
+        while True:
+            rows = client.table(table).select(columns).eq('project_id', project_id).gt(
+                'id', last_id
+            ).order('id').limit(page_size).execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['id']
+    
+    @classmethod
+    def get_project_stats(cls, project_id: int, user_id: str, email: str = None):
+        """Get task, member and file aggregates for a project.
+        
+        Aggregated in one call by the project_stats database function, or
+        from the project's rows when it is not installed.
+        """
+        # Allow creator, members OR guests to view statistics
+        if not cls.get_reader_role(project_id, user_id, email):
+            return None
+        
+        stats = cls.call_function('project_stats', {'p_project_id': project_id})
+        if stats is None:
+            stats = cls._aggregate_project_stats(project_id)
+        
+        return cls._format_stats(stats)
+    
+    @classmethod
+    def _aggregate_project_stats(cls, project_id: int) -> dict:
+        """The project_stats aggregates (migrations/0010_project_stats.sql) computed in Python"""
+        client = cls.get_db()
+        
+        # Reuse a cached task list, otherwise only fetch the columns the aggregates need
+        tasks = cls.get_task_cache().rows(project_id)
+        if tasks is None:
+            tasks = client.table('tasks').select(
+                'status, priority, assigned_to, due_date, created_at'
+            ).eq('project_id', project_id).execute().data or []
+        
+        members = client.table('project_members').select(
+            'user_id, role, users(email, first_name, last_name)'
+        ).eq('project_id', project_id).order('id').execute().data or []
+        
+        guests = client.table('guest_members').select('role').eq(
+            'project_id', project_id
+        ).execute().data or []
+        
+        files = client.table('files').select('file_size').eq(
+            'project_id', project_id
+        ).execute().data or []
+        
+        cutoff = overdue_cutoff()
+        by_status = Counter()
+        by_priority = Counter()
+        assigned = Counter()
+        completed = Counter()
+        created_per_day = Counter()
+        
+        for task in tasks:
+            by_status[task['status']] += 1
+            by_priority[task.get('priority') or 'medium'] += 1
+            
+            if task.get('assigned_to'):
+                assigned[task['assigned_to']] += 1
+                if task['status'] == 'done':
+                    completed[task['assigned_to']] += 1
+            
+            if task.get('created_at'):
+                created_per_day[isoparse(task['created_at']).astimezone(timezone.utc).date().isoformat()] += 1
+        
+        # Per-assignee counts for invited (non-owner) members
+        by_assignee = [
+            {
+                'user_id': member['user_id'],
+                **{k: (member.get('users') or {}).get(k) for k in ('email', 'first_name', 'last_name')},
+                'tasks': assigned[member['user_id']],
+                'completed': completed[member['user_id']]
+            }
+            for member in members
+            if member['role'] != 'owner' and assigned[member['user_id']]
+        ]
+        
+        return {
+            'total_tasks': len(tasks),
+            'by_status': dict(by_status),
+            'by_priority': dict(by_priority),
+            'overdue': sum(1 for task in tasks if is_overdue(task, cutoff)),
+            'created_per_day': dict(created_per_day),
+            'by_assignee': by_assignee,
+            'member_count': sum(1 for m in members + guests if m['role'] != 'owner'),
+            'file_count': len(files),
+            'file_size': sum(f.get('file_size') or 0 for f in files)
+        }
+    
+    @staticmethod
+    def _format_stats(stats: dict) -> dict:
+        """Response shape of the project statistics"""
+        today = datetime.now(timezone.utc).date()
+        total_tasks = stats['total_tasks']
+        by_status = {'todo': 0, 'in_progress': 0, 'done': 0, **stats['by_status']}
+        by_priority = {'high': 0, 'medium': 0, 'low': 0, **stats['by_priority']}
+        
+        by_assignee = []
+        for assignee in stats['by_assignee']:
+            full_name = ' '.join(filter(None, [assignee.get('first_name'), assignee.get('last_name')]))
+            by_assignee.append({
+                'user_id': assignee['user_id'],
+                'name': full_name or (assignee.get('email') or 'Unknown').split('@')[0],
+                'tasks': assignee['tasks'],
+                'completed': assignee['completed']
+            })
+        
+        return {
+            'total_tasks': total_tasks,
+            'completion_rate': round(by_status['done'] * 100 / total_tasks) if total_tasks else 0,
+            'by_status': by_status,
+            'by_priority': by_priority,
+            'overdue': stats['overdue'],
+            'by_assignee': by_assignee,
+            'created_per_day': [
+                {
+                    'date': (today - timedelta(days=i)).isoformat(),
+                    'count': stats['created_per_day'].get((today - timedelta(days=i)).isoformat(), 0)
+                }
+                for i in range(6, -1, -1)
+            ],
+            'member_count': stats['member_count'],
+            'files': {
+                'count': stats['file_count'],
+                'total_size': stats['file_size']
+            }
+        }
+    
+    # Dashboard
+    @classmethod
+    def get_dashboard(cls, user_id: str, task_limit: int = None, email: str = None):
+        """Projects with rollups plus the user's assigned tasks.
+        
+        Uses a fixed number of queries however many projects the user has:
+        the project listing, one grouped rollup query and one page of tasks.
+        """
+        projects = cls.get_projects(user_id, email=email)
+        rollups = cls.get_project_rollups([project['id'] for project in projects])
+        
+        for project in projects:
+            project.update(rollups.get(project['id']) or cls._rollup())
+        
+        return {
+            'projects': projects,
+            'my_tasks': cls.get_user_tasks(user_id, task_limit or Config.DASHBOARD_TASK_LIMIT)
+        }
+    
+    @staticmethod
+    def _rollup(by_status=None, total_tasks: int = 0, overdue: int = 0, member_count: int = 0,
+                member_emails=()) -> dict:
+        """Rollup representation shared by the database function and the fallback"""
+        by_status = by_status or {}
+        
+        return {
+            'task_counts': {status: by_status.get(status, 0) for status in TASK_STATUSES},
+            'total_tasks': total_tasks,
+            'overdue': overdue,
+            'member_count': member_count,
+            # A few members for avatars
+            'member_emails': list(member_emails[:3])
+        }
+    
+    @classmethod
+    def get_project_rollups(cls, project_ids) -> dict:
+        """Task counts by status, overdue tasks and members per project, keyed by project id.
+        
+        Callers must only pass projects the user can access. Computed by the
+        project_rollups database function, or from grouped queries over
+        all the projects at once when it is not installed.
+        """
+        project_ids = list(project_ids)
+        if not project_ids:
+            return {}
+        
+        rows = cls.call_function('project_rollups', {'project_ids': project_ids})
+        
+        if rows is not None:
+            return {
+                row['project_id']: cls._rollup(
+                    row, row['total_tasks'], row['overdue'], row['member_count'], row['member_emails'] or []
+                )
+                for row in rows
+            }
+        
+        client = cls.get_db()
+        
+        tasks = client.table('tasks').select('project_id, status, due_date').in_(
+            'project_id', project_ids
+        ).execute().data or []
+        
+        members = client.table('project_members').select('id, project_id, users(email)').in_(
+            'project_id', project_ids
+        ).order('id').execute().data or []
+        
+        guests = client.table('guest_members').select('id, project_id, email').in_(
+            'project_id', project_ids
+        ).order('id').execute().data or []
+        
+        cutoff = overdue_cutoff()
+        by_status = {project_id: Counter() for project_id in project_ids}
+        overdue = Counter()
+        emails = {project_id: [] for project_id in project_ids}
+        
+        for task in tasks:
+            by_status[task['project_id']][task['status']] += 1
+            if is_overdue(task, cutoff):
+                overdue[task['project_id']] += 1
+        
+        for member in members:
+            emails[member['project_id']].append((member.get('users') or {}).get('email'))
+        for guest in guests:
+            emails[guest['project_id']].append(guest.get('email'))
+        
+        return {
+            project_id: cls._rollup(
+                by_status[project_id], sum(by_status[project_id].values()), overdue[project_id],
+                len(emails[project_id]), emails[project_id]
+            )
+            for project_id in project_ids
+        }
     
     # Tasks
     @classmethod
-    def get_project_tasks(cls, project_id: int, user_id: str):
-        """Get all tasks for a project"""
-        client = cls.get_client()
+    def get_project_tasks(cls, project_id: int, user_id: str, limit: int = None, cursor: str = None,
+                          fields=None, filters=None, sort=None, email: str = None):
+        """Get tasks for a project (one keyset page when limit is given).
+        
+        filters (from parse_task_filters) and sort (keyset sort keys from
+        parse_task_sort) are applied by the database.
+        """
+        # Allow creator, members OR guests to view tasks
+        if not cls.get_reader_role(project_id, user_id, email):
+            return None
         
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        return cls._list_project_tasks(project_id, limit, cursor, fields, filters, sort)
+    
+    @classmethod
+    def _list_project_tasks(cls, project_id: int, limit: int = None, cursor: str = None, fields=None,
+                            filters=None, sort=None):
+        """A project's tasks, from the write-through cache when its list is in it"""
+        cache = cls.get_task_cache()
+        # The cache holds unfiltered lists in the default order
+        default_order = filters is None and sort is None
+        
+        if default_order:
+            tasks = cache.get(project_id, limit, cursor, fields)
+            if tasks is not None:
+                return tasks
+        
+        sort = sort or TASK_SORT
+        
+        # Get tasks with assignee details (unless a narrower fieldset was asked for)
+        query = apply_task_filters(cls.get_db().table('tasks').select(
+            build_select('tasks', fields, TASK_SELECT, required=[c for c, _ in sort])
+        ).eq('project_id', project_id), filters)
+        
+        if limit is not None or fields is not None or not default_order:
+            return paginate(query, sort, limit, cursor)
+        
+        # Full default listings fill the cache
+        with cache.loading(project_id) as fill:
+            tasks = paginate(query, TASK_SORT)
+            fill(tasks)
+        
+        return tasks
+    
+    @classmethod
+    def get_task_list_version(cls, project_id: int, user_id: str, email: str = None):
+        """Validator of a project's task list (row count and latest updated_at),
+        from the cached listing or one indexed query; None without read access"""
+        if not cls.get_reader_role(project_id, user_id, email):
+            return None
         
-        if not project.data:
+        version = cls.get_task_cache().version(project_id)
+        if version is not None:
+            return version
+        
+        response = cls.get_db().table('tasks').select('updated_at', count='exact').eq(
+            'project_id', project_id
+        ).order('updated_at', desc=True).limit(1).execute()
+        
+        return list_version(response.count or 0, response.data[0]['updated_at'] if response.data else None)
+    
+    @classmethod
+    def get_task_changes(cls, project_id: int, user_id: str, since: datetime = None, fields=None,
+                         email: str = None):
+        """Tasks created or updated after a sync cursor's time, plus ids deleted since.
+        
+        Returns {'tasks', 'deleted', 'cursor', 'full'}. Without since, when
+        since is older than the kept tombstones, or when the task_deletions
+        table is not installed, tasks is the full list and full is True (the
+        client replaces its copy instead of merging).
+        """
+        if not cls.get_reader_role(project_id, user_id, email):
             return None
         
-        # Allow creator OR members to view tasks
-        is_creator = project.data[0]['created_by'] == user_id
+        # The cursor is built from the rows' timestamps, which need to be read
+        if fields is not None and 'updated_at' not in fields:
+            fields = (*fields, 'updated_at')
+        
+        if since is not None and since >= datetime.now(timezone.utc) - timedelta(days=Config.TASK_SYNC_RETENTION_DAYS):
+            changes = cls._task_changes_since(project_id, since, fields)
+            if changes is not None:
+                return changes
         
-        if not is_creator:
-            # Check if user is a member
-            member_check = client.table('project_members').select('*').eq(
+        tasks = cls._list_project_tasks(project_id, fields=fields)
+        cursor = cls._sync_cursor([task['updated_at'] for task in tasks])
+        return {'tasks': tasks, 'deleted': [], 'cursor': cursor, 'full': True}
+    
+    @classmethod
+    def _task_changes_since(cls, project_id: int, since: datetime, fields=None):
+        """Changes after since, or None without the task_deletions table
+        (remembered for the life of the process, like missing functions)"""
+        if 'task_deletions' in cls._missing_tables:
+            return None
+        
+        client = cls.get_db()
+        after = since.isoformat()
+        
+        try:
+            deleted = client.table('task_deletions').select('task_id, deleted_at').eq(
                 'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                # Also check guest_members if you implemented that
-                guest_check = client.table('guest_members').select('*').eq(
-                    'project_id', project_id
-                ).eq('email', user_id).execute()  # Assuming email match
-                
-                if not guest_check.data:
-                    return None
+            ).gt('deleted_at', after).execute()
+        except Exception as e:
+            if not missing_table(e):
+                raise
+            print("Table task_deletions is not installed (see backend/migrations); sending full task lists")
+            cls._missing_tables.add('task_deletions')
+            return None
         
-        # Get tasks with assignee details
-        response = client.table('tasks').select(
-            '*, assignee:assigned_to(id, email, first_name, last_name)'
-        ).eq('project_id', project_id).execute()
+        tasks = paginate(client.table('tasks').select(
+            build_select('tasks', fields, TASK_SELECT, required=[c for c, _ in TASK_SORT])
+        ).eq('project_id', project_id).gt('updated_at', after), TASK_SORT)
         
-        return response.data
+        timestamps = [task['updated_at'] for task in tasks] + [row['deleted_at'] for row in deleted.data]
+        
+        return {
+            'tasks': tasks,
+            'deleted': [row['task_id'] for row in deleted.data],
+            'cursor': cls._sync_cursor(timestamps, since),
+            'full': False
+        }
+    
+    @staticmethod
+    def _sync_cursor(timestamps, since: datetime = None) -> str:
+        """Cursor for changes after the latest of the database timestamps read.
+        
+        Writes committed just after the read may carry an earlier timestamp,
+        so the cursor goes back TASK_SYNC_OVERLAP seconds. The API host's
+        clock only sets a floor a day back, so the cursor of a project
+        without changes does not age past the kept tombstones.
+        """
+        candidates = [datetime.now(timezone.utc) - SYNC_CURSOR_FLOOR]
+        if since is not None:
+            candidates.append(since)
+        
+        latest = max((isoparse(t) if isinstance(t, str) else t for t in timestamps if t), default=None)
+        if latest is not None:
+            candidates.append(latest - timedelta(seconds=Config.TASK_SYNC_OVERLAP))
+        
+        return encode_sync_cursor(max(candidates))
 
     @classmethod
     def create_task(cls, project_id: int, data: dict, user_id: str):
         """Create a new task"""
-        client = cls.get_client()
-        
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        client = cls.get_db()
+        query = client.table('tasks').insert(cls._task_record(project_id, data, user_id))
         
-        if not project.data:
+        # Allow creator OR members to create tasks
+        if client.guarded_writes:
+            query = query.guard(user_id)
+        elif not cls.get_project_role(project_id, user_id):
             return None
         
-        # Allow creator OR members to create tasks
-        is_creator = project.data[0]['created_by'] == user_id
+        response = query.execute()
         
-        if not is_creator:
-            # Verify user is a member
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                return None
+        if response.data:
+            cls._task_changed(project_id, 'create', response.data[0])
         
-        task_data = {
+        return response.data[0] if response.data else None
+    
+    @staticmethod
+    def _task_record(project_id: int, data: dict, user_id: str):
+        """Build a new task row with defaults"""
+        return {
             'project_id': project_id,
             'title': data['title'],
             'description': data.get('description', ''),
@@ -272,65 +916,47 @@ class SupabaseService:
             'priority': data.get('priority', 'medium'),
             'created_by': user_id
         }
-        
-        response = client.table('tasks').insert(task_data).execute()
-        
-        return response.data[0] if response.data else None
 
     @classmethod
     def update_task(cls, task_id: int, data: dict, user_id: str):
         """Update task"""
-        client = cls.get_client()
-        
-        # Get task to verify project membership
-        task = client.table('tasks').select('project_id, created_by').eq('id', task_id).execute()
-        
-        if not task.data:
-            return None
-        
-        project_id = task.data[0]['project_id']
-        
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
-        
-        if not project.data:
-            return None
+        client = cls.get_db()
+        update_data = {k: data[k] for k in TASK_UPDATE_FIELDS if k in data}
+        query = client.table('tasks').update(update_data).eq('id', task_id)
         
         # Allow creator OR members to update tasks
-        is_creator = project.data[0]['created_by'] == user_id
-        
-        if not is_creator:
-            # Verify user is a member of the project
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
+        if client.guarded_writes:
+            # Membership check and update in one statement
+            query = query.guard(user_id)
+        else:
+            # Get task to verify project membership
+            task = client.table('tasks').select('project_id, created_by').eq('id', task_id).execute()
+            
+            if not task.data or not cls.get_project_role(task.data[0]['project_id'], user_id):
                 return None
         
-        # Update task
-        update_data = {}
-        if 'title' in data:
-            update_data['title'] = data['title']
-        if 'description' in data:
-            update_data['description'] = data['description']
-        if 'status' in data:
-            update_data['status'] = data['status']
-        if 'assigned_to' in data:
-            update_data['assigned_to'] = data['assigned_to']
-        if 'due_date' in data:
-            update_data['due_date'] = data['due_date']
-        if 'priority' in data:
-            update_data['priority'] = data['priority']
-        
-        response = client.table('tasks').update(update_data).eq('id', task_id).execute()
+        response = query.execute()
+        
+        if response.data:
+            cls._task_changed(response.data[0]['project_id'], 'update', response.data[0])
         
         return response.data[0] if response.data else None
     
     @classmethod
     def delete_task(cls, task_id: int, user_id: str):
         """Delete task"""
-        client = cls.get_client()
+        client = cls.get_db()
+        query = client.table('tasks').delete().eq('id', task_id)
+        
+        # Allow creator OR members to delete tasks
+        if client.guarded_writes:
+            # Membership check and delete in one statement
+            deleted = query.guard(user_id).execute().data
+            
+            if deleted:
+                cls._task_changed(deleted[0]['project_id'], 'delete', task_id=task_id)
+            
+            return bool(deleted)
         
         # Get task to verify project membership
         task = client.table('tasks').select('project_id').eq('id', task_id).execute()
@@ -338,63 +964,254 @@ class SupabaseService:
         if not task.data:
             return False
         
-        project_id = task.data[0]['project_id']
+        if not cls.get_project_role(task.data[0]['project_id'], user_id):
+            return False
         
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        query.execute()
+        cls._task_changed(task.data[0]['project_id'], 'delete', task_id=task_id)
         
-        if not project.data:
-            return False
+        return True
+    
+    @classmethod
+    def batch_tasks(cls, project_id: int, operations: list, user_id: str):
+        """Apply create/update/delete operations to a project's tasks in bulk.
+        
+        Runs a single access check, then at most one insert, one update per
+        distinct set of changes (only the changed columns of rows that still
+        exist are written), and one delete. Returns one result per
+        operation, in order.
+        """
+        client = cls.get_db()
+        
+        # Allow creator OR members to change tasks
+        if not cls.get_project_role(project_id, user_id):
+            return None
         
-        # Allow creator OR members to delete tasks
-        is_creator = project.data[0]['created_by'] == user_id
+        results = [None] * len(operations)
+        creates, updates, deletes = [], [], []
+        
+        def fail(index, op, error):
+            results[index] = {'index': index, 'op': op, 'status': 'error', 'error': error}
+        
+        # Validate and group operations
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                fail(index, None, 'Operation must be an object')
+                continue
+            
+            op = operation.get('op')
+            data = operation.get('data') or {}
+            task_id = operation.get('id')
+            
+            if op == 'create':
+                if not isinstance(data, dict) or not data.get('title'):
+                    fail(index, op, 'Task title is required')
+                else:
+                    creates.append((index, cls._task_record(project_id, data, user_id)))
+            elif op in ('update', 'delete'):
+                if not isinstance(task_id, int) or isinstance(task_id, bool):
+                    fail(index, op, 'Task id is required')
+                elif op == 'update' and not isinstance(data, dict):
+                    fail(index, op, 'Task data must be an object')
+                elif op == 'update':
+                    updates.append((index, task_id, {k: data[k] for k in TASK_UPDATE_FIELDS if k in data}))
+                else:
+                    deletes.append((index, task_id))
+            else:
+                fail(index, op, "op must be 'create', 'update' or 'delete'")
+        
+        # Creates - one bulk insert
+        if creates:
+            try:
+                response = client.table('tasks').insert([row for _, row in creates]).execute()
+                for (index, _), task in zip(creates, response.data):
+                    results[index] = {'index': index, 'op': 'create', 'status': 'ok', 'task': task}
+            except Exception as e:
+                for index, _ in creates:
+                    fail(index, 'create', str(e))
+        
+        # Updates - later operations on a task add to its earlier changes, then
+        # tasks with the same changes are updated together
+        if updates:
+            changes_by_task, indexes = {}, {}
+            for index, task_id, changes in updates:
+                changes_by_task.setdefault(task_id, {}).update(changes)
+                indexes.setdefault(task_id, []).append(index)
+            
+            groups = {}
+            for task_id, changes in changes_by_task.items():
+                key = json.dumps(changes, sort_keys=True, default=str)
+                groups.setdefault(key, (changes, []))[1].append(task_id)
+            
+            for changes, ids in groups.values():
+                try:
+                    # Without changes there is nothing to write; report the current rows
+                    query = client.table('tasks')
+                    query = query.update(changes) if changes else query.select('*')
+                    response = query.in_('id', ids).eq('project_id', project_id).execute()
+                    
+                    for task in response.data:
+                        for index in indexes.get(task['id'], []):
+                            results[index] = {'index': index, 'op': 'update', 'status': 'ok', 'task': task}
+                    
+                    for task_id in ids:
+                        for index in indexes[task_id]:
+                            if results[index] is None:
+                                fail(index, 'update', 'Task not found')
+                except Exception as e:
+                    for task_id in ids:
+                        for index in indexes[task_id]:
+                            if results[index] is None:
+                                fail(index, 'update', str(e))
+        
+        # Deletes - one bulk delete scoped to the project
+        if deletes:
+            try:
+                response = client.table('tasks').delete().in_(
+                    'id', list({task_id for _, task_id in deletes})
+                ).eq('project_id', project_id).execute()
+                
+                deleted = {task['id'] for task in response.data}
+                
+                for index, task_id in deletes:
+                    if task_id in deleted:
+                        results[index] = {'index': index, 'op': 'delete', 'status': 'ok', 'id': task_id}
+                    else:
+                        fail(index, 'delete', 'Task not found')
+            except Exception as e:
+                for index, _ in deletes:
+                    fail(index, 'delete', str(e))
+        
+        # Operations the database returned no row for
+        for index, result in enumerate(results):
+            if result is None:
+                fail(index, operations[index].get('op'), 'Operation was not applied')
+        
+        for result in results:
+            if result['status'] == 'ok':
+                cls._task_changed(project_id, result['op'], result.get('task'), result.get('id'))
+        
+        return results
+    
+    @classmethod
+    def import_tasks(cls, project_id: int, rows, user_id: str, batch_size: int = None):
+        """Create tasks from (row number, row) pairs (see imports.read_rows) in bulk.
+        
+        Runs a single access check and reads the project's people once to
+        resolve assignee emails, then validates rows as they arrive and
+        inserts them batch_size (IMPORT_BATCH_SIZE) at a time. Returns a
+        summary with the first IMPORT_MAX_ERRORS row errors, or None
+        without access.
+        """
+        client = cls.get_db()
+        batch_size = batch_size or Config.IMPORT_BATCH_SIZE
         
-        if not is_creator:
-            # Verify user is a member
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                return False
+        # Allow creator OR members to create tasks
+        if not cls.get_project_role(project_id, user_id):
+            return None
         
-        client.table('tasks').delete().eq('id', task_id).execute()
+        people = cls._project_people(project_id)
+        member_ids = set(people.values())
+        summary = {'created': 0, 'failed': 0, 'errors': []}
+        batch = []
+        
+        def fail(number, error):
+            summary['failed'] += 1
+            if len(summary['errors']) < Config.IMPORT_MAX_ERRORS:
+                summary['errors'].append({'row': number, 'error': error})
+        
+        def insert():
+            try:
+                response = client.table('tasks').insert([row for _, row in batch]).execute()
+                summary['created'] += len(response.data)
+            except Exception as e:
+                for number, _ in batch:
+                    fail(number, str(e))
+            batch.clear()
+        
+        for number, row in rows:
+            try:
+                if isinstance(row, ValueError):
+                    raise row
+                
+                task = parse_task_row(row)
+                email = task.pop('assignee', None)
+                
+                if email is not None:
+                    if email not in people:
+                        raise ValueError(f'{email} is not a member of this project')
+                    task['assigned_to'] = people[email]
+                elif task.get('assigned_to') and task['assigned_to'] not in member_ids:
+                    raise ValueError('assigned_to is not a member of this project')
+            except ValueError as e:
+                fail(number, str(e))
+                continue
+            
+            batch.append((number, cls._task_record(project_id, task, user_id)))
+            if len(batch) >= batch_size:
+                insert()
+        
+        if batch:
+            insert()
+        
+        # One refetch instead of an event (and cache patch) per imported task
+        if summary['created']:
+            cls.get_task_cache().invalidate(project_id)
+            cls.get_events().publish(project_id, RESYNC)
+        
+        return summary
+    
+    @classmethod
+    def _project_people(cls, project_id: int) -> dict:
+        """Email -> user id for a project's creator and members"""
+        client = cls.get_db()
+        members = client.table('project_members').select('user_id, users(email)').eq(
+            'project_id', project_id
+        ).execute().data
         
-        return True
+        people = {(member.get('users') or {}).get('email'): member['user_id'] for member in members}
+        
+        owner = cls.get_access().get_owner(project_id)
+        if owner and owner not in people.values():
+            user = client.table('users').select('id, email').eq('id', owner).execute().data
+            people.update({row['email']: row['id'] for row in user})
+        
+        people.pop(None, None)
+        return {email.lower(): user_id for email, user_id in people.items()}
     
     @classmethod
-    def get_user_tasks(cls, user_id: str):
-        """Get all tasks assigned to user"""
-        client = cls.get_client()
+    def _task_changed(cls, project_id: int, op: str, task: dict = None, task_id: int = None):
+        """Patch the task cache and notify realtime subscribers after a create, update or delete"""
+        if op == 'delete':
+            cls.get_task_cache().remove(project_id, task_id)
+            cls.get_events().publish(project_id, 'task.deleted', {'id': task_id})
+        else:
+            cls.get_task_cache().put(project_id, task)
+            cls.get_events().publish(project_id, f'task.{op}d', task)
+    
+    @classmethod
+    def get_user_tasks(cls, user_id: str, limit: int = None, cursor: str = None, fields=None,
+                       filters=None, sort=None):
+        """Get tasks assigned to user (one keyset page when limit is given), optionally filtered and sorted"""
+        client = cls.get_db()
+        sort = sort or TASK_SORT
         
-        response = client.table('tasks').select('*, projects(name)').eq(
-            'assigned_to', user_id
-        ).execute()
+        query = apply_task_filters(client.table('tasks').select(
+            build_select('tasks', fields, USER_TASK_SELECT, required=[c for c, _ in sort])
+        ).eq('assigned_to', user_id), filters)
         
-        return response.data
+        return paginate(query, sort, limit, cursor)
     
     # Project Members
     @classmethod
-    def get_project_members(cls, project_id: int, user_id: str):
+    def get_project_members(cls, project_id: int, user_id: str, email: str = None):
         """Get all members of a project"""
-        client = cls.get_client()
-        
-        # Get project to check creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        client = cls.get_db()
         
-        if not project.data:
+        # Allow creator, members OR guests
+        if not cls.get_reader_role(project_id, user_id, email):
             return None
         
-        # Allow creator OR members
-        if project.data[0]['created_by'] != user_id:
-            # Check if member
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                return None
-        
         # Get members with user details
         response = client.table('project_members').select(
             '*, users(id, email, first_name, last_name)'
@@ -405,68 +1222,38 @@ class SupabaseService:
     @classmethod
     def add_project_member(cls, project_id: int, member_user_id: str, role: str, user_id: str):
         """Add member to project"""
-        client = cls.get_client()
-        
-        # Get project to check creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        client = cls.get_db()
         
-        if not project.data:
+        # Allow creator OR admin members
+        if not cls.get_access().is_admin(project_id, user_id):
             return None
         
-        # Allow creator OR admin members
-        if project.data[0]['created_by'] == user_id:
-            member_data = {
-                'project_id': project_id,
-                'user_id': member_user_id,
-                'role': role
-            }
-            
-            response = client.table('project_members').insert(member_data).execute()
-            return response.data[0] if response.data else None
+        member_data = {
+            'project_id': project_id,
+            'user_id': member_user_id,
+            'role': role
+        }
         
-        # Check if member is admin
-        member = client.table('project_members').select('role').eq(
-            'project_id', project_id
-        ).eq('user_id', user_id).execute()
+        response = client.table('project_members').insert(member_data).execute()
+        cls.get_access().invalidate_member(project_id, member_user_id)
+        cls.get_project_index().invalidate_user(member_user_id)
         
-        if member.data and member.data[0]['role'] in ['owner', 'admin']:
-            member_data = {
-                'project_id': project_id,
-                'user_id': member_user_id,
-                'role': role
-            }
-            
-            response = client.table('project_members').insert(member_data).execute()
-            return response.data[0] if response.data else None
+        if response.data:
+            cls.get_events().publish(project_id, 'member.added', {**response.data[0], 'type': 'auth'})
         
-        return None
+        return response.data[0] if response.data else None
 
     @classmethod
     def add_project_member_by_details(cls, project_id: int, name: str, email: str, role: str, current_user_id: str):
         """Add member to project by name and email (no auth user required)"""
         try:
-            client = cls.get_client()
-            
-            # Get project to check creator
-            project = client.table('projects').select('created_by').eq('id', project_id).execute()
-            
-            if not project.data:
-                return None
+            client = cls.get_db()
             
             # Allow creator OR admin members
-            is_creator = project.data[0]['created_by'] == current_user_id
-            
-            if not is_creator:
-                # Check if member is admin
-                member = client.table('project_members').select('role').eq(
-                    'project_id', project_id
-                ).eq('user_id', current_user_id).execute()
-                
-                if not member.data or member.data[0]['role'] not in ['owner', 'admin']:
-                    return None
+            if not cls.get_access().is_admin(project_id, current_user_id):
+                return None
             
             # Generate a unique ID for non-auth member (or use email as ID)
-            import uuid
             member_id = str(uuid.uuid4())
             
             # Add member
@@ -485,8 +1272,15 @@ class SupabaseService:
                 'user_id': member_id,
                 'role': role
             }).execute()
+            cls.get_access().invalidate_member(project_id, member_id)
             
             if response.data:
+                cls.get_events().publish(project_id, 'member.added', {
+                    **response.data[0],
+                    'type': 'auth',
+                    'user': {'email': email, 'name': name}
+                })
+                
                 # Store user details separately if needed
                 # For now, return with the provided details
                 return {
@@ -508,17 +1302,10 @@ class SupabaseService:
     def update_project_member(cls, project_id: int, member_user_id: str, role: str, current_user_id: str):
         """Update member role"""
         try:
-            client = cls.get_client()
+            client = cls.get_db()
             
             # Check if current user is owner/admin
-            current_member = client.table('project_members')\
-                .select('role')\
-                .eq('project_id', project_id)\
-                .eq('user_id', current_user_id)\
-                .single()\
-                .execute()
-            
-            if not current_member.data or current_member.data['role'] not in ['owner', 'admin']:
+            if not cls.get_access().is_admin(project_id, current_user_id):
                 return None
             
             # Update member role
@@ -527,6 +1314,11 @@ class SupabaseService:
                 .eq('project_id', project_id)\
                 .eq('user_id', member_user_id)\
                 .execute()
+            cls.get_access().invalidate_member(project_id, member_user_id)
+            cls.get_project_index().invalidate_user(member_user_id)
+            
+            if response.data:
+                cls.get_events().publish(project_id, 'member.updated', {**response.data[0], 'type': 'auth'})
             
             return response.data[0] if response.data else None
             
@@ -537,92 +1329,158 @@ class SupabaseService:
     @classmethod
     def remove_project_member(cls, project_id: int, member_user_id: str, user_id: str):
         """Remove member from project"""
-        client = cls.get_client()
+        client = cls.get_db()
         
         # Verify user is owner or admin
-        member = client.table('project_members').select('role').eq(
-            'project_id', project_id
-        ).eq('user_id', user_id).execute()
-        
-        if not member.data or member.data[0]['role'] not in ['owner', 'admin']:
+        if not cls.get_access().is_admin(project_id, user_id):
             return False
         
         client.table('project_members').delete().eq(
             'project_id', project_id
         ).eq('user_id', member_user_id).execute()
+        cls.get_access().invalidate_member(project_id, member_user_id)
+        cls.get_project_index().invalidate_user(member_user_id)
+        
+        # Removed members stop receiving the project's events
+        cls.get_events().publish(project_id, 'member.removed', {'user_id': member_user_id, 'type': 'auth'})
+        cls.get_events().revoke(project_id, member_user_id)
         
         return True
     
     # Files
     @classmethod
-    def upload_file(cls, project_id: int, file_data: dict, user_id: str):
-        """Record file upload in database"""
-        client = cls.get_client()
+    def create_upload_session(cls, project_id: int, file_data: dict, user_id: str):
+        """Authorize an upload and issue a signed storage upload URL for it.
         
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        The client sends the bytes straight to storage (resumable chunks for
+        large files), then calls upload_file() with the session_id. Returns
+        None when the user cannot upload to the project. Raises ValueError
+        for files outside the upload limits and UploadError when the
+        upload_sessions table is not installed.
+        """
+        filename, file_size = check_upload(file_data.get('filename'), file_data.get('file_size'))
         
-        if not project.data:
+        # Allow creator OR members to upload
+        if not cls.get_project_role(project_id, user_id):
             return None
         
-        # Allow creator OR members to upload
-        is_creator = project.data[0]['created_by'] == user_id
+        session_id = str(uuid.uuid4())
+        file_path = storage_path(project_id, session_id, filename)
+        signed = cls.get_client().storage.from_(Config.STORAGE_BUCKET).create_signed_upload_url(file_path)
         
-        if not is_creator:
-            # Verify user is a member
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                return None
+        session = {
+            'id': session_id,
+            'project_id': project_id,
+            'user_id': user_id,
+            'bucket': Config.STORAGE_BUCKET,
+            'file_path': file_path,
+            'filename': filename,
+            'file_size': file_size,
+            'file_type': file_data.get('file_type') or 'application/octet-stream',
+            'expires_at': (datetime.now(timezone.utc) + timedelta(seconds=Config.UPLOAD_SESSION_TTL)).isoformat()
+        }
+        
+        try:
+            cls.get_db().table('upload_sessions').insert(session).execute()
+        except Exception as e:
+            if not missing_table(e):
+                raise
+            raise UploadError('Direct uploads are not available', 503)
+        
+        return {**session, 'upload': upload_instructions(signed, file_size)}
+    
+    @classmethod
+    def upload_file(cls, project_id: int, file_data: dict, user_id: str):
+        """Record file upload in database.
+        
+        With a session_id from create_upload_session() the finalize_upload
+        database function checks the stored object and creates the record
+        in one transaction; repeating the call returns the same record.
+        Otherwise file_data carries the metadata itself, and its file_path
+        must be a data: URL or an object under the project's folder. Returns
+        None when the project or session is not found. Raises ValueError for
+        files outside the upload limits or the project folder and
+        UploadError when a session cannot be finalized.
+        """
+        if file_data.get('session_id'):
+            return cls._finalize_upload(project_id, file_data['session_id'], user_id)
+        
+        client = cls.get_db()
+        filename, file_size = check_upload(file_data.get('filename'), file_data.get('file_size'))
+        file_path = check_file_path(project_id, file_data.get('file_path'))
         
         file_record = {
             'project_id': project_id,
-            'filename': file_data['filename'],
-            'file_path': file_data['file_path'],
-            'file_size': file_data['file_size'],
+            'filename': filename,
+            'file_path': file_path,
+            'file_size': file_size,
             'file_type': file_data.get('file_type', 'application/octet-stream'),
             'uploaded_by': user_id
         }
+        query = client.table('files').insert(file_record)
+        
+        # Allow creator OR members to upload
+        if client.guarded_writes:
+            query = query.guard(user_id)
+        elif not cls.get_project_role(project_id, user_id):
+            return None
         
-        response = client.table('files').insert(file_record).execute()
+        response = query.execute()
+        
+        if response.data:
+            cls.get_events().publish(project_id, 'file.created', response.data[0])
         
         return response.data[0] if response.data else None
-
+    
     @classmethod
-    def get_project_files(cls, project_id: int, user_id: str):
-        """Get all files for a project"""
-        client = cls.get_client()
+    def _finalize_upload(cls, project_id: int, session_id, user_id: str):
+        try:
+            session_id = str(uuid.UUID(str(session_id)))
+        except ValueError:
+            raise ValueError('Invalid session_id')
         
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
+        rows = cls.call_function('finalize_upload', {
+            'p_session_id': session_id,
+            'p_project_id': project_id,
+            'p_user_id': user_id
+        })
         
-        if not project.data:
+        if rows is None:
+            raise UploadError('Direct uploads are not available', 503)
+        
+        status, file_record = (rows[0]['status'], rows[0]['file']) if rows else ('not_found', None)
+        
+        if status in FINALIZE_ERRORS:
+            raise UploadError(*FINALIZE_ERRORS[status])
+        if status == 'not_found' or not file_record:
             return None
         
-        # Allow creator OR members to view files
-        is_creator = project.data[0]['created_by'] == user_id
+        # Retries of a finalized session return the record without a second event
+        if status == 'created':
+            cls.get_events().publish(project_id, 'file.created', file_record)
         
-        if not is_creator:
-            # Verify user is a member
-            member_check = client.table('project_members').select('*').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data:
-                return None
+        return file_record
+
+    @classmethod
+    def get_project_files(cls, project_id: int, user_id: str, limit: int = None, cursor: str = None,
+                          fields=None, email: str = None):
+        """Get files for a project, newest first (one keyset page when limit is given)"""
+        client = cls.get_db()
         
-        response = client.table('files').select(
-            '*, uploader:uploaded_by(id, email, first_name, last_name)'
-        ).eq('project_id', project_id).order('uploaded_at', desc=True).execute()
+        # Allow creator, members OR guests to view files
+        if not cls.get_reader_role(project_id, user_id, email):
+            return None
         
-        return response.data
+        query = client.table('files').select(
+            build_select('files', fields, FILE_SELECT, required=[c for c, _ in FILE_SORT])
+        ).eq('project_id', project_id)
+        
+        return paginate(query, FILE_SORT, limit, cursor)
 
     @classmethod
     def delete_file(cls, file_id: int, user_id: str):
-        """Delete file record"""
-        client = cls.get_client()
+        """Delete file record; its storage object is deleted by a background job"""
+        client = cls.get_db()
         
         # Get file to verify project membership
         file_record = client.table('files').select('project_id, file_path, uploaded_by').eq(
@@ -634,52 +1492,32 @@ class SupabaseService:
         
         project_id = file_record.data[0]['project_id']
         
-        # Get project to check if user is creator
-        project = client.table('projects').select('created_by').eq('id', project_id).execute()
-        
-        if not project.data:
-            return None
-        
         # Allow creator, uploader, or admin members to delete
-        is_creator = project.data[0]['created_by'] == user_id
         is_uploader = file_record.data[0]['uploaded_by'] == user_id
         
-        if not is_creator and not is_uploader:
-            # Check if member is admin
-            member_check = client.table('project_members').select('role').eq(
-                'project_id', project_id
-            ).eq('user_id', user_id).execute()
-            
-            if not member_check.data or member_check.data[0]['role'] not in ['owner', 'admin']:
-                return None
+        if not is_uploader and not cls.get_access().is_admin(project_id, user_id):
+            return None
         
         client.table('files').delete().eq('id', file_id).execute()
+        cls.get_events().publish(project_id, 'file.deleted', {'id': file_id})
+        
+        # The stored object is removed in the background, with retries
+        file_path = file_record.data[0]['file_path']
+        cls._queue_storage_removal([file_path], project_id)
         
-        return file_record.data[0]['file_path']
+        return file_path
 
     #Guest/Non-auth Members
     @classmethod
     def add_guest_member(cls, project_id: int, name: str, email: str, role: str, current_user_id: str):
         """Add guest member to project (no auth user required)"""
         try:
-            client = cls.get_client()
-            
-            # Check if current user is creator or admin
-            project = client.table('projects').select('created_by').eq('id', project_id).execute()
+            client = cls.get_db()
             
-            if not project.data:
+            # Allow creator OR admin members
+            if not cls.get_access().is_admin(project_id, current_user_id):
                 return None
             
-            is_creator = project.data[0]['created_by'] == current_user_id
-            
-            if not is_creator:
-                member = client.table('project_members').select('role').eq(
-                    'project_id', project_id
-                ).eq('user_id', current_user_id).execute()
-                
-                if not member.data or member.data[0]['role'] not in ['owner', 'admin']:
-                    return None
-            
             # Add guest member
             guest_data = {
                 'project_id': project_id,
@@ -689,6 +1527,11 @@ class SupabaseService:
             }
             
             response = client.table('guest_members').insert(guest_data).execute()
+            cls.get_project_index().invalidate_email(email)
+            cls.get_access().invalidate_guests(project_id)
+            
+            if response.data:
+                cls.get_events().publish(project_id, 'member.added', {**response.data[0], 'type': 'guest'})
             
             return response.data[0] if response.data else None
             
@@ -697,93 +1540,96 @@ class SupabaseService:
             raise
 
     @classmethod
-    def get_all_project_members(cls, project_id: int, user_id: str):
+    def get_all_project_members(cls, project_id: int, user_id: str, fields=None, email: str = None):
         """Get both auth users and guest members"""
         try:
-            client = cls.get_client()
+            client = cls.get_db()
             
             # Check permissions
-            project = client.table('projects').select('created_by').eq('id', project_id).execute()
-            if not project.data:
+            if not cls.get_reader_role(project_id, user_id, email):
                 return None
             
-            is_creator = project.data[0]['created_by'] == user_id
-            
-            if not is_creator:
-                member_check = client.table('project_members').select('*').eq(
-                    'project_id', project_id
-                ).eq('user_id', user_id).execute()
-                
-                if not member_check.data:
-                    return None
+            # User details are only joined when requested
+            with_user = wants(fields, 'user')
             
             # Get auth user members
             auth_members = client.table('project_members').select(
-                '*, users(id, email, first_name, last_name)'
+                'id, user_id, role, users(id, email, first_name, last_name)'
+                if with_user else 'id, user_id, role'
             ).eq('project_id', project_id).execute()
             
             # Get guest members
-            guest_members = client.table('guest_members').select('*').eq(
-                'project_id', project_id
-            ).execute()
+            guest_members = client.table('guest_members').select(
+                'id, role, email, name' if with_user else 'id, role'
+            ).eq('project_id', project_id).execute()
             
-            # Combine and format
-            all_members = []
-            
-            # Add auth users
-            if auth_members.data:
-                for member in auth_members.data:
-                    all_members.append({
-                        'id': member['id'],
-                        'user_id': member['user_id'],
-                        'role': member['role'],
-                        'type': 'auth',
-                        'user': member.get('users', {})
-                    })
-            
-            # Add guest members
-            if guest_members.data:
-                for guest in guest_members.data:
-                    all_members.append({
-                        'id': guest['id'],
-                        'user_id': f"guest_{guest['id']}",  # Fake ID for frontend
-                        'role': guest['role'],
-                        'type': 'guest',
-                        'user': {
-                            'email': guest['email'],
-                            'name': guest['name']
-                        }
-                    })
-            
-            return all_members
+            return cls._format_members(auth_members, guest_members, fields)
             
         except Exception as e:
             print(f"Error getting members: {str(e)}")
             raise
+    
+    @staticmethod
+    def _format_members(auth_members, guest_members, fields=None):
+        """Combine auth and guest members into one list"""
+        all_members = []
+        
+        # Add auth users
+        if auth_members.data:
+            for member in auth_members.data:
+                all_members.append({
+                    'id': member['id'],
+                    'user_id': member['user_id'],
+                    'role': member['role'],
+                    'type': 'auth',
+                    'user': member.get('users', {})
+                })
+        
+        # Add guest members
+        if guest_members.data:
+            for guest in guest_members.data:
+                all_members.append({
+                    'id': guest['id'],
+                    'user_id': f"guest_{guest['id']}",  # Fake ID for frontend
+                    'role': guest['role'],
+                    'type': 'guest',
+                    'user': {
+                        'email': guest.get('email'),
+                        'name': guest.get('name')
+                    }
+                })
+        
+        # Trim to the requested fieldset
+        if fields is not None:
+            all_members = [{k: m[k] for k in fields} for m in all_members]
+        
+        return all_members
 
     @classmethod
     def remove_guest_member(cls, project_id: int, member_id: int, current_user_id: str):
         """Remove guest member"""
         try:
-            client = cls.get_client()
+            client = cls.get_db()
             
-            # Check permissions
-            project = client.table('projects').select('created_by').eq('id', project_id).execute()
-            if not project.data:
+            # Allow creator OR admin members
+            if not cls.get_access().is_admin(project_id, current_user_id):
                 return False
             
-            is_creator = project.data[0]['created_by'] == current_user_id
+            # Delete guest member
+            response = client.table('guest_members').delete().eq('id', member_id).eq(
+                'project_id', project_id
+            ).execute()
             
-            if not is_creator:
-                member = client.table('project_members').select('role').eq(
-                    'project_id', project_id
-                ).eq('user_id', current_user_id).execute()
-                
-                if not member.data or member.data[0]['role'] not in ['owner', 'admin']:
-                    return False
+            if not response.data:
+                return False
             
-            # Delete guest member
-            client.table('guest_members').delete().eq('id', member_id).execute()
+            cls.get_project_index().invalidate_project(project_id)
+            cls.get_access().invalidate_guests(project_id)
+            
+            # The guest may be reading the project's change feed
+            events = cls.get_events()
+            events.revoke_guest(project_id, response.data[0].get('email'))
+            events.publish(project_id, 'member.removed', {'id': member_id, 'type': 'guest'})
             return True
             
         except Exception as e:
@@ -794,31 +1640,150 @@ class SupabaseService:
     def update_guest_member(cls, project_id: int, member_id: int, role: str, current_user_id: str):
         """Update guest member role"""
         try:
-            client = cls.get_client()
+            client = cls.get_db()
             
-            # Check permissions
-            project = client.table('projects').select('created_by').eq('id', project_id).execute()
-            if not project.data:
+            # Allow creator OR admin members
+            if not cls.get_access().is_admin(project_id, current_user_id):
                 return None
             
-            is_creator = project.data[0]['created_by'] == current_user_id
-            
-            if not is_creator:
-                member = client.table('project_members').select('role').eq(
-                    'project_id', project_id
-                ).eq('user_id', current_user_id).execute()
-                
-                if not member.data or member.data[0]['role'] not in ['owner', 'admin']:
-                    return None
-            
             # Update role
+            # A guest's role does not change their read-only access (or feed subscriptions)
             response = client.table('guest_members').update({
                 'role': role
-            }).eq('id', member_id).execute()
+            }).eq('id', member_id).eq('project_id', project_id).execute()
+            cls.get_project_index().invalidate_project(project_id)
+            cls.get_access().invalidate_guests(project_id)
+            
+            if response.data:
+                cls.get_events().publish(project_id, 'member.updated', {**response.data[0], 'type': 'guest'})
             
             return response.data[0] if response.data else None
             
         except Exception as e:
             print(f"Error updating guest member: {str(e)}")
             raise
-
+    
+    # Export
+    @classmethod
+    def export_project(cls, project_id: int, user_id: str, types=None, email: str = None):
+        """A project as (type, record) pairs: the project, then its members,
+        guests, tasks and file metadata (or only the given types).
+        
+        Access is checked and the project read up front (None without
+        access); the rest is read lazily in keyset pages of
+        EXPORT_PAGE_SIZE rows, so memory stays flat however large the
+        project is.
+        """
+        if not cls.get_reader_role(project_id, user_id, email):
+            return None
+        
+        project = cls.get_db().table('projects').select('*').eq('id', project_id).execute().data
+        if not project:
+            return None
+        
+        return cls._export_records(project[0], types or list(EXPORT_TABLES))
+    
+    @classmethod
+    def _export_records(cls, project: dict, types: list):
+        yield 'project', project
+        
+        for kind, (table, columns) in EXPORT_TABLES.items():
+            if kind in types:
+                for row in cls._iter_project_rows(table, columns, project['id'], Config.EXPORT_PAGE_SIZE):
+                    yield kind, row
+    
+    @classmethod
+    def read_stored_file(cls, project_id: int, file_path: str, chunk_size: int = 64 * 1024):
+        """Contents of a project's stored file as an iterator of chunks, streamed from storage.
+        
+        Older records keep the file inline as a data: URL. Raises
+        PermissionError, without fetching anything, when the path is not
+        under the project's folder, and FileNotFoundError when the object
+        is not in storage.
+        """
+        if file_path.startswith('data:'):
+            header, _, data = file_path.partition(',')
+            return iter([base64.b64decode(data) if header.endswith(';base64') else unquote_to_bytes(data)])
+        
+        # Read with the service key: never follow a record outside its project
+        if not in_project_folder(project_id, file_path):
+            raise PermissionError(file_path)
+        
+        session = cls.get_client().storage.session
+        response = session.send(
+            session.build_request('GET', f'object/{Config.STORAGE_BUCKET}/{quote(file_path)}'), stream=True
+        )
+        
+        # Storage answers 400 or 404 for a missing object depending on its version
+        if response.status_code in (400, 404):
+            response.close()
+            raise FileNotFoundError(file_path)
+        if response.is_error:
+            response.close()
+            response.raise_for_status()
+        
+        def chunks():
+            try:
+                yield from response.iter_bytes(chunk_size)
+            finally:
+                response.close()
+        
+        return chunks()
+    
+    # Background jobs
+    @classmethod
+    def get_job(cls, job_id: str, user_id: str):
+        """Status and progress of a background job the user started, or None"""
+        job = cls.get_jobs().get(job_id)
+        
+        if not job or job['owner'] != user_id:
+            return None
+        
+        return {
+            'id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'attempts': job['attempts'],
+            'progress': job['progress'],
+            'last_error': job['last_error'],
+            'created_at': datetime.fromtimestamp(job['created_at'], timezone.utc).isoformat(),
+            'updated_at': datetime.fromtimestamp(job['updated_at'], timezone.utc).isoformat()
+        }
+    
+    # Search
+    @classmethod
+    def search(cls, user_id: str, query: str, email: str = None, types=None, limit: int = None,
+               cursor: str = None):
+        """Ranked matches in task titles and descriptions, file names and project names.
+        
+        Only the caller's projects (including guest ones) are searched. Returns one page shaped like paginate()
+        returns it, or None when the search_content database function is not
+        installed. Raises ValueError for an invalid cursor.
+        """
+        limit = limit or Config.SEARCH_DEFAULT_LIMIT
+        offset = decode_cursor(SEARCH_PAGE, cursor)[0] if cursor else 0
+        
+        if not isinstance(offset, int) or not 0 <= offset < Config.SEARCH_MAX_RESULTS:
+            raise ValueError('Invalid cursor')
+        
+        # The per-user project index is usually cached, so scoping costs no round trip
+        projects = cls.get_projects(user_id, email=email)
+        
+        rows = cls.call_function('search_content', {
+            'p_query': query,
+            'p_project_ids': [project['id'] for project in projects],
+            'p_types': list(types) if types else None,
+            'p_limit': limit + 1,
+            'p_offset': offset
+        }) if projects else []
+        
+        if rows is None:
+            return None
+        
+        names = {project['id']: project['name'] for project in projects}
+        has_more = len(rows) > limit and offset + limit < Config.SEARCH_MAX_RESULTS
+        
+        return {
+            'items': [{**row, 'project_name': names.get(row['project_id'])} for row in rows[:limit]],
+            'next_cursor': encode_cursor(SEARCH_PAGE, {'offset': offset + limit}) if has_more else None
+        }
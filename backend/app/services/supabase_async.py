@@ -0,0 +1,158 @@
+"""
+Async Supabase Service - concurrent sub-queries for multi-query endpoints
+"""
+import asyncio
+import os
+import threading
+from app.config import Config
+from app.services import metrics
+from app.services.fields import wants
+from app.services.repository import Repository, AsyncRepository, AsyncPostgrestRepository, missing_function
+from app.services.supabase import SupabaseService
+from app.services.transport import create_tuned_async_client
+
+
+class AsyncSupabaseService:
+    """Async counterpart of SupabaseService for endpoints built from independent queries.
+
+    Shares the access cache and response shaping with SupabaseService; only
+    the I/O differs. All coroutines run on one background event loop per
+    process, so every worker thread shares a single async client and its
+    connection pool. Sync code calls them through run(). With the direct
+    Postgres engine, queries run concurrently in worker threads instead.
+    """
+
+    _db: Repository = None
+    _loop: asyncio.AbstractEventLoop = None
+    _pid: int = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        """Get or start the background event loop (restarted after fork)"""
+        with cls._lock:
+            if cls._loop is None or cls._pid != os.getpid():
+                cls._loop = asyncio.new_event_loop()
+                cls._db = None
+                cls._pid = os.getpid()
+                threading.Thread(
+                    target=cls._loop.run_forever,
+                    name='supabase-async',
+                    daemon=True
+                ).start()
+            return cls._loop
+
+    @classmethod
+    def run(cls, coro):
+        """Run a coroutine on the background loop and wait for its result.
+
+        The caller's RequestLog follows the coroutine so its round trips are
+        attributed to the request that awaits it.
+        """
+        coro = metrics.bound(coro, metrics.current_log())
+        future = asyncio.run_coroutine_threadsafe(coro, cls.get_loop())
+        return future.result(timeout=Config.ASYNC_QUERY_TIMEOUT)
+
+    @classmethod
+    async def get_db(cls) -> Repository:
+        """Get or create the async repository for Config.DB_ENGINE"""
+        if cls._db is None:
+            if Config.DB_ENGINE == 'postgres':
+                cls._db = AsyncRepository(SupabaseService.get_db())
+            else:
+                cls._db = AsyncPostgrestRepository(await create_tuned_async_client())
+        return cls._db
+
+    @classmethod
+    async def get_project_role(cls, project_id: int, user_id: str):
+        """Get user's role in a project: 'owner', 'admin', 'member' or None"""
+        client = await cls.get_db()
+        return await SupabaseService.get_access().aresolve(client, project_id, user_id)
+
+    @classmethod
+    async def get_reader_role(cls, project_id: int, user_id: str, email: str = None):
+        """Get user's role for reading a project: their project role, 'guest' or None"""
+        client = await cls.get_db()
+        return await SupabaseService.get_access().areader_role(client, project_id, user_id, email)
+
+    @classmethod
+    async def call_function(cls, fn: str, params: dict):
+        """Async SupabaseService.call_function (shares its record of missing functions)"""
+        if fn in SupabaseService._missing_functions:
+            return None
+
+        client = await cls.get_db()
+        try:
+            return (await client.rpc(fn, params).execute()).data
+        except Exception as e:
+            if not missing_function(e):
+                raise
+            print(f"Database function {fn} is not installed (see backend/migrations); using fallback")
+            SupabaseService._missing_functions.add(fn)
+            return None
+
+    # Projects
+    @classmethod
+    async def get_projects(cls, user_id: str, fields=None, email: str = None):
+        """Get all projects for a user from the shared project index.
+
+        On a miss without the user_projects function, owned, member and guest
+        projects are fetched concurrently.
+        """
+        projects = SupabaseService.get_project_index().get(user_id, email)
+
+        if projects is None:
+            rows = await cls.call_function('user_projects', {'p_user_id': user_id, 'p_email': email})
+
+            if rows is None:
+                grants = await cls._fetch_project_grants(user_id, email)
+            else:
+                grants = ((row['project'], row['role'], row['source']) for row in rows)
+
+            projects = SupabaseService._index_projects(user_id, email, grants)
+
+        return SupabaseService._project_fields(projects, fields)
+
+    @classmethod
+    async def _fetch_project_grants(cls, user_id: str, email: str = None):
+        client = await cls.get_db()
+        queries = [
+            client.table('projects').select('*').eq('created_by', user_id).execute(),
+            client.table('project_members').select('role, projects(*)').eq('user_id', user_id).execute()
+        ]
+        if email:
+            queries.append(
+                client.table('guest_members').select('role, projects(*)').eq('email', email.lower()).execute()
+            )
+
+        return SupabaseService._project_grants(*await asyncio.gather(*queries))
+
+    # Project Members
+    @classmethod
+    async def get_all_project_members(cls, project_id: int, user_id: str, fields=None, email: str = None):
+        """Get both auth users and guest members, fetching them concurrently"""
+        try:
+            client = await cls.get_db()
+
+            # Check permissions
+            if not await cls.get_reader_role(project_id, user_id, email):
+                return None
+
+            # User details are only joined when requested
+            with_user = wants(fields, 'user')
+
+            auth_members, guest_members = await asyncio.gather(
+                client.table('project_members').select(
+                    'id, user_id, role, users(id, email, first_name, last_name)'
+                    if with_user else 'id, user_id, role'
+                ).eq('project_id', project_id).execute(),
+                client.table('guest_members').select(
+                    'id, role, email, name' if with_user else 'id, role'
+                ).eq('project_id', project_id).execute()
+            )
+
+            return SupabaseService._format_members(auth_members, guest_members, fields)
+
+        except Exception as e:
+            print(f"Error getting members: {str(e)}")
+            raise
@@ -0,0 +1,215 @@
+"""
+Project Task Cache - write-through cache of project task listings
+"""
+import bisect
+import contextlib
+import threading
+from datetime import datetime, timezone
+from app.services.broadcast import broadcast
+from app.services.cache import TTLCache
+from app.services.fields import RESOURCES
+from app.services.pagination import decode_cursor, encode_cursor
+
+_MISSING = object()
+
+# Fields a cached listing can serve (its rows hold every column plus the assignee)
+CACHED_FIELDS = frozenset(RESOURCES['tasks']['columns']) | {'assignee'}
+
+
+def _sortable(value):
+    """Comparable form of a sort value (ISO timestamps vary in fraction digits)"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return value
+
+
+def list_version(count: int, latest) -> str:
+    """Validator of a task listing from its row count and latest updated_at"""
+    latest = _sortable(latest)
+    if isinstance(latest, datetime):
+        latest = latest.astimezone(timezone.utc).isoformat()
+    return f'{count}-{latest}'
+
+
+class _Listing:
+    """A project's tasks in sort order, replaced (never mutated) on write"""
+
+    __slots__ = ('rows', 'keys')
+
+    def __init__(self, rows: list, keys: list):
+        self.rows = rows
+        self.keys = keys
+
+
+class ProjectTaskCache:
+    """Full task listings per project, in the default representation.
+
+    Filled by full reads; creates, updates and deletes patch the cached
+    listing directly (write-through), so reads see this process's writes.
+    Other processes of the app drop their copy through ProcessBroadcast;
+    entries still expire after a TTL to bound staleness from writes made
+    outside the app. Memory is bounded by max_rows cached rows in total (least
+    recently used projects go first); larger projects are not cached.
+    """
+
+    def __init__(self, sort_keys, max_rows: int = 50000, ttl: float = 10, max_project_rows: int = 5000):
+        if any(desc for _, desc in sort_keys):
+            raise ValueError('ProjectTaskCache only supports ascending sort keys')
+
+        self.sort_keys = sort_keys
+        self.max_project_rows = max_project_rows
+        self._cache = TTLCache(maxsize=max_rows, ttl=ttl, weigh=lambda listing: len(listing.rows) or 1)
+        # project id -> [reads in flight, writes seen during them]
+        self._loads = {}
+        self._lock = threading.Lock()
+
+    def _key(self, row: dict) -> tuple:
+        return tuple(_sortable(row.get(column)) for column, _ in self.sort_keys)
+
+    # Reads
+    def get(self, project_id: int, limit: int = None, cursor: str = None, fields=None):
+        """Cached listing shaped like paginate() returns it, or None on a miss.
+
+        Raises ValueError for an invalid cursor, like paginate().
+        """
+        if fields is not None and not CACHED_FIELDS.issuperset(fields):
+            return None
+
+        listing = self._cache.get(project_id)
+        if listing is None:
+            return None
+
+        if limit is None:
+            return self._shape(listing.rows, fields)
+
+        start = 0
+        if cursor:
+            values = decode_cursor(self.sort_keys, cursor)
+            start = bisect.bisect_right(listing.keys, tuple(_sortable(value) for value in values))
+
+        rows = listing.rows[start:start + limit]
+        has_more = start + limit < len(listing.rows)
+
+        return {
+            'items': self._shape(rows, fields),
+            'next_cursor': encode_cursor(self.sort_keys, rows[-1]) if has_more else None
+        }
+
+    def rows(self, project_id: int):
+        """The cached rows of a project (treat as read-only), or None"""
+        listing = self._cache.get(project_id)
+        return None if listing is None else listing.rows
+
+    def version(self, project_id: int):
+        """list_version() of a cached listing, or None"""
+        listing = self._cache.get(project_id)
+        if listing is None:
+            return None
+        latest = max((_sortable(row.get('updated_at')) for row in listing.rows if row.get('updated_at')), default=None)
+        return list_version(len(listing.rows), latest)
+
+    def _shape(self, rows: list, fields=None) -> list:
+        if fields is None:
+            return [dict(row) for row in rows]
+
+        keys = list(dict.fromkeys((*(column for column, _ in self.sort_keys), *fields)))
+        return [{key: row.get(key) for key in keys} for row in rows]
+
+    @contextlib.contextmanager
+    def loading(self, project_id: int):
+        """Track a full read of a project's tasks; yields fill(rows) to cache its result.
+
+        A write to the project while the read is in flight makes fill a
+        no-op, so a listing fetched before the write is never cached.
+        """
+        with self._lock:
+            load = self._loads.setdefault(project_id, [0, 0])
+            load[0] += 1
+            seen = load[1]
+
+        def fill(rows: list):
+            with self._lock:
+                current = load[1] == seen
+            if current and rows is not None and len(rows) <= self.max_project_rows:
+                rows = [dict(row) for row in rows]
+                self._cache.set(project_id, _Listing(rows, [self._key(row) for row in rows]))
+
+        try:
+            yield fill
+        finally:
+            with self._lock:
+                load[0] -= 1
+                if not load[0]:
+                    del self._loads[project_id]
+
+    # Write-through (other processes drop the listing instead of patching it)
+    def _written(self, project_id: int):
+        with self._lock:
+            load = self._loads.get(project_id)
+            if load is not None:
+                load[1] += 1
+
+    @broadcast(remote=lambda project_id, *_: ('invalidate', (project_id,)))
+    def put(self, project_id: int, task: dict):
+        """Insert or replace a task as returned by a write (without the assignee embed)"""
+        self._written(project_id)
+
+        def patch(listing):
+            rows, keys = self._without(listing, task['id'])
+            row = dict(task)
+
+            if 'assignee' not in row:
+                row['assignee'] = self._assignee(listing.rows, row.get('assigned_to'))
+                if row['assignee'] is _MISSING:
+                    # Assignee details unknown here; refetch on the next read
+                    return None
+
+            key = self._key(row)
+            index = bisect.bisect_right(keys, key)
+            rows.insert(index, row)
+            keys.insert(index, key)
+
+            return _Listing(rows, keys) if len(rows) <= self.max_project_rows else None
+
+        self._cache.update(project_id, patch)
+
+    @broadcast(remote=lambda project_id, *_: ('invalidate', (project_id,)))
+    def remove(self, project_id: int, task_id: int):
+        """Drop a deleted task"""
+        self._written(project_id)
+        self._cache.update(project_id, lambda listing: _Listing(*self._without(listing, task_id)))
+
+    @broadcast()
+    def invalidate(self, project_id: int):
+        """Forget a project's listing"""
+        self._written(project_id)
+        self._cache.pop(project_id)
+
+    @staticmethod
+    def _without(listing: _Listing, task_id: int) -> tuple:
+        """Copies of a listing's rows and keys minus one task"""
+        for index, row in enumerate(listing.rows):
+            if row['id'] == task_id:
+                return listing.rows[:index] + listing.rows[index + 1:], listing.keys[:index] + listing.keys[index + 1:]
+        return list(listing.rows), list(listing.keys)
+
+    @staticmethod
+    def _assignee(rows: list, user_id: str):
+        """Embedded assignee for user_id, borrowed from another cached task"""
+        if user_id is None:
+            return None
+        for row in rows:
+            if row.get('assigned_to') == user_id and row.get('assignee'):
+                return row['assignee']
+        return _MISSING
+
+    def clear(self):
+        """Forget everything"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Cache statistics (weight is the number of cached rows)"""
+        return self._cache.stats()
@@ -0,0 +1,62 @@
+"""
+Verified Token Cache - skip repeated JWT decoding for the same bearer token
+"""
+import hashlib
+import time
+from app.services.cache import TTLCache
+
+
+class UserPrincipal:
+    """Authenticated user built from verified JWT claims"""
+
+    __slots__ = ('id', 'email', 'role', 'user_metadata', 'app_metadata', 'exp')
+
+    def __init__(self, payload: dict):
+        self.id = payload.get('sub')
+        self.email = payload.get('email')
+        self.role = payload.get('role')
+        self.user_metadata = payload.get('user_metadata') or {}
+        self.app_metadata = payload.get('app_metadata') or {}
+        self.exp = payload.get('exp')
+
+    def __repr__(self):
+        return f"UserPrincipal(id={self.id!r}, email={self.email!r})"
+
+
+class VerifiedTokenCache:
+    """Cache of verified principals keyed by token digest, honoring the token's exp"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        """Get the cached principal for a token (None if unknown or expired)"""
+        user = self._cache.get(self._key(token))
+
+        if user is not None and user.exp and user.exp <= time.time():
+            self._cache.pop(self._key(token))
+            return None
+
+        return user
+
+    def set(self, token: str, user: UserPrincipal):
+        """Cache a principal until the cache TTL or the token's exp, whichever is first"""
+        ttl = self._cache.ttl
+
+        if user.exp:
+            ttl = min(ttl, user.exp - time.time())
+
+        if ttl > 0:
+            self._cache.set(self._key(token), user, ttl=ttl)
+
+    def clear(self):
+        """Forget all verified tokens"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Cache statistics"""
+        return self._cache.stats()
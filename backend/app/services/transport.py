@@ -0,0 +1,122 @@
+"""
+Supabase HTTP Transport - tuned, shared connection pools for the Supabase clients
+"""
+import httpx
+from supabase import Client, AsyncClient
+from postgrest import SyncPostgrestClient, AsyncPostgrestClient
+from postgrest.utils import SyncClient as PostgrestSession, AsyncClient as AsyncPostgrestSession
+from storage3 import SyncStorageClient, AsyncStorageClient
+from storage3.utils import SyncClient as StorageSession, AsyncClient as AsyncStorageSession
+from app.config import Config
+from app.services.metrics import http_hooks
+
+
+def http_limits() -> httpx.Limits:
+    """Connection pool limits from Config"""
+    return httpx.Limits(
+        max_connections=Config.SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.SUPABASE_KEEPALIVE_EXPIRY
+    )
+
+
+def http_timeout(read: float = None) -> httpx.Timeout:
+    """Connect/read timeouts from Config"""
+    read = Config.SUPABASE_READ_TIMEOUT if read is None else read
+    return httpx.Timeout(read, connect=Config.SUPABASE_CONNECT_TIMEOUT)
+
+
+def session_options(timeout: httpx.Timeout, verify: bool, proxy, is_async: bool = False) -> dict:
+    """Keyword arguments shared by every tuned httpx session (round trips are recorded in metrics)"""
+    return {
+        'timeout': timeout,
+        'verify': bool(verify),
+        'proxy': proxy,
+        'follow_redirects': True,
+        'http2': Config.SUPABASE_HTTP2,
+        'limits': http_limits(),
+        'event_hooks': http_hooks(is_async)
+    }
+
+
+# PostgREST
+class TunedPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose session uses the configured pool and timeouts"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return PostgrestSession(
+            base_url=base_url, headers=headers,
+            **session_options(http_timeout(), verify, proxy)
+        )
+
+
+class TunedAsyncPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose session uses the configured pool and timeouts"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return AsyncPostgrestSession(
+            base_url=base_url, headers=headers,
+            **session_options(http_timeout(), verify, proxy, is_async=True)
+        )
+
+
+# Storage (keeps its own, longer read timeout for transfers)
+class TunedStorageClient(SyncStorageClient):
+    """Storage client whose session uses the configured pool"""
+
+    def _create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return StorageSession(
+            base_url=base_url, headers=headers,
+            **session_options(http_timeout(timeout), verify, proxy)
+        )
+
+
+class TunedAsyncStorageClient(AsyncStorageClient):
+    """Async storage client whose session uses the configured pool"""
+
+    def _create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return AsyncStorageSession(
+            base_url=base_url, headers=headers,
+            **session_options(http_timeout(timeout), verify, proxy, is_async=True)
+        )
+
+
+# Supabase clients
+class TunedClient(Client):
+    """Supabase client built on the tuned PostgREST and storage sessions"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        return TunedPostgrestClient(
+            rest_url, headers=headers, schema=schema, verify=verify, proxy=proxy
+        )
+
+    @staticmethod
+    def _init_storage_client(storage_url, headers, storage_client_timeout=20, verify=True, proxy=None):
+        return TunedStorageClient(storage_url, headers, storage_client_timeout, verify, proxy)
+
+
+class TunedAsyncClient(AsyncClient):
+    """Async Supabase client built on the tuned PostgREST and storage sessions"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        return TunedAsyncPostgrestClient(
+            rest_url, headers=headers, schema=schema, verify=verify, proxy=proxy
+        )
+
+    @staticmethod
+    def _init_storage_client(storage_url, headers, storage_client_timeout=20, verify=True, proxy=None):
+        return TunedAsyncStorageClient(storage_url, headers, storage_client_timeout, verify, proxy)
+
+
+def create_tuned_client() -> Client:
+    """Create a Supabase client with the configured transport"""
+    Config.require_supabase()
+    return TunedClient.create(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+
+
+async def create_tuned_async_client() -> AsyncClient:
+    """Create an async Supabase client with the configured transport"""
+    Config.require_supabase()
+    return await TunedAsyncClient.create(Config.SUPABASE_URL, Config.SUPABASE_KEY)
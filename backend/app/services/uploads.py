@@ -0,0 +1,90 @@
+"""
+Uploads - validation, storage paths and client instructions for direct-to-storage uploads
+"""
+import os
+import re
+from app.config import Config
+
+
+class UploadError(Exception):
+    """An upload session that cannot be finalized; status is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+# finalize_upload() statuses that fail -> (message, HTTP status)
+FINALIZE_ERRORS = {
+    'expired': ('Upload session expired', 410),
+    'incomplete': ('The file has not been uploaded yet', 409),
+    'size_mismatch': ('The uploaded file does not match the announced size', 409),
+}
+
+
+def check_upload(filename, file_size):
+    """Validate a file's name and size against the upload limits.
+
+    Returns (filename, file_size). Raises ValueError when the extension is
+    not allowed or the size is not between 1 byte and MAX_FILE_SIZE.
+    """
+    if not isinstance(filename, str) or not filename.strip():
+        raise ValueError('filename is required')
+
+    filename = filename.strip()
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    if extension not in Config.ALLOWED_EXTENSIONS:
+        raise ValueError(f"File type not allowed (use {', '.join(sorted(Config.ALLOWED_EXTENSIONS))})")
+
+    if isinstance(file_size, bool) or not isinstance(file_size, int) or file_size < 1:
+        raise ValueError('file_size must be a positive number of bytes')
+    if file_size > Config.MAX_FILE_SIZE:
+        raise ValueError(f'File is larger than {Config.MAX_FILE_SIZE // (1024 * 1024)}MB')
+
+    return filename, file_size
+
+
+def storage_path(project_id: int, session_id: str, filename: str) -> str:
+    """Object path for an upload: <project>/<session>/<name>, the name reduced to safe characters"""
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', filename).strip('._') or 'file'
+    return f'{project_id}/{session_id}/{name[-100:]}'
+
+
+def in_project_folder(project_id: int, file_path) -> bool:
+    """Whether file_path names an object under the project's folder (<project>/...).
+
+    Rejects '.', '..' and empty segments and backslashes: the storage URL is
+    built from the path, and a normalized '..' would reach other folders or
+    buckets with the service key.
+    """
+    if not isinstance(file_path, str) or not file_path.startswith(f'{project_id}/') or '\\' in file_path:
+        return False
+    return all(segment not in ('', '.', '..') for segment in file_path.split('/'))
+
+
+def check_file_path(project_id: int, file_path) -> str:
+    """Validate the file_path of a file recorded without an upload session.
+
+    Only inline data: URLs (older clients) and objects in the project's
+    folder are accepted. Raises ValueError.
+    """
+    if isinstance(file_path, str) and file_path.startswith('data:'):
+        return file_path
+    if not in_project_folder(project_id, file_path):
+        raise ValueError(f'file_path must be a stored object under {project_id}/')
+    return file_path
+
+
+def upload_instructions(signed: dict, file_size: int) -> dict:
+    """How the client sends the bytes: one PUT to the signed URL, or resumable
+    TUS chunks (x-signature: token) when the file is larger than one chunk"""
+    resumable = file_size > Config.UPLOAD_CHUNK_SIZE
+
+    return {
+        'method': 'tus' if resumable else 'signed_url',
+        'bucket': Config.STORAGE_BUCKET,
+        'token': signed['token'],
+        'signed_url': signed['signed_url'],
+        'tus_endpoint': f"{Config.SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable/sign" if resumable else None,
+        'chunk_size': Config.UPLOAD_CHUNK_SIZE if resumable else file_size
+    }
@@ -0,0 +1,24 @@
+"""
+ASGI Application Entry Point
+
+Serve with an ASGI server, e.g.:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+
+Project change feeds (/api/projects/<id>/events) are served here, on the
+event loop. With several worker processes, set DATABASE_URL (or
+BROADCAST_DATABASE_URL) so changes made in one reach the caches and
+subscribers of the others.
+"""
+import os
+from a2wsgi import WSGIMiddleware
+from app import create_app
+from app.config import Config
+from app.realtime import RealtimeMiddleware
+
+# Get environment
+env = os.getenv('FLASK_ENV', 'development')
+
+# Create app; Flask views run on a thread pool (request and response bodies
+# are streamed), Supabase I/O on the shared async loop
+app = create_app(env)
+application = RealtimeMiddleware(WSGIMiddleware(app, workers=Config.ASGI_WORKER_THREADS))
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for SupabaseService and the route layer (python -m benchmarks)
+"""
@@ -0,0 +1,251 @@
+"""
+Benchmark runner
+
+    cd backend
+    python -m benchmarks                                  # run everything
+    python -m benchmarks --latency-ms 5 -k tasks          # only cases matching 'tasks'
+    python -m benchmarks --save benchmarks/baseline.json  # record a baseline
+    python -m benchmarks --compare benchmarks/baseline.json --fail-on-regression
+
+Every SupabaseService method and blueprint route runs against a fake
+PostgREST in a child process, so no network or Supabase project is needed.
+Per call it reports wall time, database round trips, the peak of memory
+allocated during the call ("peak KiB") and the memory blocks it left
+allocated ("blocks": tracemalloc snapshot difference, e.g. cache entries).
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from benchmarks.fixtures import FakeServer, JWT_SECRET, dataset, service_key
+
+# Infrastructure methods that are not data operations
+NOT_BENCHMARKED = {'get_client', 'get_db', 'get_access', 'get_project_index', 'get_events', 'get_task_cache', 'get_jobs', 'start_broadcast', 'get_loop', 'run'}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='delay added to every fake request')
+    parser.add_argument('--iterations', '-n', type=int, default=20, help='timed calls per case')
+    parser.add_argument('--alloc-iterations', type=int, default=5, help='calls traced for memory (peak KiB, blocks)')
+    parser.add_argument('--cold', action='store_true', help='clear access and token caches before every call')
+    parser.add_argument('-k', dest='pattern', help='only run cases whose name matches this regex')
+    parser.add_argument('--tasks', type=int, default=200, help='tasks in the main project')
+    parser.add_argument('--files', type=int, default=50, help='files in the main project')
+    parser.add_argument('--members', type=int, default=10, help='extra members in the main project')
+    parser.add_argument('--save', metavar='PATH', help='write results as JSON (a baseline)')
+    parser.add_argument('--compare', metavar='PATH', help='compare against a saved baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown/growth reported as a regression (default 0.25)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit 1 when regressions are found')
+    return parser.parse_args(argv)
+
+
+def configure_environment(url: str, job_dir: str):
+    """Point the app at the fake before app.config is imported"""
+    os.environ.update({
+        # Jobs only run when a case runs them, so they never add to another case's round trips
+        'JOB_DB_PATH': os.path.join(job_dir, 'jobs.sqlite3'),
+        'JOB_WORKERS': '0',
+        'SUPABASE_URL': url,
+        'SUPABASE_KEY': service_key(),
+        'SUPABASE_JWT_SECRET': JWT_SECRET,
+        'DB_ENGINE': 'postgrest',
+        'FLASK_ENV': 'production',
+        'NO_PROXY': '127.0.0.1,localhost'
+    })
+
+
+def measure(case, ctx, args) -> dict:
+    """Time, count round trips and trace allocations for one case"""
+    def prepare():
+        arg = case.setup(ctx) if case.setup else None
+        if args.cold:
+            ctx.clear_caches()
+        return arg
+
+    # Warm-up call also validates the case
+    case.run(ctx, prepare())
+
+    timings = []
+    requests = Counter()
+
+    for _ in range(args.iterations):
+        arg = prepare()
+        before = ctx.server.stats()['requests']
+
+        start = time.perf_counter()
+        case.run(ctx, arg)
+        timings.append(time.perf_counter() - start)
+
+        requests.update(ctx.server.stats()['requests'])
+        requests.subtract(before)
+
+    peaks, blocks = [], []
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        for _ in range(args.alloc_iterations):
+            arg = prepare()
+            before = tracemalloc.take_snapshot().filter_traces(ignore)
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            case.run(ctx, arg)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+            after = tracemalloc.take_snapshot().filter_traces(ignore)
+            blocks.append(sum(stat.count_diff for stat in after.compare_to(before, 'filename')))
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'ms': round(sum(timings) / len(timings) * 1000, 3),
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 3),
+        'trips': round(sum(requests.values()) / args.iterations, 2),
+        'kib': round(sum(peaks) / max(len(peaks), 1) / 1024, 1),
+        'blocks': round(sum(blocks) / max(len(blocks), 1), 1),
+        'requests': {k: round(v / args.iterations, 2) for k, v in sorted(requests.items()) if v}
+    }
+
+
+def coverage(app, cases):
+    """Service methods and routes without a benchmark case"""
+    from app.services.supabase import SupabaseService
+    from app.services.supabase_async import AsyncSupabaseService
+
+    names = {case.name.split('[')[0] for case in cases}
+    missing = []
+
+    for prefix, service in (('', SupabaseService), ('async.', AsyncSupabaseService)):
+        for name in dir(service):
+            if name.startswith('_') or name in NOT_BENCHMARKED or not callable(getattr(service, name)):
+                continue
+            if prefix + name not in names:
+                missing.append(prefix + name)
+
+    adapter = app.url_map.bind('localhost')
+    covered = set()
+    for case in cases:
+        method, _, path = case.name.partition(' ')
+        if path.startswith('/'):
+            with contextlib.suppress(Exception):
+                covered.add(adapter.match(path.split('[')[0].split('?')[0].replace('{id}', '1'), method)[0])
+
+    for rule in app.url_map.iter_rules():
+        if '.' in rule.endpoint and rule.endpoint not in covered:
+            missing.append(f"{','.join(sorted(rule.methods - {'HEAD', 'OPTIONS'}))} {rule.rule}")
+
+    return missing
+
+
+def report(results: dict, baseline: dict = None, tolerance: float = 0.25):
+    """Print a results table; returns the names of regressed cases"""
+    regressions = []
+    header = f"{'case':<48} {'ms/call':>9} {'trips':>6} {'peak KiB':>9} {'blocks':>7}"
+    if baseline:
+        header += f"  {'vs baseline':<30}"
+    print(header)
+    print('-' * len(header))
+
+    for name, result in results.items():
+        line = f"{name:<48} {result['ms']:>9.2f} {result['trips']:>6.2f} {result['kib']:>9.1f} {result['blocks']:>7.0f}"
+        old = (baseline or {}).get(name)
+
+        if old:
+            notes, regressed = [], False
+
+            if result['trips'] != old['trips']:
+                notes.append(f"trips {old['trips']:g}->{result['trips']:g}")
+                regressed = result['trips'] > old['trips']
+            if old['ms'] and result['ms'] > old['ms'] * (1 + tolerance) and result['ms'] - old['ms'] > 0.5:
+                notes.append(f"time +{(result['ms'] / old['ms'] - 1) * 100:.0f}%")
+                regressed = True
+            if old['kib'] and result['kib'] > old['kib'] * (1 + tolerance) and result['kib'] - old['kib'] > 4:
+                notes.append(f"mem +{(result['kib'] / old['kib'] - 1) * 100:.0f}%")
+                regressed = True
+
+            if regressed:
+                regressions.append(name)
+            line += f"  {'REGRESSED ' if regressed else ''}{', '.join(notes)}"
+        elif baseline is not None:
+            line += '  (new)'
+
+        print(line)
+
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = FakeServer(args.latency_ms)
+    job_dir = tempfile.mkdtemp(prefix='benchmark-jobs-')
+
+    try:
+        configure_environment(server.url, job_dir)
+
+        from app import create_app
+        from benchmarks.cases import SERVICE_CASES, ROUTE_CASES, Context
+
+        app = create_app('production')
+        ctx = Context(server, app)
+        cases = SERVICE_CASES + ROUTE_CASES
+        selected = [c for c in cases if not args.pattern or re.search(args.pattern, c.name)]
+
+        results = {}
+        with open(os.devnull, 'w') as devnull:
+            for case in selected:
+                # Fresh data for every case keeps them independent
+                server.load(dataset(args.tasks, args.files, args.members))
+                ctx.clear_caches()
+
+                with contextlib.redirect_stdout(devnull):
+                    results[case.name] = measure(case, ctx, args)
+
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)['results']
+
+        regressions = report(results, baseline, args.tolerance)
+
+        missing = coverage(app, cases)
+        if missing:
+            print(f"\nNot benchmarked: {', '.join(missing)}")
+
+        if args.save:
+            with open(args.save, 'w') as f:
+                json.dump({
+                    'meta': {
+                        'latency_ms': args.latency_ms,
+                        'iterations': args.iterations,
+                        'cold': args.cold,
+                        'dataset': {'tasks': args.tasks, 'files': args.files, 'members': args.members},
+                        'python': platform.python_version(),
+                        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                    },
+                    'results': results
+                }, f, indent=2, sort_keys=True)
+                f.write('\n')
+            print(f'\nSaved {len(results)} results to {args.save}')
+
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                return 1
+
+        return 0
+    finally:
+        server.close()
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
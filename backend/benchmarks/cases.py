@@ -0,0 +1,395 @@
+"""
+Benchmark cases - one per SupabaseService method and per blueprint route
+"""
+import io
+import itertools
+from datetime import datetime, timezone
+from app.services.imports import read_rows
+from app.services.pagination import encode_sync_cursor
+from app.services.supabase import SupabaseService
+from app.services.supabase_async import AsyncSupabaseService
+from benchmarks.fixtures import OWNER, MEMBER, OUTSIDER, PROJECT_ID, email, token
+
+_counter = itertools.count(1)
+
+
+class BenchmarkError(Exception):
+    """A case did not produce the expected result"""
+
+
+class Case:
+    """One benchmarked call. setup(ctx) runs untimed; its result is passed to run(ctx, arg)."""
+
+    __slots__ = ('name', 'run', 'setup')
+
+    def __init__(self, name: str, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+class Context:
+    """What a case can use: the Flask test client, tokens and untimed inserts"""
+
+    def __init__(self, server, app):
+        self.server = server
+        self.app = app
+        self.client = app.test_client()
+        self.tokens = {uid: token(uid) for uid in (OWNER, MEMBER, OUTSIDER)}
+
+    def headers(self, uid: str) -> dict:
+        return {'Authorization': f'Bearer {self.tokens[uid]}'}
+
+    def insert(self, table: str, **row) -> dict:
+        """Create a row directly in the fake (not counted as a round trip)"""
+        return self.server.insert(table, [row])[0]
+
+    @staticmethod
+    def clear_caches():
+        SupabaseService.get_access().clear()
+        SupabaseService.get_project_index().clear()
+        SupabaseService._tokens.clear()
+        SupabaseService._missing_functions.clear()
+        SupabaseService._missing_tables.clear()
+        SupabaseService.get_events().clear()
+        SupabaseService.get_task_cache().clear()
+
+
+def must(value):
+    """Fail the case when a service call returned nothing"""
+    if value is None or value is False:
+        raise BenchmarkError('call returned no result')
+    return value
+
+
+def unique(prefix: str) -> str:
+    return f'{prefix}-{next(_counter)}'
+
+
+# Setup helpers
+def new_task(ctx):
+    return ctx.insert('tasks', project_id=PROJECT_ID, title=unique('task'), status='todo',
+                      priority='medium', created_by=OWNER)['id']
+
+
+def new_project(ctx):
+    return ctx.insert('projects', name=unique('project'), status='active', created_by=OWNER)['id']
+
+
+def new_project_with_files(ctx):
+    """A project with 500 files to purge from storage"""
+    project_id = new_project(ctx)
+    ctx.server.insert('files', [
+        {'project_id': project_id, 'filename': 'bench.pdf', 'file_path': f'{project_id}/{i}.pdf',
+         'file_size': 1024, 'file_type': 'application/pdf', 'uploaded_by': OWNER}
+        for i in range(500)
+    ])
+    return project_id
+
+
+def new_job(ctx):
+    return S.get_jobs().enqueue('storage.remove',
+                                {'bucket': 'project-files', 'project_id': PROJECT_ID, 'paths': ['1/bench.pdf']},
+                                owner=MEMBER, progress={'removed': 0, 'total': 1})
+
+
+def new_member(ctx):
+    member = ctx.insert('users', id=f'00000000-0000-4000-9000-{next(_counter):012d}', email=unique('m'))
+    ctx.insert('project_members', project_id=PROJECT_ID, user_id=member['id'], role='member')
+    return member['id']
+
+
+def new_guest(ctx):
+    return ctx.insert('guest_members', project_id=PROJECT_ID, name='Guest',
+                      email=f"{unique('guest')}@example.com", role='member')['id']
+
+
+def new_file(ctx):
+    return ctx.insert('files', project_id=PROJECT_ID, filename='bench.pdf', file_path=f"1/{unique('f')}.pdf",
+                      file_size=1024, file_type='application/pdf', uploaded_by=OWNER)['id']
+
+
+def new_upload(ctx):
+    return S.create_upload_session(PROJECT_ID, {'filename': 'bench.pdf', 'file_size': 2048}, MEMBER)['id']
+
+
+def queued_removals(ctx):
+    """Run leftover jobs, then queue 10 storage deletions"""
+    jobs = S.get_jobs()
+    jobs.run_pending()
+    for _ in range(10):
+        jobs.enqueue('storage.remove', {'bucket': 'project-files', 'project_id': PROJECT_ID,
+                                        'paths': [f"1/{unique('f')}.pdf"]})
+
+
+def without_functions(*names):
+    """Setup running a case against the plain-query fallback"""
+    def setup(ctx):
+        ctx.server.disable_functions(names)
+        SupabaseService._missing_functions.update(names)
+    return setup
+
+
+def forget_projects(ctx):
+    SupabaseService.get_project_index().clear()
+
+
+def forget_tasks(ctx):
+    SupabaseService.get_task_cache().clear()
+
+
+def cached_tasks(ctx):
+    SupabaseService.get_project_tasks(PROJECT_ID, MEMBER)
+
+
+def current_etag(path: str, cold: bool = False):
+    """Setup fetching a route's ETag (then forgetting cached task lists when cold)"""
+    def setup(ctx):
+        response = ctx.client.get(path, headers=ctx.headers(MEMBER))
+        if cold:
+            forget_tasks(ctx)
+        return response.headers['ETag']
+    return setup
+
+
+def recent_changes(ctx):
+    """Update a few tasks and delete one; returns the time just before"""
+    since = datetime.now(timezone.utc)
+    for task_id in range(1, 6):
+        S.update_task(task_id, {'status': 'done'}, MEMBER)
+    S.delete_task(new_task(ctx), MEMBER)
+    return since
+
+
+def recent_cursor(ctx):
+    return encode_sync_cursor(recent_changes(ctx))
+
+
+def subscribers(count: int):
+    """Setup subscribing count realtime clients (on the async loop) to the main project"""
+    current = []
+
+    async def subscribe():
+        bus = SupabaseService.get_events()
+        for subscription in current:
+            bus.unsubscribe(subscription)
+        current[:] = [bus.subscribe(PROJECT_ID, MEMBER) for _ in range(count)]
+
+    return lambda ctx: AsyncSupabaseService.run(subscribe())
+
+
+def task_csv(rows: int) -> bytes:
+    """A task import with every other task assigned to the owner by email"""
+    lines = ['title,status,priority,due_date,assignee']
+    lines += [f"Imported {i},todo,high,2026-06-01,{email(OWNER) if i % 2 else ''}" for i in range(rows)]
+    return ('\n'.join(lines) + '\n').encode()
+
+
+IMPORT_CSV = task_csv(200)
+
+
+def batch_operations(ctx):
+    deletes = [new_task(ctx) for _ in range(10)]
+    return (
+        [{'op': 'create', 'data': {'title': unique('batch')}} for _ in range(10)]
+        + [{'op': 'update', 'id': task_id, 'data': {'status': 'done'}} for task_id in range(1, 11)]
+        + [{'op': 'delete', 'id': task_id} for task_id in deletes]
+    )
+
+
+S = SupabaseService
+A = AsyncSupabaseService
+
+SERVICE_CASES = [
+    Case('verify_user', lambda ctx, _: must(S.verify_user(ctx.tokens[MEMBER]))),
+    Case('get_project_role', lambda ctx, _: must(S.get_project_role(PROJECT_ID, MEMBER))),
+    Case('get_reader_role', lambda ctx, _: must(S.get_reader_role(2, OUTSIDER, email(OUTSIDER)))),
+
+    # Projects
+    Case('get_projects', lambda ctx, _: must(S.get_projects(MEMBER))),
+    Case('get_projects[fields]', lambda ctx, _: must(S.get_projects(MEMBER, ('id', 'name')))),
+    Case('get_projects[miss]', lambda ctx, _: must(S.get_projects(MEMBER, None, email(MEMBER))), forget_projects),
+    Case('get_projects[miss,fallback]', lambda ctx, _: must(S.get_projects(MEMBER, None, email(MEMBER))),
+         lambda ctx: (forget_projects(ctx), without_functions('user_projects')(ctx))),
+    Case('get_projects[guest]', lambda ctx, _: must(S.get_projects(OUTSIDER, None, email(OUTSIDER))),
+         forget_projects),
+    Case('get_project_by_id', lambda ctx, _: must(S.get_project_by_id(PROJECT_ID, MEMBER))),
+    Case('get_project_by_id[guest]', lambda ctx, _: must(S.get_project_by_id(2, OUTSIDER, email(OUTSIDER)))),
+    Case('create_project', lambda ctx, _: must(S.create_project({'name': unique('p')}, OWNER))),
+    Case('update_project', lambda ctx, _: must(S.update_project(PROJECT_ID, {'description': 'x'}, OWNER))),
+    Case('delete_project', lambda ctx, pid: must(S.delete_project(pid, OWNER)), new_project),
+    Case('delete_project[500 files]', lambda ctx, pid: must(S.delete_project(pid, OWNER)), new_project_with_files),
+    Case('get_project_stats', lambda ctx, _: must(S.get_project_stats(PROJECT_ID, MEMBER))),
+    Case('get_project_stats[fallback]', lambda ctx, _: must(S.get_project_stats(PROJECT_ID, MEMBER)),
+         without_functions('project_stats')),
+
+    # Dashboard
+    Case('get_dashboard', lambda ctx, _: must(S.get_dashboard(MEMBER))),
+    Case('get_project_rollups', lambda ctx, _: must(S.get_project_rollups(range(1, 11)))),
+    Case('get_project_rollups[fallback]', lambda ctx, _: must(S.get_project_rollups(range(1, 11))),
+         without_functions('project_rollups')),
+    Case('call_function', lambda ctx, _: S.call_function('project_rollups', {'project_ids': [PROJECT_ID]})),
+
+    # Tasks
+    Case('get_project_tasks', lambda ctx, _: must(S.get_project_tasks(PROJECT_ID, MEMBER))),
+    Case('get_project_tasks[miss]', lambda ctx, _: must(S.get_project_tasks(PROJECT_ID, MEMBER)), forget_tasks),
+    Case('get_project_tasks[page]', lambda ctx, _: must(S.get_project_tasks(PROJECT_ID, MEMBER, 50))),
+    Case('get_project_tasks[page,cached]', lambda ctx, _: must(S.get_project_tasks(PROJECT_ID, MEMBER, 50)),
+         lambda ctx: S.get_project_tasks(PROJECT_ID, MEMBER)),
+    Case('get_project_tasks[filtered]', lambda ctx, _: must(S.get_project_tasks(
+        PROJECT_ID, MEMBER, 50, None, None, {'priority': ['high'], 'overdue': True},
+        [('due_date', False), ('id', False)]))),
+    Case('get_task_list_version', lambda ctx, _: must(S.get_task_list_version(PROJECT_ID, MEMBER)),
+         cached_tasks),
+    Case('get_task_list_version[miss]', lambda ctx, _: must(S.get_task_list_version(PROJECT_ID, MEMBER)),
+         forget_tasks),
+    Case('get_task_changes', lambda ctx, since: must(S.get_task_changes(PROJECT_ID, MEMBER, since)), recent_changes),
+    Case('get_task_changes[full]', lambda ctx, _: must(S.get_task_changes(PROJECT_ID, MEMBER))),
+    Case('get_project_tasks[fields]',
+         lambda ctx, _: must(S.get_project_tasks(PROJECT_ID, MEMBER, 50, None, ('id', 'title', 'status')))),
+    Case('create_task', lambda ctx, _: must(S.create_task(PROJECT_ID, {'title': unique('t')}, MEMBER))),
+    Case('update_task', lambda ctx, _: must(S.update_task(1, {'status': 'done'}, MEMBER))),
+    Case('delete_task', lambda ctx, task_id: must(S.delete_task(task_id, MEMBER)), new_task),
+    Case('batch_tasks', lambda ctx, ops: must(S.batch_tasks(PROJECT_ID, ops, MEMBER)), batch_operations),
+    Case('import_tasks[200 rows]', lambda ctx, _: must(S.import_tasks(
+        PROJECT_ID, read_rows(io.BytesIO(IMPORT_CSV), 'csv'), MEMBER, batch_size=100)['created'])),
+    Case('get_user_tasks', lambda ctx, _: must(S.get_user_tasks(MEMBER))),
+    Case('get_user_tasks[page]', lambda ctx, _: must(S.get_user_tasks(MEMBER, 50))),
+    Case('get_user_tasks[filtered]', lambda ctx, _: must(S.get_user_tasks(
+        MEMBER, 50, None, None, {'priority': ['high'], 'status': ['todo', 'in_progress']},
+        [('priority_rank', True), ('due_date', False), ('id', False)]))),
+
+    # Members
+    Case('get_project_members', lambda ctx, _: must(S.get_project_members(PROJECT_ID, MEMBER))),
+    Case('get_all_project_members', lambda ctx, _: must(S.get_all_project_members(PROJECT_ID, MEMBER))),
+    Case('add_project_member',
+         lambda ctx, uid: must(S.add_project_member(PROJECT_ID, uid, 'member', OWNER)),
+         lambda ctx: ctx.insert('users', id=f'00000000-0000-4000-9000-{next(_counter):012d}',
+                                email=unique('u'))['id']),
+    Case('add_project_member_by_details',
+         lambda ctx, _: must(S.add_project_member_by_details(PROJECT_ID, 'New', 'new@example.com', 'member', OWNER))),
+    Case('update_project_member', lambda ctx, uid: must(S.update_project_member(PROJECT_ID, uid, 'admin', OWNER)),
+         new_member),
+    Case('remove_project_member', lambda ctx, uid: must(S.remove_project_member(PROJECT_ID, uid, OWNER)),
+         new_member),
+    Case('add_guest_member',
+         lambda ctx, _: must(S.add_guest_member(PROJECT_ID, 'Guest', unique('g') + '@example.com', 'member', OWNER))),
+    Case('update_guest_member', lambda ctx, gid: must(S.update_guest_member(PROJECT_ID, gid, 'admin', OWNER)),
+         new_guest),
+    Case('remove_guest_member', lambda ctx, gid: must(S.remove_guest_member(PROJECT_ID, gid, OWNER)), new_guest),
+
+    # Files
+    Case('upload_file', lambda ctx, _: must(S.upload_file(PROJECT_ID, {
+        'filename': 'bench.pdf', 'file_path': f"1/{unique('u')}.pdf", 'file_size': 2048
+    }, MEMBER))),
+    Case('create_upload_session', lambda ctx, _: must(S.create_upload_session(PROJECT_ID, {
+        'filename': 'bench.pdf', 'file_size': 2048
+    }, MEMBER))),
+    Case('upload_file[session]', lambda ctx, sid: must(S.upload_file(PROJECT_ID, {'session_id': sid}, MEMBER)),
+         new_upload),
+    Case('get_project_files', lambda ctx, _: must(S.get_project_files(PROJECT_ID, MEMBER))),
+    Case('get_project_files[page]', lambda ctx, _: must(S.get_project_files(PROJECT_ID, MEMBER, 20))),
+    Case('delete_file', lambda ctx, file_id: must(S.delete_file(file_id, OWNER)), new_file),
+
+    # Export
+    Case('export_project', lambda ctx, _: must(sum(1 for _ in S.export_project(PROJECT_ID, MEMBER)))),
+    Case('read_stored_file', lambda ctx, _: must(b''.join(S.read_stored_file(PROJECT_ID, '1/bench.pdf')))),
+
+    # Background jobs
+    Case('get_job', lambda ctx, job_id: must(S.get_job(job_id, MEMBER)), new_job),
+    Case('jobs.run_pending[10 storage.remove]', lambda ctx, _: must(S.get_jobs().run_pending()), queued_removals),
+
+    # Realtime fan-out
+    Case('events.publish[100 subscribers]',
+         lambda ctx, _: must(S.get_events().publish(PROJECT_ID, 'task.updated', {'id': 1, 'status': 'done'})),
+         subscribers(100)),
+
+    # Async data path
+    Case('async.get_project_role', lambda ctx, _: must(A.run(A.get_project_role(PROJECT_ID, MEMBER)))),
+    Case('async.get_reader_role', lambda ctx, _: must(A.run(A.get_reader_role(2, OUTSIDER, email(OUTSIDER))))),
+    Case('async.get_projects', lambda ctx, _: must(A.run(A.get_projects(MEMBER)))),
+    Case('async.get_projects[miss]', lambda ctx, _: must(A.run(A.get_projects(MEMBER, None, email(MEMBER)))),
+         forget_projects),
+    Case('async.call_function',
+         lambda ctx, _: A.run(A.call_function('project_rollups', {'project_ids': [PROJECT_ID]}))),
+    Case('search', lambda ctx, _: must(S.search(MEMBER, 'task 1', email(MEMBER)))),
+    Case('search[page]', lambda ctx, _: must(S.search(MEMBER, 'benchmark', email(MEMBER), ['task'], 50))),
+    Case('async.get_all_project_members',
+         lambda ctx, _: must(A.run(A.get_all_project_members(PROJECT_ID, MEMBER)))),
+]
+
+
+def route(method: str, path: str, json=None, user: str = MEMBER, setup=None, name: str = None,
+          data: bytes = None, content_type: str = None, headers=None):
+    """Case issuing one request through the Flask test client; path may contain {id} from setup
+    and json and headers may be functions of it (or data is sent as the raw body)"""
+    def run(ctx, arg):
+        body = json(arg) if callable(json) else json
+        extra = headers(arg) if callable(headers) else headers
+        response = ctx.client.open(path.format(id=arg), method=method, json=body, data=data,
+                                   content_type=content_type, headers={**ctx.headers(user), **(extra or {})})
+        if response.status_code >= 400:
+            raise BenchmarkError(f'{method} {path} -> {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        if response.is_streamed:
+            response.get_data()
+        return response
+
+    return Case(name or f'{method} {path}', run, setup)
+
+
+ROUTE_CASES = [
+    route('GET', '/health'),
+    route('GET', '/metrics'),
+    route('GET', '/api/auth/verify'),
+    route('GET', '/api/auth/me'),
+
+    route('GET', '/api/projects'),
+    route('POST', '/api/projects', {'name': 'Bench project'}, user=OWNER),
+    route('GET', f'/api/projects/{PROJECT_ID}'),
+    route('GET', f'/api/projects/{PROJECT_ID}/stats'),
+    route('PUT', f'/api/projects/{PROJECT_ID}', {'description': 'updated'}, user=OWNER),
+    route('DELETE', '/api/projects/{id}', user=OWNER, setup=new_project),
+    route('GET', f'/api/projects/{PROJECT_ID}/export'),
+    route('GET', f'/api/projects/{PROJECT_ID}/export?format=zip', name='GET /api/projects/1/export[zip]'),
+    route('DELETE', '/api/projects/{id}', user=OWNER, setup=new_project_with_files,
+          name='DELETE /api/projects/{id}[500 files]'),
+
+    route('GET', '/api/dashboard'),
+    route('GET', '/api/search?q=task', name='GET /api/search'),
+    route('GET', '/api/jobs/{id}', setup=new_job),
+
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks', setup=forget_tasks, name='GET /api/projects/1/tasks[miss]'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks?limit=50', name='GET /api/projects/1/tasks[page]'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks', headers=lambda tag: {'If-None-Match': tag},
+          setup=current_etag(f'/api/projects/{PROJECT_ID}/tasks'), name='GET /api/projects/1/tasks[304]'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks', headers=lambda tag: {'If-None-Match': tag},
+          setup=current_etag(f'/api/projects/{PROJECT_ID}/tasks', cold=True), name='GET /api/projects/1/tasks[304,miss]'),
+    route('GET', '/api/projects/2/tasks', user=OUTSIDER, name='GET /api/projects/2/tasks[guest]'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks?priority=high&overdue=true&sort=due_date&limit=50',
+          name='GET /api/projects/1/tasks[filtered]'),
+    route('GET', f'/api/projects/{PROJECT_ID}/tasks?since={{id}}', setup=recent_cursor,
+          name='GET /api/projects/1/tasks[since]'),
+    route('POST', f'/api/projects/{PROJECT_ID}/tasks', {'title': 'Bench task'}),
+    route('POST', f'/api/projects/{PROJECT_ID}/tasks/batch', {'operations': [
+        {'op': 'create', 'data': {'title': 'Batch task'}} for _ in range(10)
+    ]}),
+    route('POST', f'/api/projects/{PROJECT_ID}/tasks/import', data=IMPORT_CSV, content_type='text/csv',
+          name='POST /api/projects/1/tasks/import[200 rows]'),
+    route('PUT', '/api/tasks/1', {'status': 'in_progress'}),
+    route('DELETE', '/api/tasks/{id}', setup=new_task),
+    route('GET', '/api/my-tasks'),
+
+    route('GET', f'/api/projects/{PROJECT_ID}/members'),
+    route('POST', f'/api/projects/{PROJECT_ID}/members', {'name': 'New', 'email': 'new@example.com'}, user=OWNER),
+    route('PUT', f'/api/projects/{PROJECT_ID}/members/{{id}}', {'role': 'admin'}, user=OWNER, setup=new_guest),
+    route('DELETE', f'/api/projects/{PROJECT_ID}/members/{{id}}', user=OWNER, setup=new_guest),
+
+    route('GET', f'/api/projects/{PROJECT_ID}/files'),
+    route('POST', f'/api/projects/{PROJECT_ID}/files',
+          {'filename': 'bench.pdf', 'file_path': '1/bench.pdf', 'file_size': 2048}),
+    route('POST', f'/api/projects/{PROJECT_ID}/uploads', {'filename': 'bench.pdf', 'file_size': 2048}),
+    route('POST', f'/api/projects/{PROJECT_ID}/files', lambda sid: {'session_id': sid}, setup=new_upload,
+          name='POST /api/projects/1/files[session]'),
+    route('DELETE', '/api/files/{id}', user=OWNER, setup=new_file),
+]
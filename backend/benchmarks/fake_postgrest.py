@@ -0,0 +1,720 @@
+"""
+Fake PostgREST - in-memory stand-in for the Supabase REST and storage APIs
+
+Implements the part of PostgREST the services use (select with embeds,
+filters, logic trees, ordering, limit/offset, insert/upsert/update/delete,
+rpc) plus a few /__admin endpoints to load data and read request counters.
+Every request can be delayed to simulate network latency.
+
+    python -m benchmarks.fake_postgrest --port 0 --latency-ms 2
+"""
+import argparse
+import itertools
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+# (table, column, referenced table, referenced column) - mirrors migrations/
+FOREIGN_KEYS = [
+    ('projects', 'created_by', 'users', 'id'),
+    ('project_members', 'project_id', 'projects', 'id'),
+    ('project_members', 'user_id', 'users', 'id'),
+    ('guest_members', 'project_id', 'projects', 'id'),
+    ('tasks', 'project_id', 'projects', 'id'),
+    ('tasks', 'assigned_to', 'users', 'id'),
+    ('tasks', 'created_by', 'users', 'id'),
+    ('files', 'project_id', 'projects', 'id'),
+    ('files', 'uploaded_by', 'users', 'id'),
+    ('task_deletions', 'project_id', 'projects', 'id'),
+    ('upload_sessions', 'project_id', 'projects', 'id'),
+    ('upload_sessions', 'user_id', 'users', 'id'),
+]
+
+# ON DELETE CASCADE: parent table -> [(child table, column)]
+CASCADES = {
+    'projects': [('project_members', 'project_id'), ('guest_members', 'project_id'),
+                 ('tasks', 'project_id'), ('files', 'project_id'), ('task_deletions', 'project_id'),
+                 ('upload_sessions', 'project_id')],
+}
+
+# Columns filled with now() on insert (and updated_at on update)
+TIMESTAMPS = {
+    'projects': ('created_at', 'updated_at'),
+    'tasks': ('created_at', 'updated_at'),
+    'files': ('uploaded_at',),
+    'project_members': ('created_at',),
+    'guest_members': ('created_at',),
+    'task_deletions': ('deleted_at',),
+    'upload_sessions': ('created_at',),
+}
+
+# Generated columns: table -> {column: fn(row)}
+PRIORITY_RANKS = {'low': 1, 'medium': 2, 'high': 3}
+GENERATED = {
+    'tasks': {'priority_rank': lambda row: PRIORITY_RANKS.get(row.get('priority'))},
+}
+
+# Database functions: name -> callable(store, params)
+RPCS = {}
+
+SELECT_ITEM = re.compile(r'^(?:(\w+)\s*:\s*)?(\w+)(?:!\w+)?\s*(?:\((.*)\))?$', re.S)
+
+
+def rpc(name):
+    """Register a fake database function"""
+    def register(fn):
+        RPCS[name] = fn
+        return fn
+    return register
+
+
+@rpc('project_rollups')
+def project_rollups(store, params):
+    """Mirror of migrations/0002_project_rollups.sql (overdue as in 0009_overdue_rule.sql)"""
+    today = time.strftime('%Y-%m-%d', time.gmtime())
+    emails = {user['id']: user.get('email') for user in store.tables.get('users', [])}
+    rows = []
+
+    for project_id in (int(value) for value in params['project_ids']):
+        tasks = [task for task in store.tables.get('tasks', []) if task['project_id'] == project_id]
+        counts = Counter(task['status'] for task in tasks)
+        members = sorted((m for m in store.tables.get('project_members', []) if m['project_id'] == project_id),
+                         key=lambda m: m['id'])
+        guests = sorted((g for g in store.tables.get('guest_members', []) if g['project_id'] == project_id),
+                        key=lambda g: g['id'])
+        member_emails = [emails.get(m['user_id']) for m in members] + [g.get('email') for g in guests]
+
+        rows.append({
+            'project_id': project_id,
+            'todo': counts['todo'],
+            'in_progress': counts['in_progress'],
+            'done': counts['done'],
+            'total_tasks': len(tasks),
+            'overdue': sum(1 for task in tasks
+                           if task['status'] != 'done' and task.get('due_date') and task['due_date'][:10] < today),
+            'member_count': len(member_emails),
+            'member_emails': member_emails[:3]
+        })
+
+    return rows
+
+
+@rpc('project_stats')
+def project_stats(store, params):
+    """Mirror of migrations/0010_project_stats.sql"""
+    project_id = int(params['p_project_id'])
+    now = time.time()
+    today = time.strftime('%Y-%m-%d', time.gmtime(now))
+    week = {time.strftime('%Y-%m-%d', time.gmtime(now - day * 86400)) for day in range(7)}
+    users = {user['id']: user for user in store.tables.get('users', [])}
+
+    tasks = [task for task in store.tables.get('tasks', []) if task['project_id'] == project_id]
+    members = sorted((m for m in store.tables.get('project_members', []) if m['project_id'] == project_id),
+                     key=lambda m: m['id'])
+    guests = [g for g in store.tables.get('guest_members', []) if g['project_id'] == project_id]
+    files = [f for f in store.tables.get('files', []) if f['project_id'] == project_id]
+
+    assigned = Counter(task['assigned_to'] for task in tasks if task.get('assigned_to'))
+    completed = Counter(task['assigned_to'] for task in tasks if task.get('assigned_to') and task['status'] == 'done')
+    created = Counter(task['created_at'][:10] for task in tasks if task.get('created_at'))
+
+    return {
+        'total_tasks': len(tasks),
+        'by_status': Counter(task['status'] for task in tasks),
+        'by_priority': Counter(task.get('priority') or 'medium' for task in tasks),
+        'overdue': sum(1 for task in tasks
+                       if task['status'] != 'done' and task.get('due_date') and task['due_date'][:10] < today),
+        'created_per_day': {day: count for day, count in created.items() if day in week},
+        'by_assignee': [
+            {
+                'user_id': m['user_id'],
+                **{k: users.get(m['user_id'], {}).get(k) for k in ('email', 'first_name', 'last_name')},
+                'tasks': assigned[m['user_id']],
+                'completed': completed[m['user_id']]
+            }
+            for m in members if m['role'] != 'owner' and assigned[m['user_id']]
+        ],
+        'member_count': sum(1 for m in members + guests if m['role'] != 'owner'),
+        'file_count': len(files),
+        'file_size': sum(f.get('file_size') or 0 for f in files)
+    }
+
+
+@rpc('user_projects')
+def user_projects(store, params):
+    """Mirror of migrations/0003_user_projects.sql"""
+    user_id = params['p_user_id']
+    email = (params.get('p_email') or '').lower()
+    grants = {}
+
+    for project in store.tables.get('projects', []):
+        if project['created_by'] == user_id:
+            grants[project['id']] = (0, 'owner', 'owner')
+    for member in store.tables.get('project_members', []):
+        if member['user_id'] == user_id:
+            grants.setdefault(member['project_id'], (1, member['role'], 'member'))
+    for guest in store.tables.get('guest_members', []):
+        if email and guest['email'] == email:
+            grants.setdefault(guest['project_id'], (2, guest['role'], 'guest'))
+
+    projects = {project['id']: project for project in store.tables.get('projects', [])}
+    return [
+        {'project': projects[project_id], 'role': role, 'source': source}
+        for project_id, (rank, role, source) in sorted(grants.items(), key=lambda item: (item[1][0], item[0]))
+        if project_id in projects
+    ]
+
+
+def search_words(text) -> list:
+    return [word for word in re.split(r'[^0-9a-z]+', (text or '').lower()) if word]
+
+
+@rpc('search_content')
+def search_content(store, params):
+    """Mirror of migrations/0011_search_scope.sql (rank: share of words matching a query prefix)"""
+    prefixes = search_words(params['p_query'])
+    types = params.get('p_types')
+    projects = {int(value) for value in params['p_project_ids']}
+
+    def rank(*texts):
+        words = [word for text in texts for word in search_words(text)]
+        if not prefixes or not all(any(word.startswith(p) for word in words) for p in prefixes):
+            return None
+        return sum(any(word.startswith(p) for p in prefixes) for word in words) / len(words)
+
+    sources = [
+        ('task', 'tasks', projects, 'title', 'description'),
+        ('file', 'files', projects, 'filename', None),
+        ('project', 'projects', projects, 'name', 'description'),
+    ]
+    hits = []
+
+    for kind, table, scope, title, body in sources:
+        if types and kind not in types:
+            continue
+        for row in store.tables.get(table, []):
+            project_id = row['id'] if kind == 'project' else row['project_id']
+            score = rank(row[title], row.get(body) if kind == 'task' else None)
+            if project_id in scope and score is not None:
+                snippet = ' '.join((row.get(body) or '').split()[:20]) if body else ''
+                hits.append({'type': kind, 'id': row['id'], 'project_id': project_id, 'title': row[title],
+                             'snippet': snippet or None, 'rank': score})
+
+    hits.sort(key=lambda hit: (-hit['rank'], hit['type'], hit['id']))
+    offset = params.get('p_offset', 0)
+    return hits[offset:offset + params.get('p_limit', 20)]
+
+
+@rpc('delete_project_files')
+def delete_project_files(store, params):
+    """Mirror of migrations/0008_project_purge.sql"""
+    project_id = int(params['p_project_id'])
+    project = next((row for row in store.tables.get('projects', []) if row['id'] == project_id), None)
+    if project is None:
+        return []
+
+    paths = {row['file_path'] for row in store.tables.get('files', []) if row['project_id'] == project_id}
+    paths.update(row['file_path'] for row in store.tables.get('upload_sessions', [])
+                 if row['project_id'] == project_id and not row.get('completed_at'))
+    store.delete('projects', project)
+    return sorted(paths)
+
+
+@rpc('finalize_upload')
+def finalize_upload(store, params):
+    """Mirror of migrations/0007_upload_sessions.sql (without the storage.objects check: no bytes are uploaded)"""
+    sessions = [session for session in store.tables.get('upload_sessions', [])
+                if session['id'] == params['p_session_id'] and session['project_id'] == int(params['p_project_id'])
+                and session['user_id'] == params['p_user_id']]
+    if not sessions:
+        return [{'status': 'not_found', 'file': None}]
+    session = sessions[0]
+
+    if session.get('completed_at'):
+        files = [row for row in store.tables.get('files', []) if row['id'] == session.get('file_id')]
+        return [{'status': 'completed', 'file': files[0]}] if files else [{'status': 'not_found', 'file': None}]
+
+    if session['expires_at'] < now():
+        return [{'status': 'expired', 'file': None}]
+
+    project = next((row for row in store.tables.get('projects', []) if row['id'] == session['project_id']), None)
+    member = any(row['project_id'] == session['project_id'] and row['user_id'] == params['p_user_id']
+                 for row in store.tables.get('project_members', []))
+    if not project or (project['created_by'] != params['p_user_id'] and not member):
+        return [{'status': 'not_found', 'file': None}]
+
+    created = store.insert('files', {column: session[column] for column in
+                                     ('project_id', 'filename', 'file_path', 'file_size', 'file_type')}
+                           | {'uploaded_by': params['p_user_id']})
+    session.update(file_id=created['id'], completed_at=now())
+    return [{'status': 'created', 'file': created}]
+
+
+def now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime()) + f'.{time.time_ns() // 1000 % 1000000:06d}+00:00'
+
+
+def split_top_level(text: str) -> list:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, escaped, start = [], 0, False, False, 0
+
+    for i, char in enumerate(text):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(text[start:i])
+            start = i + 1
+
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+
+def coerce(current, value: str):
+    """Convert a query-string value to the type of the stored value"""
+    if isinstance(current, bool):
+        return value == 'true'
+    if isinstance(current, int):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(current, float):
+        return float(value)
+    return value
+
+
+def compare(operator: str, current, raw: str) -> bool:
+    if operator == 'is':
+        return {'null': current is None, 'true': current is True, 'false': current is False}[raw.lower()]
+
+    if operator == 'in':
+        values = [unquote(v) for v in split_top_level(raw.strip()[1:-1])]
+        return current is not None and current in [coerce(current, v) for v in values]
+
+    if current is None:
+        return False
+
+    value = coerce(current, unquote(raw))
+
+    if operator in ('like', 'ilike'):
+        pattern = '^' + re.escape(str(value)).replace(r'\*', '.*').replace('%', '.*') + '$'
+        return re.match(pattern, str(current), re.I if operator == 'ilike' else 0) is not None
+
+    if operator in ('fts', 'plfts', 'phfts', 'wfts'):
+        words = [w for w in re.findall(r'\w+', str(value).lower()) if w not in ('and', 'or')]
+        return all(w in str(current).lower() for w in words)
+
+    return {
+        'eq': current == value, 'neq': current != value,
+        'gt': current > value, 'gte': current >= value,
+        'lt': current < value, 'lte': current <= value
+    }[operator]
+
+
+def column_filter(column: str, expression: str):
+    """Predicate for column=op.value (optionally not.op.value)"""
+    negate = expression.startswith('not.')
+    if negate:
+        expression = expression[4:]
+
+    operator, _, raw = expression.partition('.')
+    if operator in ('fts', 'plfts', 'phfts', 'wfts') and raw.startswith('('):
+        raw = raw.split(').', 1)[1]
+
+    def predicate(row):
+        return compare(operator, row.get(column), raw) != negate
+
+    return predicate
+
+
+def logic_tree(expression: str):
+    """Predicate for col.op.value, and(...), or(...) and their not. forms"""
+    negate = expression.startswith('not.') and expression[4:].startswith(('and(', 'or('))
+    if negate:
+        expression = expression[4:]
+
+    for kind, combine in (('and', all), ('or', any)):
+        if expression.startswith(kind + '('):
+            predicates = [logic_tree(item) for item in split_top_level(expression[len(kind) + 1:-1])]
+
+            def predicate(row, predicates=predicates, combine=combine):
+                return combine(p(row) for p in predicates) != negate
+
+            return predicate
+
+    column, _, rest = expression.partition('.')
+    return column_filter(column, rest)
+
+
+def relation(table: str, name: str):
+    """Resolve an embed like PostgREST: (target, local column, remote column, to_many)"""
+    for src, column, dst, dst_column in FOREIGN_KEYS:
+        if src == table and column == name:
+            return dst, column, dst_column, False
+
+    outgoing = [fk for fk in FOREIGN_KEYS if fk[0] == table and fk[2] == name]
+    incoming = [fk for fk in FOREIGN_KEYS if fk[0] == name and fk[2] == table]
+
+    if len(outgoing) == 1 and not incoming:
+        _, column, dst, dst_column = outgoing[0]
+        return dst, column, dst_column, False
+
+    if len(incoming) == 1 and not outgoing:
+        src, column, _, dst_column = incoming[0]
+        return src, dst_column, column, True
+
+    raise ValueError(f"Could not find a relationship between '{table}' and '{name}'")
+
+
+class Store:
+    """Tables, id sequence, request counters and storage objects"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.RLock()
+        self.requests = Counter()
+        self.storage = set()
+        # Functions answering like PostgREST does when they are not installed
+        self.disabled_functions = set()
+
+    def load(self, tables: dict):
+        """Replace all data; ids continue after the largest loaded id"""
+        with self.lock:
+            self.tables = {name: [self.generate(name, dict(row)) for row in rows] for name, rows in tables.items()}
+            top = max((row.get('id') for rows in self.tables.values() for row in rows
+                       if isinstance(row.get('id'), int)), default=0)
+            self.ids = itertools.count(top + 1)
+            self.storage.clear()
+            self.disabled_functions.clear()
+
+    def insert(self, table: str, row: dict) -> dict:
+        row = dict(row)
+        row.setdefault('id', next(self.ids))
+        stamp = now()
+        for column in TIMESTAMPS.get(table, ()):
+            row.setdefault(column, stamp)
+        self.tables.setdefault(table, []).append(self.generate(table, row))
+        return row
+
+    @staticmethod
+    def generate(table: str, row: dict) -> dict:
+        """Fill a row's generated columns"""
+        for column, fn in GENERATED.get(table, {}).items():
+            row[column] = fn(row)
+        return row
+
+    def delete(self, table: str, row: dict):
+        self.tables[table].remove(row)
+
+        if table == 'tasks':
+            # Trigger from migrations/0004_task_sync.sql
+            self.tables['task_deletions'] = [r for r in self.tables.get('task_deletions', [])
+                                             if r['task_id'] != row['id']]
+            self.insert('task_deletions', {'task_id': row['id'], 'project_id': row['project_id']})
+
+        for child_table, column in CASCADES.get(table, ()):
+            children = self.tables.get(child_table, [])
+            self.tables[child_table] = [r for r in children if r.get(column) != row['id']]
+
+    def project(self, table: str, row: dict, select: str, embedded_filters: dict, path: str = ''):
+        """Shape a row according to a select list"""
+        if not select or select == '*':
+            return dict(row)
+
+        out = {}
+        for item in split_top_level(select):
+            if item == '*':
+                out.update(row)
+                continue
+
+            match = SELECT_ITEM.match(item)
+            if not match:
+                raise ValueError(f'Unsupported select item: {item}')
+
+            label, name, inner = match.groups()
+
+            if inner is None:
+                out[label or name] = row.get(name)
+                continue
+
+            target, local, remote, to_many = relation(table, name)
+            key = f'{path}{name}'
+            predicates = embedded_filters.get(key, [])
+            related = [
+                r for r in self.tables.get(target, [])
+                if r.get(remote) == row.get(local) and all(p(r) for p in predicates)
+            ]
+            shaped = [self.project(target, r, inner, embedded_filters, key + '.') for r in related]
+            out[label or name] = shaped if to_many else (shaped[0] if shaped else None)
+
+        return out
+
+
+class Handler(BaseHTTPRequestHandler):
+    """HTTP front end for a Store"""
+
+    store: Store = None
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms per request
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body=None, headers=None):
+        data = b'' if body is None else json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        return json.loads(self._payload) if self._payload else None
+
+    def _handle(self, method: str):
+        # Always consume the body (postgrest-py sends one even with GET) so
+        # keep-alive connections stay in sync
+        self._payload = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        url = urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        params = parse_qsl(url.query, keep_blank_values=True)
+
+        try:
+            if parts[0] == '__admin':
+                return self._admin(method, parts[1])
+
+            if self.store.latency:
+                time.sleep(self.store.latency)
+
+            if parts[:2] == ['rest', 'v1']:
+                name = parts[3] if parts[2] == 'rpc' else parts[2]
+                self.store.requests[f"{method} {'rpc/' if parts[2] == 'rpc' else ''}{name}"] += 1
+
+                if parts[2] == 'rpc':
+                    if name not in RPCS or name in self.store.disabled_functions:
+                        return self._send(404, {'message': f'Could not find the function public.{name}',
+                                                'code': 'PGRST202', 'details': None, 'hint': None})
+                    with self.store.lock:
+                        return self._send(200, RPCS[name](self.store, self._body() or dict(params)))
+                return self._rest(method, name, params)
+
+            if parts[:2] == ['storage', 'v1']:
+                self.store.requests[f'{method} storage'] += 1
+                return self._storage(method, parts[2:])
+
+            return self._send(404, {'message': 'Not found'})
+        except Exception as e:
+            return self._send(400, {'message': str(e), 'code': 'FAKE', 'details': None, 'hint': None})
+
+    def _admin(self, method: str, action: str):
+        store = self.store
+
+        if action == 'load':
+            store.load(self._body())
+            return self._send(200, {'ok': True})
+
+        if action == 'insert':
+            body = self._body()
+            with store.lock:
+                return self._send(201, [store.insert(body['table'], row) for row in body['rows']])
+
+        if action == 'stats':
+            return self._send(200, {'total': sum(store.requests.values()), 'requests': dict(store.requests)})
+
+        if action == 'reset':
+            store.requests.clear()
+            return self._send(200, {'ok': True})
+
+        if action == 'functions':
+            store.disabled_functions = set(self._body()['disabled'])
+            return self._send(200, {'ok': True})
+
+        if action == 'latency':
+            store.latency = float(self._body()['seconds'])
+            return self._send(200, {'ok': True})
+
+        return self._send(404, {'message': f'Unknown admin action: {action}'})
+
+    def _storage(self, method: str, parts: list):
+        body = self._body() or {}
+
+        if method == 'DELETE' and parts[0] == 'object':
+            removed = list(body.get('prefixes', []))
+            self.store.storage.difference_update(removed)
+            return self._send(200, [{'name': path} for path in removed])
+
+        if method == 'POST' and parts[:2] == ['object', 'upload']:
+            return self._send(200, {'url': '/object/upload/sign/' + '/'.join(parts[3:]) + '?token=fake'})
+
+        return self._send(200, {})
+
+    def _rest(self, method: str, table: str, params: list):
+        store = self.store
+        select, order, limit, offset, on_conflict = None, None, None, 0, None
+        predicates, embedded_filters = [], {}
+
+        for key, value in params:
+            if key == 'select':
+                select = value
+            elif key == 'order':
+                order = value
+            elif key == 'limit':
+                limit = int(value)
+            elif key == 'offset':
+                offset = int(value)
+            elif key == 'on_conflict':
+                on_conflict = value
+            elif key == 'columns':
+                continue
+            elif key in ('or', 'and', 'not.or', 'not.and'):
+                predicates.append(logic_tree(key + value))
+            elif '.' in key:
+                prefix, _, column = key.rpartition('.')
+                embedded_filters.setdefault(prefix, []).append(column_filter(column, value))
+            else:
+                predicates.append(column_filter(key, value))
+
+        prefer = self.headers.get('Prefer', '')
+
+        with store.lock:
+            rows = store.tables.setdefault(table, [])
+            matched = [row for row in rows if all(p(row) for p in predicates)]
+
+            if method in ('GET', 'HEAD'):
+                for spec in reversed((order or '').split(',') if order else []):
+                    column, *flags = spec.split('.')
+                    desc = 'desc' in flags
+                    nulls_first = 'nullsfirst' in flags or ('nullslast' not in flags and desc)
+                    present = sorted((r for r in matched if r.get(column) is not None),
+                                     key=lambda r: r[column], reverse=desc)
+                    missing = [r for r in matched if r.get(column) is None]
+                    matched = missing + present if nulls_first else present + missing
+
+                total = len(matched)
+                matched = matched[offset:]
+                if limit is not None:
+                    matched = matched[:limit]
+
+                headers = {}
+                if 'count=' in prefer:
+                    headers['Content-Range'] = f'{offset}-{offset + len(matched) - 1}/{total}'
+
+                out = [store.project(table, row, select, embedded_filters) for row in matched]
+
+                if self.headers.get('Accept') == 'application/vnd.pgrst.object+json':
+                    if len(out) != 1:
+                        return self._send(406, {'message': 'JSON object requested, multiple (or no) rows returned',
+                                                'code': 'PGRST116', 'details': None, 'hint': None})
+                    return self._send(200, out[0], headers)
+
+                return self._send(200, out, headers)
+
+            if method == 'POST':
+                body = self._body()
+                out = []
+
+                for item in body if isinstance(body, list) else [body]:
+                    existing = None
+                    if 'resolution=merge-duplicates' in prefer:
+                        key = on_conflict or 'id'
+                        existing = next((r for r in rows if item.get(key) is not None
+                                         and r.get(key) == item.get(key)), None)
+
+                    if existing is not None:
+                        existing.update(item)
+                        store.generate(table, existing)
+                        if 'updated_at' in TIMESTAMPS.get(table, ()):
+                            existing['updated_at'] = now()
+                        out.append(existing)
+                    else:
+                        out.append(store.insert(table, item))
+
+                return self._send(201, [store.project(table, row, select, {}) for row in out])
+
+            if method == 'PATCH':
+                body = self._body()
+                for row in matched:
+                    row.update(body)
+                    store.generate(table, row)
+                    if 'updated_at' in TIMESTAMPS.get(table, ()):
+                        row['updated_at'] = now()
+                return self._send(200, [store.project(table, row, select, {}) for row in matched])
+
+            if method == 'DELETE':
+                out = [store.project(table, row, select, {}) for row in matched]
+                for row in matched:
+                    store.delete(table, row)
+                return self._send(200, out)
+
+        return self._send(405, {'message': f'Method {method} not allowed'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_HEAD(self):
+        self._handle('HEAD')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+def serve(port: int = 0, latency: float = 0.0):
+    """Start the server on a background thread; returns (server, store, base_url)"""
+    store = Store(latency)
+    handler = type('FakePostgrestHandler', (Handler,), {'store': store})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, store, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-memory fake of the Supabase REST API')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, _, url = serve(args.port, args.latency_ms / 1000)
+
+    # The first line of output tells the parent process where to connect
+    print(url, flush=True)
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark fixtures - deterministic dataset, tokens and the fake server process
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.request import ProxyHandler, Request, build_opener
+import jwt
+
+JWT_SECRET = 'benchmark-jwt-secret-' + 'x' * 16
+
+# Well-known users: OWNER created project 1, MEMBER belongs to it, OUTSIDER does not
+OWNER = '00000000-0000-4000-8000-000000000001'
+MEMBER = '00000000-0000-4000-8000-000000000002'
+OUTSIDER = '00000000-0000-4000-8000-000000000003'
+
+PROJECT_ID = 1
+
+# Talk to the local fake directly, whatever proxy the environment configures
+_opener = build_opener(ProxyHandler({}))
+
+STATUSES = ('todo', 'in_progress', 'done')
+PRIORITIES = ('low', 'medium', 'high')
+
+
+def email(uid: str) -> str:
+    """Email claim in the token of a user"""
+    return f'{uid[-4:]}@example.com'
+
+
+def user_id(n: int) -> str:
+    return f'00000000-0000-4000-8000-{n:012d}'
+
+
+def token(uid: str) -> str:
+    """Signed access token for a user, valid for an hour"""
+    return jwt.encode({
+        'sub': uid,
+        'email': email(uid),
+        'aud': 'authenticated',
+        'role': 'authenticated',
+        'exp': int(time.time()) + 3600
+    }, JWT_SECRET, algorithm='HS256')
+
+
+def service_key() -> str:
+    return jwt.encode({'role': 'service_role'}, JWT_SECRET, algorithm='HS256')
+
+
+def dataset(tasks: int = 200, files: int = 50, members: int = 10, projects: int = 10) -> dict:
+    """Build the benchmark tables.
+
+    Project 1 is owned by OWNER and has MEMBER plus `members` other members,
+    `tasks` tasks and `files` files. OWNER also owns `projects` - 1 small
+    projects that MEMBER belongs to, so per-user listings have some width.
+    """
+    users = [
+        {'id': user_id(n), 'email': f'user{n}@example.com', 'first_name': f'User{n}', 'last_name': 'Bench'}
+        for n in range(1, members + 4)
+    ]
+
+    project_rows, member_rows, task_rows, file_rows = [], [], [], []
+
+    for pid in range(1, projects + 1):
+        project_rows.append({
+            'id': pid, 'name': f'Project {pid}', 'description': 'Benchmark project',
+            'status': 'active', 'start_date': '2026-01-01', 'end_date': None,
+            'created_by': OWNER,
+            'created_at': f'2026-01-{pid % 28 + 1:02d}T00:00:00+00:00',
+            'updated_at': f'2026-01-{pid % 28 + 1:02d}T00:00:00+00:00'
+        })
+        member_rows.append({'id': pid, 'project_id': pid, 'user_id': MEMBER, 'role': 'member'})
+
+    for n in range(members):
+        member_rows.append({
+            'id': projects + n + 1, 'project_id': PROJECT_ID,
+            'user_id': user_id(n + 4), 'role': 'admin' if n == 0 else 'member'
+        })
+
+    guest_rows = [
+        {'id': n, 'project_id': PROJECT_ID, 'name': f'Guest {n}', 'email': f'guest{n}@example.com', 'role': 'member'}
+        for n in range(1, 4)
+    ]
+    # OUTSIDER is a guest of project 2 (by email)
+    guest_rows.append({'id': 4, 'project_id': 2, 'name': 'Outsider', 'email': email(OUTSIDER), 'role': 'member'})
+
+    for n in range(1, tasks + 1):
+        task_rows.append({
+            'id': n, 'project_id': PROJECT_ID, 'title': f'Task {n}',
+            'description': 'Benchmark task ' * 4,
+            'status': STATUSES[n % 3], 'priority': PRIORITIES[n % 3],
+            'assigned_to': MEMBER if n % 2 else user_id(4 + n % max(members, 1)),
+            'due_date': f'2026-{n % 12 + 1:02d}-15' if n % 4 else None,
+            'created_by': OWNER,
+            'created_at': f'2026-02-{n % 28 + 1:02d}T{n % 24:02d}:00:00+00:00',
+            'updated_at': f'2026-02-{n % 28 + 1:02d}T{n % 24:02d}:00:00+00:00'
+        })
+
+    for n in range(1, files + 1):
+        file_rows.append({
+            'id': n, 'project_id': PROJECT_ID, 'filename': f'file{n}.pdf',
+            'file_path': f'{PROJECT_ID}/file{n}.pdf', 'file_size': 1024 * n,
+            'file_type': 'application/pdf', 'uploaded_by': OWNER if n % 2 else MEMBER,
+            'uploaded_at': f'2026-03-{n % 28 + 1:02d}T00:00:00+00:00'
+        })
+
+    return {
+        'users': users,
+        'projects': project_rows,
+        'project_members': member_rows,
+        'guest_members': guest_rows,
+        'tasks': task_rows,
+        'files': file_rows
+    }
+
+
+class FakeServer:
+    """Fake PostgREST running in a child process (keeps its allocations out of tracemalloc)"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.fake_postgrest', '--latency-ms', str(latency_ms)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            text=True
+        )
+        self.url = self.process.stdout.readline().strip()
+
+        if not self.url.startswith('http'):
+            self.close()
+            raise RuntimeError('Fake PostgREST did not start')
+
+    def _call(self, action: str, body=None):
+        data = None if body is None else json.dumps(body).encode()
+        request = Request(f'{self.url}/__admin/{action}', data=data, method='POST' if data else 'GET',
+                          headers={'Content-Type': 'application/json'})
+        with _opener.open(request) as response:
+            return json.loads(response.read())
+
+    def load(self, tables: dict):
+        self._call('load', tables)
+
+    def insert(self, table: str, rows: list) -> list:
+        return self._call('insert', {'table': table, 'rows': rows})
+
+    def disable_functions(self, names):
+        """Make rpc() calls to these functions fail as if they were not installed (until the next load)"""
+        self._call('functions', {'disabled': list(names)})
+
+    def stats(self) -> dict:
+        return self._call('stats')
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait(timeout=5)
@@ -0,0 +1,74 @@
+-- Base schema used by the API.
+--
+-- On Supabase these tables already exist; this file documents them and lets
+-- the direct Postgres engine (DB_ENGINE=postgres) run against a plain local
+-- database: psql "$DATABASE_URL" -f migrations/0001_base_schema.sql
+
+CREATE TABLE IF NOT EXISTS users (
+    id uuid PRIMARY KEY,
+    email text NOT NULL UNIQUE,
+    first_name text,
+    last_name text,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id bigserial PRIMARY KEY,
+    name text NOT NULL,
+    description text,
+    status text NOT NULL DEFAULT 'active',
+    start_date date,
+    end_date date,
+    created_by uuid NOT NULL REFERENCES users (id),
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS project_members (
+    id bigserial PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    role text NOT NULL DEFAULT 'member',
+    created_at timestamptz NOT NULL DEFAULT now(),
+    UNIQUE (project_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS guest_members (
+    id bigserial PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    name text,
+    email text NOT NULL,
+    role text NOT NULL DEFAULT 'member',
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id bigserial PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    title text NOT NULL,
+    description text DEFAULT '',
+    status text NOT NULL DEFAULT 'todo',
+    assigned_to uuid REFERENCES users (id) ON DELETE SET NULL,
+    due_date date,
+    priority text NOT NULL DEFAULT 'medium',
+    created_by uuid REFERENCES users (id),
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    id bigserial PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    filename text NOT NULL,
+    file_path text NOT NULL,
+    file_size bigint NOT NULL DEFAULT 0,
+    file_type text,
+    uploaded_by uuid REFERENCES users (id),
+    uploaded_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS project_members_user_id_idx ON project_members (user_id);
+CREATE INDEX IF NOT EXISTS guest_members_project_id_idx ON guest_members (project_id);
+CREATE INDEX IF NOT EXISTS tasks_project_id_idx ON tasks (project_id);
+CREATE INDEX IF NOT EXISTS tasks_assigned_to_idx ON tasks (assigned_to);
+CREATE INDEX IF NOT EXISTS files_project_id_idx ON files (project_id);
@@ -0,0 +1,64 @@
+-- Per-project rollups for the dashboard (GET /api/dashboard).
+--
+-- One grouped query answers task counts by status, overdue tasks and member
+-- counts for any number of projects. Without this function the API falls
+-- back to grouping plain rows in Python (still a fixed number of queries).
+
+CREATE OR REPLACE FUNCTION project_rollups(project_ids bigint[])
+RETURNS TABLE (
+    project_id bigint,
+    todo bigint,
+    in_progress bigint,
+    done bigint,
+    total_tasks bigint,
+    overdue bigint,
+    member_count bigint,
+    member_emails text[]
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        ids.id,
+        coalesce(t.todo, 0),
+        coalesce(t.in_progress, 0),
+        coalesce(t.done, 0),
+        coalesce(t.total, 0),
+        coalesce(t.overdue, 0),
+        coalesce(m.member_count, 0),
+        coalesce(m.emails[1:3], '{}')
+    FROM unnest(project_ids) AS ids (id)
+    LEFT JOIN (
+        SELECT
+            tk.project_id,
+            count(*) FILTER (WHERE tk.status = 'todo') AS todo,
+            count(*) FILTER (WHERE tk.status = 'in_progress') AS in_progress,
+            count(*) FILTER (WHERE tk.status = 'done') AS done,
+            count(*) AS total,
+            -- Same rule as the project statistics: due before now and not done
+            count(*) FILTER (WHERE tk.status <> 'done' AND tk.due_date < now()) AS overdue
+        FROM tasks AS tk
+        WHERE tk.project_id = ANY (project_ids)
+        GROUP BY tk.project_id
+    ) AS t ON t.project_id = ids.id
+    LEFT JOIN (
+        SELECT
+            mb.project_id,
+            count(*) AS member_count,
+            array_agg(mb.email ORDER BY mb.kind, mb.id) AS emails
+        FROM (
+            SELECT pm.project_id, pm.id, 0 AS kind, u.email
+            FROM project_members AS pm
+            LEFT JOIN users AS u ON u.id = pm.user_id
+            WHERE pm.project_id = ANY (project_ids)
+            UNION ALL
+            SELECT g.project_id, g.id, 1 AS kind, g.email
+            FROM guest_members AS g
+            WHERE g.project_id = ANY (project_ids)
+        ) AS mb
+        GROUP BY mb.project_id
+    ) AS m ON m.project_id = ids.id
+$$;
+
+-- Let PostgREST pick up the new function
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,40 @@
+-- Per-user project index (GET /api/projects, GET /api/dashboard).
+--
+-- Returns every project a user can see - created, member and guest (matched
+-- by email) - once, with the effective role, in a single query. Without this
+-- function the API runs the three lookups as separate queries.
+
+CREATE INDEX IF NOT EXISTS projects_created_by_idx ON projects (created_by);
+CREATE INDEX IF NOT EXISTS guest_members_email_idx ON guest_members (email);
+
+CREATE OR REPLACE FUNCTION user_projects(p_user_id uuid, p_email text DEFAULT NULL)
+RETURNS TABLE (project jsonb, role text, source text)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT to_jsonb(p), g.role, g.source
+    FROM (
+        -- Strongest grant per project: owner, then member, then guest
+        SELECT DISTINCT ON (grants.project_id) grants.project_id, grants.role, grants.source, grants.rank
+        FROM (
+            SELECT pr.id AS project_id, 'owner' AS role, 'owner' AS source, 0 AS rank
+            FROM projects AS pr
+            WHERE pr.created_by = p_user_id
+            UNION ALL
+            SELECT pm.project_id, pm.role, 'member', 1
+            FROM project_members AS pm
+            WHERE pm.user_id = p_user_id
+            UNION ALL
+            -- Guest emails are stored lowercased
+            SELECT gm.project_id, gm.role, 'guest', 2
+            FROM guest_members AS gm
+            WHERE gm.email = lower(p_email)
+        ) AS grants
+        ORDER BY grants.project_id, grants.rank
+    ) AS g
+    JOIN projects AS p ON p.id = g.project_id
+    ORDER BY g.rank, p.id
+$$;
+
+-- Let PostgREST pick up the new function
+NOTIFY pgrst, 'reload schema';
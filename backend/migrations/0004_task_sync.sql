@@ -0,0 +1,57 @@
+-- Task delta sync (GET /api/projects/<id>/tasks?since=<cursor>).
+--
+-- Keeps tasks.updated_at current on every update and records deleted task
+-- ids in task_deletions, so clients can ask for what changed since their
+-- last sync instead of reloading the whole list. Tombstones are kept for
+-- 30 days (TASK_SYNC_RETENTION_DAYS must not be larger); clients with an
+-- older cursor get the full list again.
+
+CREATE TABLE IF NOT EXISTS task_deletions (
+    task_id bigint PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    deleted_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS task_deletions_project_id_deleted_at_idx ON task_deletions (project_id, deleted_at);
+CREATE INDEX IF NOT EXISTS tasks_project_id_updated_at_idx ON tasks (project_id, updated_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS tasks_touch_updated_at ON tasks;
+CREATE TRIGGER tasks_touch_updated_at
+    BEFORE UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE OR REPLACE FUNCTION record_task_deletion()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Tasks removed along with their project need no tombstone
+    IF EXISTS (SELECT 1 FROM projects WHERE id = OLD.project_id) THEN
+        INSERT INTO task_deletions (task_id, project_id)
+        VALUES (OLD.id, OLD.project_id)
+        ON CONFLICT (task_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+
+        DELETE FROM task_deletions
+        WHERE project_id = OLD.project_id AND deleted_at < now() - interval '30 days';
+    END IF;
+    RETURN OLD;
+END
+$$;
+
+DROP TRIGGER IF EXISTS tasks_record_deletion ON tasks;
+CREATE TRIGGER tasks_record_deletion
+    AFTER DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION record_task_deletion();
+
+-- Let PostgREST pick up the new table
+NOTIFY pgrst, 'reload schema';
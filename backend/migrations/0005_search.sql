@@ -0,0 +1,97 @@
+-- Full-text search (GET /api/search).
+--
+-- Task titles and descriptions, file names and project names are indexed as
+-- tsvectors; search_content() ranks matches within the projects the API
+-- passes in (those the caller can access). Every query word matches as a
+-- prefix, so "proj rep" finds "Project report.pdf". Without this migration
+-- the search endpoint answers 503.
+
+-- Words split on anything but letters and digits ("q3_report.pdf" -> q3 report pdf)
+CREATE OR REPLACE FUNCTION search_vector(content text, weight "char" DEFAULT 'A')
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT setweight(to_tsvector('simple', regexp_replace(coalesce(content, ''), '[^[:alnum:]]+', ' ', 'g')), weight)
+$$;
+
+CREATE OR REPLACE FUNCTION task_search_vector(title text, description text)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT search_vector(title, 'A') || search_vector(description, 'B')
+$$;
+
+CREATE INDEX IF NOT EXISTS tasks_search_idx ON tasks USING gin (task_search_vector(title, description));
+CREATE INDEX IF NOT EXISTS files_search_idx ON files USING gin (search_vector(filename));
+CREATE INDEX IF NOT EXISTS projects_search_idx ON projects USING gin (search_vector(name));
+
+-- Every word of a search box query as a prefix, all required; NULL when it has no words
+CREATE OR REPLACE FUNCTION search_query(query text)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT to_tsquery('simple', string_agg(quote_literal(word) || ':*', ' & '))
+    FROM regexp_split_to_table(lower(query), '[^[:alnum:]]+') AS word
+    WHERE word <> ''
+$$;
+
+CREATE OR REPLACE FUNCTION search_content(
+    p_query text,
+    p_project_ids bigint[],
+    p_types text[] DEFAULT NULL,
+    p_limit integer DEFAULT 20,
+    p_offset integer DEFAULT 0
+)
+RETURNS TABLE (type text, id bigint, project_id bigint, title text, snippet text, rank real)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (
+        SELECT search_query(p_query) AS tsq
+    ),
+    hits AS (
+        -- Only in p_project_ids, the projects the caller can read
+        SELECT 'task' AS type, t.id, t.project_id, t.title, t.description AS body,
+               ts_rank_cd(task_search_vector(t.title, t.description), q.tsq) AS rank
+        FROM tasks AS t, q
+        WHERE (p_types IS NULL OR 'task' = ANY (p_types))
+          AND t.project_id = ANY (p_project_ids)
+          AND task_search_vector(t.title, t.description) @@ q.tsq
+        UNION ALL
+        SELECT 'file', f.id, f.project_id, f.filename, NULL,
+               ts_rank_cd(search_vector(f.filename), q.tsq)
+        FROM files AS f, q
+        WHERE (p_types IS NULL OR 'file' = ANY (p_types))
+          AND f.project_id = ANY (p_project_ids)
+          AND search_vector(f.filename) @@ q.tsq
+        UNION ALL
+        SELECT 'project', p.id, p.id, p.name, p.description,
+               ts_rank_cd(search_vector(p.name), q.tsq)
+        FROM projects AS p, q
+        WHERE (p_types IS NULL OR 'project' = ANY (p_types))
+          AND p.id = ANY (p_project_ids)
+          AND search_vector(p.name) @@ q.tsq
+    ),
+    page AS (
+        SELECT * FROM hits
+        ORDER BY rank DESC, type, id
+        LIMIT p_limit OFFSET p_offset
+    )
+    -- Excerpts only for the returned page
+    SELECT page.type, page.id, page.project_id, page.title,
+           CASE WHEN coalesce(page.body, '') <> '' THEN
+               ts_headline('simple', page.body, q.tsq, 'MaxFragments=1, MaxWords=20, MinWords=5, StartSel="", StopSel=""')
+           END,
+           page.rank
+    FROM page, q
+    ORDER BY page.rank DESC, page.type, page.id
+$$;
+
+-- Let PostgREST pick up the new functions
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,29 @@
+-- Task filtering and sorting (GET /api/projects/<id>/tasks, GET /api/my-tasks).
+--
+-- ?status=, ?priority=, ?assigned_to=, ?due_after=/?due_before= and
+-- ?overdue= become PostgREST filters; ?sort= becomes its ORDER BY. The
+-- composite indexes below serve the common combinations within a project
+-- (and across projects for a user's assigned tasks) without reading the
+-- project's whole task list. priority_rank lets ?sort=priority order
+-- low < medium < high instead of alphabetically.
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS priority_rank smallint
+    GENERATED ALWAYS AS (CASE priority WHEN 'low' THEN 1 WHEN 'medium' THEN 2 WHEN 'high' THEN 3 END) STORED;
+
+-- Default listing order (created_at, id) and its keyset pages
+CREATE INDEX IF NOT EXISTS tasks_project_created_idx ON tasks (project_id, created_at, id);
+-- Status columns, optionally narrowed or ordered by due date
+CREATE INDEX IF NOT EXISTS tasks_project_status_due_idx ON tasks (project_id, status, due_date);
+-- Priority filters and ?sort=-priority
+CREATE INDEX IF NOT EXISTS tasks_project_priority_idx ON tasks (project_id, priority_rank, due_date);
+-- An assignee's tasks in a project, by due date
+CREATE INDEX IF NOT EXISTS tasks_project_assignee_due_idx ON tasks (project_id, assigned_to, due_date);
+-- A user's tasks across projects (/my-tasks), by due date
+CREATE INDEX IF NOT EXISTS tasks_assigned_due_idx ON tasks (assigned_to, due_date);
+
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS tasks_project_id_idx;
+DROP INDEX IF EXISTS tasks_assigned_to_idx;
+
+-- Let PostgREST pick up the new column
+NOTIFY pgrst, 'reload schema';
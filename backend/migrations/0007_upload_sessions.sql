@@ -0,0 +1,108 @@
+-- Direct-to-storage uploads (POST /api/projects/<id>/uploads).
+--
+-- The API authorizes an upload and records it here with a signed upload
+-- token for its storage path; the browser then sends the bytes straight to
+-- Supabase Storage (one signed PUT, or resumable TUS chunks for large
+-- files). POST /api/projects/<id>/files {"session_id": ...} calls
+-- finalize_upload(), which checks the object arrived with the announced
+-- size and creates the files row exactly once. Without this migration the
+-- upload endpoints answer 503 and only the metadata-only POST works.
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id uuid PRIMARY KEY,
+    project_id bigint NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    user_id uuid NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    bucket text NOT NULL,
+    file_path text NOT NULL UNIQUE,
+    filename text NOT NULL,
+    file_size bigint NOT NULL CHECK (file_size > 0),
+    file_type text,
+    file_id bigint REFERENCES files (id) ON DELETE SET NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    expires_at timestamptz NOT NULL,
+    completed_at timestamptz
+);
+
+-- Abandoned uploads, oldest first (their objects can be removed from storage)
+CREATE INDEX IF NOT EXISTS upload_sessions_pending_idx ON upload_sessions (expires_at)
+    WHERE completed_at IS NULL;
+
+-- status: 'created' (files row inserted), 'completed' (already finalized;
+-- file is the existing row), 'not_found', 'expired', 'incomplete' (no
+-- object yet) or 'size_mismatch'
+CREATE OR REPLACE FUNCTION finalize_upload(p_session_id uuid, p_project_id bigint, p_user_id uuid)
+RETURNS TABLE (status text, file jsonb)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    s upload_sessions;
+    stored_size bigint;
+    created files;
+BEGIN
+    -- Lock the session so concurrent calls create one file
+    SELECT * INTO s FROM upload_sessions AS us
+    WHERE us.id = p_session_id AND us.project_id = p_project_id AND us.user_id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'not_found', NULL::jsonb;
+        RETURN;
+    END IF;
+
+    IF s.completed_at IS NOT NULL THEN
+        IF s.file_id IS NULL THEN
+            -- Finalized, then the file was deleted
+            RETURN QUERY SELECT 'not_found', NULL::jsonb;
+        ELSE
+            RETURN QUERY SELECT 'completed', to_jsonb(f) FROM files AS f WHERE f.id = s.file_id;
+        END IF;
+        RETURN;
+    END IF;
+
+    IF s.expires_at < now() THEN
+        RETURN QUERY SELECT 'expired', NULL::jsonb;
+        RETURN;
+    END IF;
+
+    -- The uploader must still be the owner or a member
+    IF NOT EXISTS (
+        SELECT 1 FROM projects AS p
+        WHERE p.id = s.project_id
+          AND (p.created_by = p_user_id
+               OR EXISTS (SELECT 1 FROM project_members AS m
+                          WHERE m.project_id = p.id AND m.user_id = p_user_id))
+    ) THEN
+        RETURN QUERY SELECT 'not_found', NULL::jsonb;
+        RETURN;
+    END IF;
+
+    -- Supabase Storage lists finished objects in storage.objects (a TUS
+    -- upload appears there once its last chunk is written)
+    IF to_regclass('storage.objects') IS NOT NULL THEN
+        EXECUTE 'SELECT (metadata->>''size'')::bigint FROM storage.objects WHERE bucket_id = $1 AND name = $2'
+            INTO stored_size USING s.bucket, s.file_path;
+
+        IF stored_size IS NULL THEN
+            RETURN QUERY SELECT 'incomplete', NULL::jsonb;
+            RETURN;
+        END IF;
+
+        IF stored_size <> s.file_size THEN
+            RETURN QUERY SELECT 'size_mismatch', NULL::jsonb;
+            RETURN;
+        END IF;
+    END IF;
+
+    INSERT INTO files (project_id, filename, file_path, file_size, file_type, uploaded_by)
+    VALUES (s.project_id, s.filename, s.file_path, s.file_size, s.file_type, p_user_id)
+    RETURNING * INTO created;
+
+    UPDATE upload_sessions SET file_id = created.id, completed_at = now() WHERE id = s.id;
+
+    RETURN QUERY SELECT 'created', to_jsonb(created);
+END
+$$;
+
+-- Let PostgREST pick up the new table and function
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,30 @@
+-- Storage purge on project deletion (DELETE /api/projects/<id>).
+--
+-- delete_project_files() deletes a project (its tasks, members, files and
+-- upload sessions go with it by cascade) and returns, in the same
+-- statement, the storage paths of its files and unfinished uploads. The
+-- API hands them to a background job that removes them from the bucket in
+-- batches, so the request makes one round trip however many attachments
+-- the project has. Without this migration the API pages through the files
+-- before deleting the project instead.
+
+CREATE OR REPLACE FUNCTION delete_project_files(p_project_id bigint)
+RETURNS text[]
+LANGUAGE sql
+AS $$
+    -- Every part of the statement sees the rows as they were before the delete
+    WITH deleted AS (
+        DELETE FROM projects WHERE id = p_project_id RETURNING id
+    ),
+    paths AS (
+        SELECT file_path FROM files WHERE project_id = p_project_id
+        UNION
+        SELECT file_path FROM upload_sessions WHERE project_id = p_project_id AND completed_at IS NULL
+    )
+    SELECT coalesce(array_agg(file_path ORDER BY file_path), '{}')
+    FROM paths
+    WHERE EXISTS (SELECT 1 FROM deleted)
+$$;
+
+-- Let PostgREST pick up the new function
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,75 @@
+-- Project statistics (GET /api/projects/<id>/stats).
+--
+-- One call aggregates a project's tasks, members and files in the
+-- database: counts by status and priority, overdue tasks (the rule of
+-- 0009_overdue_rule.sql), per-assignee counts for invited members, tasks
+-- created per day over the last week (UTC) and file totals. The API
+-- shapes the result. Without this function it reads the task rows and
+-- aggregates them in Python instead.
+
+CREATE OR REPLACE FUNCTION project_stats(p_project_id bigint)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+    WITH t AS (
+        SELECT status, coalesce(priority, 'medium') AS priority, assigned_to, due_date, created_at
+        FROM tasks
+        WHERE project_id = p_project_id
+    ),
+    today AS (
+        SELECT (now() AT TIME ZONE 'UTC')::date AS day
+    ),
+    assignees AS (
+        SELECT assigned_to, count(*) AS tasks, count(*) FILTER (WHERE status = 'done') AS completed
+        FROM t
+        WHERE assigned_to IS NOT NULL
+        GROUP BY assigned_to
+    )
+    SELECT jsonb_build_object(
+        'total_tasks', (SELECT count(*) FROM t),
+        'by_status', (
+            SELECT coalesce(jsonb_object_agg(status, n), '{}')
+            FROM (SELECT status, count(*) AS n FROM t GROUP BY status) AS s
+        ),
+        'by_priority', (
+            SELECT coalesce(jsonb_object_agg(priority, n), '{}')
+            FROM (SELECT priority, count(*) AS n FROM t GROUP BY priority) AS p
+        ),
+        'overdue', (
+            SELECT count(*) FROM t, today WHERE t.status <> 'done' AND t.due_date < today.day
+        ),
+        'created_per_day', (
+            SELECT coalesce(jsonb_object_agg(d.day, d.n), '{}')
+            FROM (
+                SELECT (t.created_at AT TIME ZONE 'UTC')::date AS day, count(*) AS n
+                FROM t, today
+                WHERE t.created_at >= ((today.day - 6)::timestamp AT TIME ZONE 'UTC')
+                GROUP BY 1
+            ) AS d
+        ),
+        'by_assignee', (
+            SELECT coalesce(jsonb_agg(jsonb_build_object(
+                'user_id', pm.user_id,
+                'email', u.email,
+                'first_name', u.first_name,
+                'last_name', u.last_name,
+                'tasks', a.tasks,
+                'completed', a.completed
+            ) ORDER BY pm.id), '[]')
+            FROM project_members AS pm
+            JOIN assignees AS a ON a.assigned_to = pm.user_id
+            LEFT JOIN users AS u ON u.id = pm.user_id
+            WHERE pm.project_id = p_project_id AND pm.role <> 'owner'
+        ),
+        'member_count', (
+            (SELECT count(*) FROM project_members WHERE project_id = p_project_id AND role <> 'owner')
+            + (SELECT count(*) FROM guest_members WHERE project_id = p_project_id AND role <> 'owner')
+        ),
+        'file_count', (SELECT count(*) FROM files WHERE project_id = p_project_id),
+        'file_size', (SELECT coalesce(sum(file_size), 0) FROM files WHERE project_id = p_project_id)
+    )
+$$;
+
+-- Let PostgREST pick up the new function
+NOTIFY pgrst, 'reload schema';
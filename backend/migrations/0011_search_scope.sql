@@ -0,0 +1,64 @@
+-- search_content() without p_content_ids.
+--
+-- 0005 took the projects to search twice: p_project_ids for project names
+-- and p_content_ids for tasks and files, which the API always passed the
+-- same ids. Every project the caller can read (guest ones included) is
+-- searched in full, so one list is enough. Fresh databases get this
+-- definition from 0005; this migration replaces the old signature.
+
+DROP FUNCTION IF EXISTS search_content(text, bigint[], bigint[], text[], integer, integer);
+
+CREATE OR REPLACE FUNCTION search_content(
+    p_query text,
+    p_project_ids bigint[],
+    p_types text[] DEFAULT NULL,
+    p_limit integer DEFAULT 20,
+    p_offset integer DEFAULT 0
+)
+RETURNS TABLE (type text, id bigint, project_id bigint, title text, snippet text, rank real)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH q AS (
+        SELECT search_query(p_query) AS tsq
+    ),
+    hits AS (
+        -- Only in p_project_ids, the projects the caller can read
+        SELECT 'task' AS type, t.id, t.project_id, t.title, t.description AS body,
+               ts_rank_cd(task_search_vector(t.title, t.description), q.tsq) AS rank
+        FROM tasks AS t, q
+        WHERE (p_types IS NULL OR 'task' = ANY (p_types))
+          AND t.project_id = ANY (p_project_ids)
+          AND task_search_vector(t.title, t.description) @@ q.tsq
+        UNION ALL
+        SELECT 'file', f.id, f.project_id, f.filename, NULL,
+               ts_rank_cd(search_vector(f.filename), q.tsq)
+        FROM files AS f, q
+        WHERE (p_types IS NULL OR 'file' = ANY (p_types))
+          AND f.project_id = ANY (p_project_ids)
+          AND search_vector(f.filename) @@ q.tsq
+        UNION ALL
+        SELECT 'project', p.id, p.id, p.name, p.description,
+               ts_rank_cd(search_vector(p.name), q.tsq)
+        FROM projects AS p, q
+        WHERE (p_types IS NULL OR 'project' = ANY (p_types))
+          AND p.id = ANY (p_project_ids)
+          AND search_vector(p.name) @@ q.tsq
+    ),
+    page AS (
+        SELECT * FROM hits
+        ORDER BY rank DESC, type, id
+        LIMIT p_limit OFFSET p_offset
+    )
+    -- Excerpts only for the returned page
+    SELECT page.type, page.id, page.project_id, page.title,
+           CASE WHEN coalesce(page.body, '') <> '' THEN
+               ts_headline('simple', page.body, q.tsq, 'MaxFragments=1, MaxWords=20, MinWords=5, StartSel="", StopSel=""')
+           END,
+           page.rank
+    FROM page, q
+    ORDER BY page.rank DESC, page.type, page.id
+$$;
+
+-- Let PostgREST pick up the new signature
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,140 @@
+"""
+Test fixtures - the migrations loaded into a scratch schema of DATABASE_URL,
+served with DB_ENGINE=postgres. Tests needing the database are skipped when
+DATABASE_URL is not set.
+"""
+import glob
+import os
+import tempfile
+import time
+import uuid
+import jwt
+import pytest
+
+DATABASE_URL = os.getenv('DATABASE_URL')
+JWT_SECRET = 'test-secret-' + '0' * 32
+
+# Read by app.config on import
+os.environ['DB_ENGINE'] = 'postgres'
+os.environ['SUPABASE_JWT_SECRET'] = JWT_SECRET
+os.environ['BROADCAST_DATABASE_URL'] = ''
+os.environ['JOB_DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'jobs.sqlite3')
+
+MIGRATIONS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations', '*.sql')))
+
+OWNER, MEMBER, OUTSIDER = (str(uuid.UUID(int=i)) for i in (1, 2, 3))
+GUEST_EMAIL = 'guest@example.com'
+
+TABLES = 'users, projects, project_members, guest_members, tasks, files, task_deletions, upload_sessions'
+
+
+def email(user_id: str) -> str:
+    return f'user{user_id[-1]}@example.com'
+
+
+def token(user_id: str, user_email: str = None) -> str:
+    """Access token as Supabase Auth issues it"""
+    return jwt.encode({
+        'sub': user_id,
+        'email': user_email or email(user_id),
+        'aud': 'authenticated',
+        'exp': int(time.time()) + 3600
+    }, JWT_SECRET, algorithm='HS256')
+
+
+def headers(user_id: str, user_email: str = None) -> dict:
+    return {'Authorization': f'Bearer {token(user_id, user_email)}'}
+
+
+@pytest.fixture(scope='session')
+def database():
+    """DSN of a scratch schema holding every migration, dropped afterwards"""
+    if not DATABASE_URL:
+        pytest.skip('DATABASE_URL is not set')
+
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+    from app.config import Config
+
+    schema = f'test_{uuid.uuid4().hex[:12]}'
+    dsn = make_conninfo(DATABASE_URL, options=f'-c search_path={schema}')
+
+    with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+        conn.execute(f'CREATE SCHEMA {schema}')
+
+    try:
+        with psycopg.connect(dsn, autocommit=True) as conn:
+            for path in MIGRATIONS:
+                with open(path) as f:
+                    conn.execute(f.read())
+
+        Config.DATABASE_URL = dsn
+        yield dsn
+    finally:
+        from app.services.supabase import SupabaseService
+        if SupabaseService._db is not None:
+            SupabaseService._db.close()
+            SupabaseService._db = None
+
+        with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+            conn.execute(f'DROP SCHEMA {schema} CASCADE')
+
+
+@pytest.fixture
+def sql(database):
+    """Run one statement against the scratch schema; returns its rows"""
+    import psycopg
+
+    def run(statement: str, params=None):
+        with psycopg.connect(database, autocommit=True) as conn:
+            cursor = conn.execute(statement, params)
+            return cursor.fetchall() if cursor.description else None
+
+    return run
+
+
+@pytest.fixture
+def seeded(sql):
+    """Two projects: 1 owned by OWNER with MEMBER and a guest, 2 owned by MEMBER.
+
+    Project 1 has five tasks and two files. Caches start empty.
+    """
+    from app.services.supabase import SupabaseService
+
+    sql(f'TRUNCATE {TABLES} RESTART IDENTITY CASCADE')
+    sql('INSERT INTO users (id, email, first_name) VALUES (%s, %s, %s), (%s, %s, %s), (%s, %s, %s)',
+        (OWNER, email(OWNER), 'Olga', MEMBER, email(MEMBER), 'Mika', OUTSIDER, email(OUTSIDER), 'Otto'))
+    sql("INSERT INTO projects (name, description, created_by) VALUES ('Alpha', 'first', %s), ('Beta', 'second', %s)",
+        (OWNER, MEMBER))
+    sql("INSERT INTO project_members (project_id, user_id, role) VALUES (1, %s, 'member')", (MEMBER,))
+    sql("INSERT INTO guest_members (project_id, name, email, role) VALUES (1, 'Guest', %s, 'member')", (GUEST_EMAIL,))
+
+    for i in range(1, 6):
+        sql('INSERT INTO tasks (project_id, title, status, priority, assigned_to, created_by, created_at) '
+            "VALUES (1, %s, %s, %s, %s, %s, '2026-01-01T00:00:00Z'::timestamptz + %s * interval '1 minute')",
+            (f'Task {i}', ('todo', 'in_progress', 'done')[i % 3], ('low', 'medium', 'high')[i % 3],
+             MEMBER if i % 2 else None, OWNER, i))
+
+    for i in range(1, 3):
+        sql("INSERT INTO files (project_id, filename, file_path, file_size, file_type, uploaded_by) "
+            "VALUES (1, %s, %s, %s, 'application/pdf', %s)", (f'spec{i}.pdf', f'1/spec{i}.pdf', 100 * i, OWNER))
+
+    SupabaseService.get_access().clear()
+    SupabaseService.get_project_index().clear()
+    SupabaseService.get_task_cache().clear()
+    SupabaseService.get_events().clear()
+    SupabaseService._tokens.clear()
+    SupabaseService._missing_functions.clear()
+    SupabaseService._missing_tables.clear()
+
+
+@pytest.fixture(scope='session')
+def app(database):
+    from app import create_app
+    return create_app()
+
+
+@pytest.fixture
+def client(app, seeded):
+    """Flask test client over the seeded database"""
+    return app.test_client()
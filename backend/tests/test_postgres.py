@@ -0,0 +1,255 @@
+"""
+Service paths on the direct PostgreSQL engine (DB_ENGINE=postgres): the
+PostgREST-style queries compiled to SQL against the migrated schema
+"""
+import pytest
+from datetime import timedelta
+from conftest import OWNER, MEMBER, OUTSIDER, GUEST_EMAIL, email, headers, token
+from app.config import Config
+from app.services.pagination import decode_sync_cursor
+from app.services.supabase import SupabaseService as S
+
+pytestmark = pytest.mark.usefixtures('seeded')
+
+
+def titles(tasks):
+    return [task['title'] for task in tasks]
+
+
+# Access
+def test_roles():
+    assert S.get_project_role(1, OWNER) == 'owner'
+    assert S.get_project_role(1, MEMBER) == 'member'
+    assert S.get_project_role(1, OUTSIDER) is None
+    assert S.get_reader_role(1, OUTSIDER, GUEST_EMAIL) == 'guest'
+    assert S.get_reader_role(2, OUTSIDER, GUEST_EMAIL) is None
+
+
+def test_verify_user():
+    user = S.verify_user(token(MEMBER))
+    assert user.id == MEMBER and user.email == email(MEMBER)
+
+
+# Projects
+def test_get_projects_includes_member_and_guest_projects():
+    assert sorted(p['name'] for p in S.get_projects(MEMBER)) == ['Alpha', 'Beta']
+    assert [p['name'] for p in S.get_projects(OWNER)] == ['Alpha']
+    assert [p['name'] for p in S.get_projects(OUTSIDER, email=GUEST_EMAIL)] == ['Alpha']
+
+
+def test_get_projects_fields():
+    projects = S.get_projects(OWNER, ('id', 'name'))
+    assert projects[0]['name'] == 'Alpha' and 'description' not in projects[0]
+
+
+def test_project_lifecycle():
+    project = S.create_project({'name': 'Gamma'}, OUTSIDER)
+    assert project['created_by'] == OUTSIDER
+
+    assert S.update_project(project['id'], {'description': 'third'}, MEMBER) is None
+    assert S.update_project(project['id'], {'description': 'third'}, OUTSIDER)['description'] == 'third'
+    assert S.get_project_by_id(project['id'], OUTSIDER)['name'] == 'Gamma'
+
+    assert S.delete_project(project['id'], OUTSIDER)
+    assert S.get_project_by_id(project['id'], OUTSIDER) is None
+
+
+def test_project_stats_match_fallback():
+    stats = S.get_project_stats(1, MEMBER)
+    assert stats['total_tasks'] == 5 and stats['files'] == {'count': 2, 'total_size': 300}
+
+    S._missing_functions.add('project_stats')
+    assert S.get_project_stats(1, MEMBER) == stats
+
+
+def test_dashboard():
+    dashboard = S.get_dashboard(MEMBER)
+    assert {p['name'] for p in dashboard['projects']} == {'Alpha', 'Beta'}
+
+
+def test_project_rollups_match_fallback():
+    rollups = S.get_project_rollups([1, 2])
+    S._missing_functions.add('project_rollups')
+    assert S.get_project_rollups([1, 2]) == rollups
+    assert rollups[1]['total_tasks'] == 5 and rollups[1]['task_counts'] == {'todo': 1, 'in_progress': 2, 'done': 2}
+
+
+# Tasks
+def test_get_project_tasks_in_creation_order_with_assignee():
+    tasks = S.get_project_tasks(1, MEMBER)
+    assert titles(tasks) == [f'Task {i}' for i in range(1, 6)]
+    assert tasks[0]['assignee']['email'] == email(MEMBER)
+    assert tasks[1]['assignee'] is None
+    assert S.get_project_tasks(1, OUTSIDER) is None
+
+
+def test_get_project_tasks_pages():
+    first = S.get_project_tasks(1, MEMBER, limit=2)
+    second = S.get_project_tasks(1, MEMBER, limit=2, cursor=first['next_cursor'])
+    last = S.get_project_tasks(1, MEMBER, limit=2, cursor=second['next_cursor'])
+
+    assert titles(first['items'] + second['items'] + last['items']) == [f'Task {i}' for i in range(1, 6)]
+    assert last['next_cursor'] is None
+
+
+def test_get_project_tasks_filters_and_fields(client):
+    response = client.get('/api/projects/1/tasks?assigned_to=none&status=todo,done&fields=id,title',
+                          headers=headers(MEMBER))
+    assert response.status_code == 200
+    assert response.json == [{'created_at': task['created_at'], 'id': task['id'], 'title': task['title']}
+                             for task in response.json]
+    assert titles(response.json) == ['Task 2']
+
+
+def test_task_writes_are_scoped_to_members():
+    task = S.create_task(1, {'title': 'New', 'assigned_to': MEMBER}, MEMBER)
+    assert task['status'] == 'todo'
+    assert S.create_task(1, {'title': 'Nope'}, OUTSIDER) is None
+
+    assert S.update_task(task['id'], {'status': 'done'}, OWNER)['status'] == 'done'
+    assert S.update_task(task['id'], {'status': 'todo'}, OUTSIDER) is None
+
+    assert not S.delete_task(task['id'], OUTSIDER)
+    assert S.delete_task(task['id'], MEMBER)
+    assert 'New' not in titles(S.get_project_tasks(1, MEMBER))
+
+
+def test_batch_tasks(sql):
+    results = S.batch_tasks(1, [
+        {'op': 'create', 'data': {'title': 'Batch'}},
+        {'op': 'update', 'id': 1, 'data': {'status': 'done'}},
+        {'op': 'update', 'id': 2, 'data': {'status': 'done'}},
+        {'op': 'delete', 'id': 3},
+        {'op': 'update', 'id': 99, 'data': {'status': 'done'}},
+        {'op': 'create', 'data': {}}
+    ], MEMBER)
+
+    assert [r['status'] for r in results] == ['ok', 'ok', 'ok', 'ok', 'error', 'error']
+    assert sql('SELECT id, status FROM tasks WHERE id IN (1, 2, 3) ORDER BY id') == [(1, 'done'), (2, 'done')]
+
+
+def test_batch_update_writes_only_changed_columns(sql):
+    sql("UPDATE tasks SET title = 'Renamed elsewhere' WHERE id = 1")
+    S.batch_tasks(1, [{'op': 'update', 'id': 1, 'data': {'status': 'done'}}], MEMBER)
+    assert sql('SELECT title, status FROM tasks WHERE id = 1') == [('Renamed elsewhere', 'done')]
+
+
+def test_import_tasks():
+    rows = [(i + 2, {'title': f'Imported {i}', 'priority': 'high', 'assignee': email(MEMBER)}) for i in range(3)]
+    assert S.import_tasks(1, rows, MEMBER) == {'created': 3, 'failed': 0, 'errors': []}
+    assert titles(S.get_project_tasks(1, MEMBER))[-3:] == ['Imported 0', 'Imported 1', 'Imported 2']
+
+
+def test_task_changes_since_cursor():
+    full = S.get_task_changes(1, MEMBER)
+    assert full['full'] and len(full['tasks']) == 5
+
+    since = S.get_task_changes(1, MEMBER)['cursor']
+    S.update_task(1, {'status': 'done'}, MEMBER)
+    S.delete_task(2, MEMBER)
+
+    changes = S.get_task_changes(1, MEMBER, decode_sync_cursor(since))
+    assert not changes['full']
+    assert 1 in [task['id'] for task in changes['tasks']]
+    assert changes['deleted'] == [2]
+
+
+def test_sync_cursor_comes_from_database_timestamps(sql):
+    S.update_task(1, {'status': 'done'}, MEMBER)
+    latest = sql('SELECT max(updated_at) FROM tasks')[0][0]
+
+    cursor = S.get_task_changes(1, MEMBER, fields=('id',))['cursor']
+    assert decode_sync_cursor(cursor) == latest - timedelta(seconds=Config.TASK_SYNC_OVERLAP)
+
+
+def test_task_changes_without_tombstones_send_full_list(sql):
+    since = decode_sync_cursor(S.get_task_changes(1, MEMBER)['cursor'])
+    sql('ALTER TABLE task_deletions RENAME TO task_deletions_off')
+    try:
+        changes = S.get_task_changes(1, MEMBER, since)
+    finally:
+        sql('ALTER TABLE task_deletions_off RENAME TO task_deletions')
+
+    assert changes['full'] and len(changes['tasks']) == 5
+
+
+def test_task_list_version_changes_with_writes():
+    version = S.get_task_list_version(1, MEMBER)
+    S.get_project_tasks(1, MEMBER)
+    assert S.get_task_list_version(1, MEMBER) == version
+
+    S.update_task(1, {'status': 'done'}, MEMBER)
+    assert S.get_task_list_version(1, MEMBER) != version
+    assert S.get_task_list_version(1, OUTSIDER) is None
+
+
+def test_user_tasks():
+    tasks = S.get_user_tasks(MEMBER)
+    assert titles(tasks) == ['Task 1', 'Task 3', 'Task 5']
+    assert tasks[0]['projects']['name'] == 'Alpha'
+
+
+# Members
+def test_members():
+    assert [m['users']['email'] for m in S.get_project_members(1, OWNER)] == [email(MEMBER)]
+
+    assert S.add_project_member(1, OUTSIDER, 'member', MEMBER) is None
+    assert S.add_project_member(1, OUTSIDER, 'member', OWNER)['user_id'] == OUTSIDER
+    assert S.update_project_member(1, OUTSIDER, 'admin', OWNER)
+    assert S.get_project_role(1, OUTSIDER) == 'admin'
+
+    assert S.remove_project_member(1, OUTSIDER, OWNER)
+    assert S.get_project_role(1, OUTSIDER) is None
+
+
+def test_guest_members():
+    members = S.get_all_project_members(1, OWNER)
+    assert [(m['type'], m['user']['email']) for m in members] == [('auth', email(MEMBER)), ('guest', GUEST_EMAIL)]
+
+    guest = S.add_guest_member(1, 'Second', 'second@example.com', 'member', OWNER)
+    assert S.get_reader_role(1, OUTSIDER, 'second@example.com') == 'guest'
+
+    assert not S.remove_guest_member(2, guest['id'], MEMBER)
+    assert S.remove_guest_member(1, guest['id'], OWNER)
+    assert S.get_reader_role(1, OUTSIDER, 'second@example.com') is None
+
+
+# Files, export and search
+def test_project_files():
+    files = S.get_project_files(1, MEMBER)
+    assert sorted(f['filename'] for f in files) == ['spec1.pdf', 'spec2.pdf']
+    assert files[0]['uploader']['email'] == email(OWNER)
+
+
+def test_export_project():
+    records = list(S.export_project(1, MEMBER))
+    kinds = [kind for kind, _ in records]
+    assert kinds[0] == 'project'
+    assert kinds.count('task') == 5 and kinds.count('file') == 2 and kinds.count('guest') == 1
+
+
+def test_search():
+    results = S.search(MEMBER, 'task 3', email(MEMBER))
+    assert [item['title'] for item in results['items'] if item.get('type') == 'task'] == ['Task 3']
+    assert S.search(OUTSIDER, 'task', email(OUTSIDER))['items'] == []
+
+
+# Routes
+def test_task_list_revalidation(client):
+    response = client.get('/api/projects/1/tasks', headers=headers(MEMBER))
+    tag = response.headers['ETag']
+
+    response = client.get('/api/projects/1/tasks', headers={**headers(MEMBER), 'If-None-Match': tag})
+    assert response.status_code == 304
+
+    S.update_task(1, {'status': 'done'}, MEMBER)
+    response = client.get('/api/projects/1/tasks', headers={**headers(MEMBER), 'If-None-Match': tag})
+    assert response.status_code == 200
+
+
+def test_guest_reads_project(client):
+    response = client.get('/api/projects/1/tasks', headers=headers(OUTSIDER, GUEST_EMAIL))
+    assert response.status_code == 200 and len(response.json) == 5
+
+    response = client.post('/api/projects/1/tasks', json={'title': 'x'}, headers=headers(OUTSIDER, GUEST_EMAIL))
+    assert response.status_code == 404
@@ -0,0 +1,51 @@
+"""
+Background Job Worker
+
+Runs queued jobs (storage cleanup) outside the web processes, e.g. when
+they are started with JOB_WORKERS=0, and manages dead jobs.
+
+    python worker.py              # work the queue until interrupted
+    python worker.py --dead       # list jobs that ran out of attempts
+    python worker.py --retry ID   # queue a dead job again
+"""
+import argparse
+import json
+from datetime import datetime
+from app.config import Config
+from app.services.supabase import SupabaseService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run or inspect background jobs')
+    parser.add_argument('--dead', action='store_true', help='list dead jobs and exit')
+    parser.add_argument('--retry', metavar='ID', action='append', help='queue a dead job again (repeatable)')
+    parser.add_argument('--once', action='store_true', help='run the jobs that are due, then exit')
+    args = parser.parse_args(argv)
+
+    Config.validate()
+    jobs = SupabaseService.get_jobs()
+
+    if args.dead:
+        for job in jobs.dead():
+            updated = datetime.fromtimestamp(job['updated_at']).isoformat(timespec='seconds')
+            print(f"{job['id']}  {job['kind']}  {updated}  {job['last_error']}")
+            print(f"    {json.dumps(job['payload'])}")
+        return 0
+
+    if args.retry:
+        missing = [job_id for job_id in args.retry if not jobs.retry(job_id)]
+        for job_id in missing:
+            print(f'No dead job {job_id}')
+        return 1 if missing else 0
+
+    if args.once:
+        print(f'Ran {jobs.run_pending()} jobs')
+        return 0
+
+    print(f'Working jobs from {Config.JOB_DB_PATH} ({jobs.counts()})')
+    jobs.serve()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 import { FileText, Image, Video, Music, File as FileIcon, Download, Trash2, MoreVertical, X } from 'lucide-react';
 import { format } from 'date-fns';
 import { useState } from 'react';
+import { fileUrl } from '../../services/uploads';
 
 interface FileCardProps {
   file: any;
@@ -33,9 +34,8 @@ export default function FileCard({ file, onDelete, canDelete }: FileCardProps) {
   const isImage = file.file_type?.startsWith('image/');
 
   const handleDownload = () => {
-    // In real implementation, fetch from Supabase Storage
     const link = document.createElement('a');
-    link.href = file.file_path;
+    link.href = fileUrl(file);
     link.download = file.filename;
     link.click();
   };
@@ -126,7 +126,7 @@ export default function FileCard({ file, onDelete, canDelete }: FileCardProps) {
               <X size={24} />
             </button>
             <img 
-              src={file.file_path} 
+              src={fileUrl(file)} 
               alt={file.filename}
               className="max-w-full max-h-[90vh] object-contain"
             />
@@ -1,6 +1,7 @@
 import { useState, useRef } from 'react';
 import { Upload, X, FileText, Loader2 } from 'lucide-react';
-import { filesAPI } from '../../services/api';
+import { uploadProjectFile } from '../../services/uploads';
+import { MAX_FILE_SIZE } from '../../utils/constants';
 
 interface FileUploadProps {
   projectId: number;
@@ -11,14 +12,15 @@ export default function FileUpload({ projectId, onUploadComplete }: FileUploadPr
   const [uploading, setUploading] = useState(false);
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
   const [error, setError] = useState('');
+  const [progress, setProgress] = useState(0);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
   const handleFileSelect = (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
     if (file) {
-      // Check file size (max 10MB)
-      if (file.size > 10 * 1024 * 1024) {
-        setError('File size must be less than 10MB');
+      // The API enforces the same limit
+      if (file.size > MAX_FILE_SIZE) {
+        setError(`File size must be less than ${MAX_FILE_SIZE / (1024 * 1024)}MB`);
         return;
       }
       setSelectedFile(file);
@@ -33,37 +35,19 @@ export default function FileUpload({ projectId, onUploadComplete }: FileUploadPr
     setError('');
 
     try {
-      // In production, upload to Supabase Storage
-      // For now, we'll simulate with a data URL
-      const reader = new FileReader();
-      reader.readAsDataURL(selectedFile);
-      reader.onload = async () => {
-        try {
-          await filesAPI.upload(projectId, {
-            filename: selectedFile.name,
-            file_path: reader.result as string, // In production: Supabase storage path
-            file_size: selectedFile.size,
-            file_type: selectedFile.type
-          });
+      // Bytes go straight to storage (large files in resumable chunks); the API records the file
+      await uploadProjectFile(projectId, selectedFile, setProgress);
 
-          setSelectedFile(null);
-          if (fileInputRef.current) {
-            fileInputRef.current.value = '';
-          }
-          onUploadComplete();
-        } catch (err: any) {
-          setError(err.response?.data?.error || 'Upload failed');
-        } finally {
-          setUploading(false);
-        }
-      };
-      reader.onerror = () => {
-        setError('Failed to read file');
-        setUploading(false);
-      };
+      setSelectedFile(null);
+      if (fileInputRef.current) {
+        fileInputRef.current.value = '';
+      }
+      onUploadComplete();
     } catch (err: any) {
-      setError('Upload failed');
+      setError(err.response?.data?.error || err.message || 'Upload failed');
+    } finally {
       setUploading(false);
+      setProgress(0);
     }
   };
 
@@ -83,7 +67,7 @@ export default function FileUpload({ projectId, onUploadComplete }: FileUploadPr
           <p className="text-text-primary mb-1">
             {selectedFile ? selectedFile.name : 'Click to select file'}
           </p>
-          <p className="text-sm text-text-secondary">Max size: 10MB</p>
+          <p className="text-sm text-text-secondary">Max size: {MAX_FILE_SIZE / (1024 * 1024)}MB</p>
           <input
             ref={fileInputRef}
             type="file"
@@ -126,7 +110,7 @@ export default function FileUpload({ projectId, onUploadComplete }: FileUploadPr
           className="w-full flex items-center justify-center gap-2 px-4 py-3 bg-primary text-white rounded-lg hover:bg-primary/90 transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
         >
           {uploading && <Loader2 size={18} className="animate-spin" />}
-          {uploading ? 'Uploading...' : 'Upload File'}
+          {uploading ? `Uploading... ${Math.round(progress * 100)}%` : 'Upload File'}
         </button>
       </div>
     </div>
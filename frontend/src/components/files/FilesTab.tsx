@@ -3,6 +3,7 @@ import { FileText } from 'lucide-react';
 import FileCard from './FileCard';
 import FileUpload from './FileUpload';
 import { filesAPI } from '../../services/api';
+import { useProjectEvents } from '../../services/realtime';
 
 interface FilesTabProps {
   projectId: number;
@@ -31,11 +32,20 @@ export default function FilesTab({ projectId, canUpload = true, onFilesUpdate }:
     fetchFiles();
   }, [projectId]);
 
+  const live = useProjectEvents(projectId, (event) => {
+    if (event.type === 'file.deleted') {
+      setFiles((prev) => prev.filter((f) => f.id !== event.data.id));
+    } else if (event.type === 'file.created' || event.type === 'resync') {
+      // New rows need the uploader join
+      fetchFiles();
+    }
+  });
+
   const handleDelete = async (fileId: number) => {
     try {
       await filesAPI.delete(fileId);
       onFilesUpdate?.();
-      fetchFiles();
+      if (!live) fetchFiles();
     } catch (error) {
       console.error('Error deleting file:', error);
       alert('Failed to delete file');
@@ -57,7 +67,7 @@ export default function FilesTab({ projectId, canUpload = true, onFilesUpdate }:
         <FileUpload 
           projectId={projectId}
           onUploadComplete={() => {
-            fetchFiles();
+            if (!live) fetchFiles();
             setShowUpload(false);
             onFilesUpdate?.();
           }}
@@ -17,9 +17,16 @@ export default function ProjectCard({ project, viewMode }: ProjectCardProps) {
   const [isDeleting, setIsDeleting] = useState(false);
   const [tasks, setTasks] = useState<any[]>([]);
   const [members, setMembers] = useState<any[]>([]);
-  const [loading, setLoading] = useState(true);
+  // Projects from GET /dashboard already carry their rollups
+  const hasRollup = project.total_tasks !== undefined;
+  const [loading, setLoading] = useState(!hasRollup);
 
   useEffect(() => {
+    if (hasRollup) {
+      setLoading(false);
+      return;
+    }
+
     const fetchProjectData = async () => {
       setLoading(true);
       try {
@@ -38,11 +45,17 @@ export default function ProjectCard({ project, viewMode }: ProjectCardProps) {
     };
 
     fetchProjectData();
-  }, [project.id]);
+  }, [project.id, hasRollup]);
 
   // Calculate project progress
-  const totalTasks = tasks.length;
-  const completedTasks = tasks.filter((t: any) => t.status === 'done').length;
+  const totalTasks: number = hasRollup ? project.total_tasks : tasks.length;
+  const completedTasks: number = hasRollup
+    ? project.task_counts?.done || 0
+    : tasks.filter((t: any) => t.status === 'done').length;
+  const memberCount: number = hasRollup ? project.member_count || 0 : members.length;
+  const memberEmails: (string | undefined)[] = hasRollup
+    ? project.member_emails || []
+    : members.map((m: any) => m.user?.email);
   const progress = totalTasks > 0 ? Math.round((completedTasks / totalTasks) * 100) : 0;
 
   // Get status color
@@ -137,7 +150,7 @@ export default function ProjectCard({ project, viewMode }: ProjectCardProps) {
               
               <div className="flex items-center gap-1">
                 <Users size={14} />
-                <span>{loading ? '...' : members.length} members</span>
+                <span>{loading ? '...' : memberCount} members</span>
               </div>
               
               <div className="flex items-center gap-1">
@@ -252,7 +265,7 @@ export default function ProjectCard({ project, viewMode }: ProjectCardProps) {
           
           <div className="flex items-center gap-1" title="Team Members">
             <Users size={16} />
-            <span>{loading ? '...' : members.length}</span>
+            <span>{loading ? '...' : memberCount}</span>
           </div>
         </div>
         
@@ -263,21 +276,21 @@ export default function ProjectCard({ project, viewMode }: ProjectCardProps) {
       </div>
 
       {/* Members Avatars */}
-      {!loading && members.length > 0 && (
+      {!loading && memberCount > 0 && (
         <div className="flex items-center gap-1 mt-3 pt-3 border-t border-border">
           <div className="flex -space-x-2">
-            {members.slice(0, 3).map((member: any, index: number) => (
+            {memberEmails.slice(0, 3).map((email, index) => (
               <div
-                key={member.user_id || index}
+                key={index}
                 className="w-7 h-7 rounded-full bg-primary border-2 border-surface flex items-center justify-center text-white text-xs font-medium"
-                title={member.user?.email}
+                title={email || undefined}
               >
-                {member.user?.email?.charAt(0).toUpperCase() || '?'}
+                {email?.charAt(0).toUpperCase() || '?'}
               </div>
             ))}
-            {members.length > 3 && (
+            {memberCount > 3 && (
               <div className="w-7 h-7 rounded-full bg-background-secondary border-2 border-surface flex items-center justify-center text-text-secondary text-xs font-medium">
-                +{members.length - 3}
+                +{memberCount - 3}
               </div>
             )}
           </div>
@@ -1,7 +1,8 @@
 import { useState, useEffect } from 'react';
 import { TrendingUp, Users, CheckCircle2, Clock, AlertCircle, FileText, Calendar } from 'lucide-react';
 import { PieChart, Pie, Cell, ResponsiveContainer, LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, BarChart, Bar } from 'recharts';
-import { tasksAPI, membersAPI, filesAPI } from '../../services/api';
+import { projectsAPI } from '../../services/api';
+import type { ProjectStats } from '../../types';
 
 interface StatisticsTabProps {
   projectId: number;
@@ -9,24 +10,15 @@ interface StatisticsTabProps {
 }
 
 export default function StatisticsTab({ projectId, project }: StatisticsTabProps) {
-  const [tasks, setTasks] = useState<any[]>([]);
-  const [members, setMembers] = useState<any[]>([]);
-  const [files, setFiles] = useState<any[]>([]);
+  const [stats, setStats] = useState<ProjectStats | null>(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    const fetchAllData = async () => {
+    const fetchStats = async () => {
       setLoading(true);
       try {
-        const [tasksRes, membersRes, filesRes] = await Promise.all([
-          tasksAPI.getByProject(projectId),
-          membersAPI.getByProject(projectId),
-          filesAPI.getByProject(projectId)
-        ]);
-        
-        setTasks(tasksRes.data || []);
-        setMembers(membersRes.data || []);
-        setFiles(filesRes.data || []);
+        const response = await projectsAPI.getStats(projectId);
+        setStats(response.data);
       } catch (error) {
         console.error('Error fetching statistics data:', error);
       } finally {
@@ -34,7 +26,7 @@ export default function StatisticsTab({ projectId, project }: StatisticsTabProps
       }
     };
 
-    fetchAllData();
+    fetchStats();
   }, [projectId]);
 
   if (loading) {
@@ -45,35 +37,31 @@ export default function StatisticsTab({ projectId, project }: StatisticsTabProps
     );
   }
 
-  // Calculate statistics
-  const totalTasks = tasks.length;
-  const todoTasks = tasks.filter(t => t.status === 'todo').length;
-  const inProgressTasks = tasks.filter(t => t.status === 'in_progress').length;
-  const doneTasks = tasks.filter(t => t.status === 'done').length;
-  const completionRate = totalTasks > 0 ? Math.round((doneTasks / totalTasks) * 100) : 0;
+  // Statistics are aggregated server-side
+  const totalTasks = stats?.total_tasks ?? 0;
+  const todoTasks = stats?.by_status.todo ?? 0;
+  const inProgressTasks = stats?.by_status.in_progress ?? 0;
+  const doneTasks = stats?.by_status.done ?? 0;
+  const completionRate = stats?.completion_rate ?? 0;
 
   // Priority breakdown
-  const highPriority = tasks.filter(t => t.priority === 'high').length;
-  const mediumPriority = tasks.filter(t => t.priority === 'medium').length;
-  const lowPriority = tasks.filter(t => t.priority === 'low').length;
+  const highPriority = stats?.by_priority.high ?? 0;
+  const mediumPriority = stats?.by_priority.medium ?? 0;
+  const lowPriority = stats?.by_priority.low ?? 0;
 
-  // Overdue tasks
-  const now = new Date();
-  const overdueTasks = tasks.filter(t => t.due_date && new Date(t.due_date) < now && t.status !== 'done').length;
-
-  // Filter out owners from members
-  const invitedMembers = members.filter(m => m.role !== 'owner');
+  const overdueTasks = stats?.overdue ?? 0;
+  const memberCount = stats?.member_count ?? 0;
 
   // Member task assignment
-  const memberTaskCount = invitedMembers.map(member => ({
-    name: member.user?.full_name || member.user?.email?.split('@')[0] || 'Unknown',
-    tasks: tasks.filter(t => t.assigned_to === member.user_id).length,
-    completed: tasks.filter(t => t.assigned_to === member.user_id && t.status === 'done').length
-  })).filter(m => m.tasks > 0);
+  const memberTaskCount = (stats?.by_assignee ?? []).map(member => ({
+    name: member.name,
+    tasks: member.tasks,
+    completed: member.completed
+  }));
 
   // File statistics
-  const totalFileSize = files.reduce((sum, file) => sum + (file.file_size || 0), 0);
-  const fileSizeMB = (totalFileSize / (1024 * 1024)).toFixed(2);
+  const fileCount = stats?.files.count ?? 0;
+  const fileSizeMB = ((stats?.files.total_size ?? 0) / (1024 * 1024)).toFixed(2);
 
   // Task status data for pie chart
   const statusData = [
@@ -90,28 +78,13 @@ export default function StatisticsTab({ projectId, project }: StatisticsTabProps
   ].filter(item => item.value > 0);
 
   // Task creation timeline (last 7 days)
-  const today = new Date();
-  const dailyTasks = [];
-  
-  for (let i = 6; i >= 0; i--) {
-    const date = new Date(today);
-    date.setDate(date.getDate() - i);
-    const dateStr = date.toISOString().split('T')[0];
-    
-    const tasksOnDay = tasks.filter(t => {
-      const taskDate = new Date(t.created_at).toISOString().split('T')[0];
-      return taskDate === dateStr;
-    }).length;
-    
-    const monthDay = date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
-    
-    dailyTasks.push({
-      date: monthDay,
-      tasks: tasksOnDay
-    });
-  }
+  const dailyTasks = (stats?.created_per_day ?? []).map(day => ({
+    date: new Date(`${day.date}T00:00:00`).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
+    tasks: day.count
+  }));
 
   // Project duration calculation
+  const now = new Date();
   let projectDuration = 'Not set';
   let daysRemaining = null;
   
@@ -171,7 +144,7 @@ export default function StatisticsTab({ projectId, project }: StatisticsTabProps
             <div className="w-10 h-10 bg-purple-500/10 rounded-lg flex items-center justify-center">
               <Users size={20} className="text-purple-500" />
             </div>
-            <span className="text-2xl font-bold text-text-primary">{invitedMembers.length}</span>
+            <span className="text-2xl font-bold text-text-primary">{memberCount}</span>
           </div>
           <h3 className="text-sm font-medium text-text-secondary">Team Members</h3>
           <p className="text-xs text-text-tertiary mt-1">Active contributors</p>
@@ -290,7 +263,7 @@ export default function StatisticsTab({ projectId, project }: StatisticsTabProps
           <div className="space-y-2">
             <div className="flex justify-between text-sm">
               <span className="text-text-secondary">Total Files:</span>
-              <span className="text-text-primary font-medium">{files.length}</span>
+              <span className="text-text-primary font-medium">{fileCount}</span>
             </div>
             <div className="flex justify-between text-sm">
               <span className="text-text-secondary">Storage Used:</span>
@@ -6,10 +6,11 @@ import clsx from 'clsx';
 
 interface KanbanBoardProps {
   tasks: Task[];
-  onCreateTask: () => void;
-  onDeleteTask: (taskId: number) => Promise<void>;
-  onEditTask: (task: Task) => void;
-  onStatusChange: (taskId: number, newStatus: 'todo' | 'in_progress' | 'done') => Promise<void>;
+  // Without the callbacks (read-only projects) the board cannot change tasks
+  onCreateTask?: () => void;
+  onDeleteTask?: (taskId: number) => Promise<void>;
+  onEditTask?: (task: Task) => void;
+  onStatusChange?: (taskId: number, newStatus: 'todo' | 'in_progress' | 'done') => Promise<void>;
 }
 
 type TaskStatus = 'todo' | 'in_progress' | 'done';
@@ -57,7 +58,7 @@ export default function KanbanBoard({
     e.preventDefault();
     setDragOverColumn(null);
 
-    if (draggedTask && draggedTask.status !== newStatus) {
+    if (onStatusChange && draggedTask && draggedTask.status !== newStatus) {
       try {
         await onStatusChange(Number(draggedTask.id), newStatus);
       } catch (error) {
@@ -99,13 +100,15 @@ export default function KanbanBoard({
                   </span>
                 </div>
 
+                {onCreateTask && (
                   <button
                     onClick={onCreateTask}
                     className="p-1 hover:bg-background-secondary rounded transition-colors"
                     title="Add Task"
                   >
                     <Plus size={18} className="text-text-secondary hover:text-text-primary" />
-                    </button>
+                  </button>
+                )}
               </div>
 
               {/* Tasks Container */}
@@ -121,7 +124,7 @@ export default function KanbanBoard({
                   columnTasks.map((task) => (
                     <div
                       key={task.id}
-                      draggable
+                      draggable={!!onStatusChange}
                       onDragStart={() => handleDragStart(task)}
                       onDragEnd={handleDragEnd}
                       className={clsx(
@@ -53,40 +53,42 @@ export default function TaskCard({ task, onDelete, onEdit }: TaskCardProps) {
       <div className="flex items-start justify-between mb-3">
         <h3 className="text-text-primary font-medium flex-1 pr-2">{task.title}</h3>
         
-        <div className="relative">
-          <button
-            onClick={() => setShowMenu(!showMenu)}
-            className="p-1 text-text-secondary hover:text-text-primary transition-colors opacity-0 group-hover:opacity-100"
-          >
-            <MoreVertical size={16} />
-          </button>
+        {(onEdit || onDelete) && (
+          <div className="relative">
+            <button
+              onClick={() => setShowMenu(!showMenu)}
+              className="p-1 text-text-secondary hover:text-text-primary transition-colors opacity-0 group-hover:opacity-100"
+            >
+              <MoreVertical size={16} />
+            </button>
           
-          {showMenu && (
-            <>
-              <div className="fixed inset-0 z-10" onClick={() => setShowMenu(false)} />
-              <div className="absolute right-0 mt-2 w-40 bg-surface border border-border rounded-lg shadow-lg z-20 py-1">
-                <button
-                  onClick={() => {
-                    if (onEdit) onEdit(task);
-                    setShowMenu(false);
-                  }}
-                  className="w-full flex items-center gap-2 px-4 py-2 text-sm text-text-secondary hover:bg-background-secondary hover:text-text-primary"
-                >
-                  <Edit2 size={14} />
-                  Edit Task
-                </button>
-                <button
-                  onClick={handleDelete}
-                  disabled={isDeleting}
-                  className="w-full flex items-center gap-2 px-4 py-2 text-sm text-red-400 hover:bg-background-secondary"
-                >
-                  <Trash2 size={14} />
-                  {isDeleting ? 'Deleting...' : 'Delete'}
-                </button>
-              </div>
-            </>
-          )}
-        </div>
+            {showMenu && (
+              <>
+                <div className="fixed inset-0 z-10" onClick={() => setShowMenu(false)} />
+                <div className="absolute right-0 mt-2 w-40 bg-surface border border-border rounded-lg shadow-lg z-20 py-1">
+                  <button
+                    onClick={() => {
+                      if (onEdit) onEdit(task);
+                      setShowMenu(false);
+                    }}
+                    className="w-full flex items-center gap-2 px-4 py-2 text-sm text-text-secondary hover:bg-background-secondary hover:text-text-primary"
+                  >
+                    <Edit2 size={14} />
+                    Edit Task
+                  </button>
+                  <button
+                    onClick={handleDelete}
+                    disabled={isDeleting}
+                    className="w-full flex items-center gap-2 px-4 py-2 text-sm text-red-400 hover:bg-background-secondary"
+                  >
+                    <Trash2 size={14} />
+                    {isDeleting ? 'Deleting...' : 'Delete'}
+                  </button>
+                </div>
+              </>
+            )}
+          </div>
+        )}
       </div>
 
       {/* Description */}
@@ -1,9 +1,10 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import KanbanBoard from '../tasks/KanbanBoard';
 import CreateTaskModal from './CreateTaskModal';
 import EditTaskModal from '../tasks/EditTaskModal';
 import { tasksAPI } from '../../services/api';
-import type { Task, Project } from '../../types';
+import { useProjectEvents } from '../../services/realtime';
+import type { Task, Project, RealtimeEvent } from '../../types';
 
 interface TasksTabProps {
   projectId: number;
@@ -16,37 +17,75 @@ export default function TasksTab({ projectId, project, onTasksUpdate }: TasksTab
   const [loading, setLoading] = useState(true);
   const [showCreateModal, setShowCreateModal] = useState(false);
   const [editingTask, setEditingTask] = useState<Task | null>(null);
+  // Sync cursor from the last fetch; later fetches only transfer what changed since
+  const cursor = useRef('');
+  // Guests can read the project's tasks but not change them
+  const readOnly = !!project.is_guest;
 
   const fetchTasks = async () => {
-    setLoading(true);
     try {
-      const response = await tasksAPI.getByProject(projectId);
-      setTasks(response.data || []);
+      const { data } = await tasksAPI.getChanges(projectId, cursor.current);
+      cursor.current = data.cursor;
+
+      if (data.full) {
+        setTasks(data.tasks);
+      } else {
+        const deleted = new Set(data.deleted);
+        const changed = new Map(data.tasks.map((t) => [t.id, t]));
+        setTasks((prev) => [
+          ...prev.filter((t) => !deleted.has(t.id) && !changed.has(t.id)),
+          ...data.tasks,
+        ].sort((a, b) => Date.parse(a.created_at) - Date.parse(b.created_at) || a.id - b.id));
+      }
     } catch (error) {
       console.error('Error fetching tasks:', error);
-      setTasks([]);
-    } finally {
-      setLoading(false);
+      cursor.current = '';
     }
   };
 
   useEffect(() => {
-    fetchTasks();
+    cursor.current = '';
+    setTasks([]);
+    setLoading(true);
+    fetchTasks().finally(() => setLoading(false));
   }, [projectId]);
 
+  // Apply teammates' (and our own) changes as they happen instead of refetching
+  const live = useProjectEvents(projectId, (event: RealtimeEvent) => {
+    switch (event.type) {
+      case 'task.created':
+        setTasks((prev) => prev.some((t) => t.id === event.data.id) ? prev : [...prev, event.data]);
+        break;
+      case 'task.updated':
+        setTasks((prev) => prev.map((t) => t.id === event.data.id ? {
+          ...t,
+          ...event.data,
+          // Events carry the bare row; keep the joined assignee only if it still applies
+          assignee: event.data.assigned_to === t.assigned_to ? t.assignee : undefined,
+        } : t));
+        break;
+      case 'task.deleted':
+        setTasks((prev) => prev.filter((t) => t.id !== event.data.id));
+        break;
+      case 'resync':
+        fetchTasks();
+        break;
+    }
+  });
+
   const handleCreateTask = () => {
     setShowCreateModal(true);
   };
 
   const handleTaskCreated = () => {
-    fetchTasks();
+    if (!live) fetchTasks();
     onTasksUpdate();
   };
 
   const handleDeleteTask = async (taskId: number) => {
     try {
       await tasksAPI.delete(taskId);
-      fetchTasks();
+      if (!live) fetchTasks();
       onTasksUpdate();
     } catch (error) {
       console.error('Error deleting task:', error);
@@ -59,7 +98,7 @@ export default function TasksTab({ projectId, project, onTasksUpdate }: TasksTab
   };
 
   const handleTaskUpdated = () => {
-    fetchTasks();
+    if (!live) fetchTasks();
     onTasksUpdate();
     setEditingTask(null);
   };
@@ -67,7 +106,7 @@ export default function TasksTab({ projectId, project, onTasksUpdate }: TasksTab
   const handleStatusChange = async (taskId: number, newStatus: 'todo' | 'in_progress' | 'done') => {
     try {
       await tasksAPI.update(taskId, { status: newStatus });
-      fetchTasks();
+      if (!live) fetchTasks();
       onTasksUpdate();
     } catch (error) {
       console.error('Error updating task status:', error);
@@ -92,13 +131,17 @@ export default function TasksTab({ projectId, project, onTasksUpdate }: TasksTab
           </svg>
         </div>
         <h3 className="text-lg font-medium text-text-primary mb-2">No tasks yet</h3>
-        <p className="text-text-secondary mb-4">Get started by creating your first task</p>
-        <button
-          onClick={handleCreateTask}
-          className="px-4 py-2 bg-primary text-white rounded-lg hover:bg-primary/90 transition-colors"
-        >
-          Create First Task
-        </button>
+        {!readOnly && (
+          <>
+            <p className="text-text-secondary mb-4">Get started by creating your first task</p>
+            <button
+              onClick={handleCreateTask}
+              className="px-4 py-2 bg-primary text-white rounded-lg hover:bg-primary/90 transition-colors"
+            >
+              Create First Task
+            </button>
+          </>
+        )}
 
         <CreateTaskModal
           isOpen={showCreateModal}
@@ -115,10 +158,10 @@ export default function TasksTab({ projectId, project, onTasksUpdate }: TasksTab
     <div className="h-full">
       <KanbanBoard
         tasks={tasks}
-        onCreateTask={handleCreateTask}
-        onDeleteTask={handleDeleteTask}
-        onEditTask={handleEditTask}
-        onStatusChange={handleStatusChange}
+        onCreateTask={readOnly ? undefined : handleCreateTask}
+        onDeleteTask={readOnly ? undefined : handleDeleteTask}
+        onEditTask={readOnly ? undefined : handleEditTask}
+        onStatusChange={readOnly ? undefined : handleStatusChange}
       />
 
       {/* Create Task Modal */}
@@ -3,6 +3,7 @@ import { Plus, Users } from 'lucide-react';
 import MemberCard from './MemberCard';
 import InviteMemberModal from './InviteMemberModal';
 import { membersAPI } from '../../services/api';
+import { useProjectEvents } from '../../services/realtime';
 import { useAuth } from '../../contexts/AuthContext';
 import type { ProjectMember } from '../../types';
 
@@ -34,10 +35,17 @@ export default function MemberList({ projectId, isOwner }: MemberListProps) {
     fetchMembers();
   }, [projectId]);
 
+  // Member lists are small; refetch when anyone changes them
+  const live = useProjectEvents(projectId, (event) => {
+    if (event.type.startsWith('member.') || event.type === 'resync') {
+      fetchMembers();
+    }
+  });
+
   const handleRemoveMember = async (userId: string) => {
     try {
       await membersAPI.remove(projectId, userId);
-      await fetchMembers();
+      if (!live) await fetchMembers();
     } catch (error) {
       console.error('Error removing member:', error);
       throw error;
@@ -45,7 +53,7 @@ export default function MemberList({ projectId, isOwner }: MemberListProps) {
   };
 
   const handleMemberAdded = () => {
-    fetchMembers();
+    if (!live) fetchMembers();
     setShowInviteModal(false);
   };
 
@@ -1,16 +1,18 @@
 import { createContext, useContext, useState} from 'react';
 import type { ReactNode } from 'react';
 import type { Project, Task } from '../types';
-import { projectsAPI, tasksAPI } from '../services/api';
+import { dashboardAPI, projectsAPI, tasksAPI } from '../services/api';
 
 interface ProjectContextType {
   projects: Project[];
   currentProject: Project | null;
   tasks: Task[];
+  myTasks: Task[];
   loading: boolean;
   searchQuery: string;
   setSearchQuery: (query: string) => void;
   fetchProjects: () => Promise<void>;
+  fetchDashboard: () => Promise<void>;
   fetchProject: (id: number) => Promise<void>;
   fetchTasks: (projectId: number) => Promise<void>;
   createProject: (data: any) => Promise<Project>;
@@ -27,6 +29,7 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
   const [projects, setProjects] = useState<Project[]>([]);
   const [currentProject, setCurrentProject] = useState<Project | null>(null);
   const [tasks, setTasks] = useState<Task[]>([]);
+  const [myTasks, setMyTasks] = useState<Task[]>([]);
   const [loading, setLoading] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
 
@@ -42,6 +45,20 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
     }
   };
 
+  // Projects with rollups and assigned tasks in a single request
+  const fetchDashboard = async () => {
+    setLoading(true);
+    try {
+      const response = await dashboardAPI.get();
+      setProjects(response.data.projects);
+      setMyTasks(response.data.my_tasks.items);
+    } catch (error) {
+      console.error('Error fetching dashboard:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const fetchProject = async (id: number) => {
     setLoading(true);
     try {
@@ -112,10 +129,12 @@ export function ProjectProvider({ children }: { children: ReactNode }) {
     projects,
     currentProject,
     tasks,
+    myTasks,
     loading,
     searchQuery,
     setSearchQuery,
     fetchProjects,
+    fetchDashboard,
     fetchProject,
     fetchTasks,
     createProject,
@@ -1,14 +1,44 @@
-import { Outlet, useLocation } from 'react-router-dom';
+import { Outlet, useLocation, useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import { useProjects } from '../contexts/ProjectContext';
-import { LogOut, Bell, Search, Code2, X } from 'lucide-react';
-import { useState } from 'react';
+import { LogOut, Bell, Search, Code2, X, CheckSquare, FileText, Folder } from 'lucide-react';
+import { useEffect, useState } from 'react';
+import { searchAPI } from '../services/api';
+import type { SearchResult } from '../types';
+
+const RESULT_ICONS = { task: CheckSquare, file: FileText, project: Folder };
 
 export default function DashboardLayout() {
   const { user, signOut } = useAuth();
   const { setSearchQuery } = useProjects();
   const location = useLocation();
+  const navigate = useNavigate();
   const [localSearch, setLocalSearch] = useState('');
+  const [results, setResults] = useState<SearchResult[]>([]);
+
+  // Server-side search across tasks, files and projects (debounced)
+  useEffect(() => {
+    const query = localSearch.trim();
+    if (query.length < 2) {
+      setResults([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await searchAPI.search(query, { limit: 8 });
+        if (!cancelled) setResults(response.data.items);
+      } catch (error) {
+        console.error('Search error:', error);
+      }
+    }, 250);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [localSearch]);
 
   // Check if we're on a project detail page
   const isProjectDetailPage = location.pathname.startsWith('/projects/') && 
@@ -33,6 +63,11 @@ export default function DashboardLayout() {
     setSearchQuery('');
   };
 
+  const handleResultClick = (result: SearchResult) => {
+    handleClearSearch();
+    navigate(`/projects/${result.project_id}`);
+  };
+
   return (
     <div className="flex h-screen bg-background-primary">
       {/* Top Header - Always visible */}
@@ -53,7 +88,7 @@ export default function DashboardLayout() {
                 <Search className="absolute left-3 top-1/2 -translate-y-1/2 text-text-tertiary" size={20} />
                 <input
                   type="text"
-                  placeholder="Search projects..."
+                  placeholder="Search projects, tasks and files..."
                   value={localSearch}
                   onChange={handleSearchChange}
                   className="w-96 pl-10 pr-10 py-2 bg-background-secondary border border-border rounded-lg text-text-primary placeholder-text-tertiary focus:outline-none focus:ring-2 focus:ring-primary"
@@ -66,6 +101,30 @@ export default function DashboardLayout() {
                     <X size={18} />
                   </button>
                 )}
+                {results.length > 0 && (
+                  <ul className="absolute z-20 mt-2 w-96 max-h-96 overflow-y-auto bg-surface border border-border rounded-lg shadow-lg">
+                    {results.map((result) => {
+                      const Icon = RESULT_ICONS[result.type];
+                      return (
+                        <li key={`${result.type}-${result.id}`}>
+                          <button
+                            onClick={() => handleResultClick(result)}
+                            className="w-full flex items-start gap-3 px-4 py-2 text-left hover:bg-background-secondary transition-colors"
+                          >
+                            <Icon className="mt-0.5 shrink-0 text-text-tertiary" size={16} />
+                            <div className="min-w-0">
+                              <div className="text-sm text-text-primary truncate">{result.title}</div>
+                              <div className="text-xs text-text-secondary truncate">
+                                {result.type === 'project' ? 'Project' : result.project_name}
+                                {result.snippet && ` · ${result.snippet}`}
+                              </div>
+                            </div>
+                          </button>
+                        </li>
+                      );
+                    })}
+                  </ul>
+                )}
               </div>
             )}
           </div>
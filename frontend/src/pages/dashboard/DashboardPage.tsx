@@ -7,12 +7,12 @@ import clsx from 'clsx';
 
 export default function DashboardPage() {
     const navigate = useNavigate();
-    const { projects, loading, fetchProjects, searchQuery } = useProjects();
+    const { projects, loading, fetchDashboard, searchQuery } = useProjects();
     const [viewMode, setViewMode] = useState<'grid' | 'list'>('grid');
     const [statusFilter, setStatusFilter] = useState<'all' | 'active' | 'completed' | 'on-hold'>('all');
 
     useEffect(() => {
-        fetchProjects();
+        fetchDashboard();
     // eslint-disable-next-line react-hooks/exhaustive-deps
     }, []);
 
@@ -35,13 +35,9 @@ export default function DashboardPage() {
         active: projects.filter(p => p.status === 'active').length,
         completed: projects.filter(p => p.status === 'completed').length,
         onHold: projects.filter(p => p.status === 'on-hold').length,
-        totalTasks: projects.reduce((sum, p) => sum + (p.tasks?.length || 0), 0),
-        completedTasks: projects.reduce((sum, p) =>
-            sum + (p.tasks?.filter(t => t.status === 'done').length || 0), 0
-        ),
-        totalMembers: new Set(projects.flatMap(p =>
-            p.members?.map(m => m.user_id) || []
-        )).size,
+        totalTasks: projects.reduce((sum, p) => sum + (p.total_tasks || 0), 0),
+        completedTasks: projects.reduce((sum, p) => sum + (p.task_counts?.done || 0), 0),
+        totalMembers: projects.reduce((sum, p) => sum + (p.member_count || 0), 0),
     };
 
     if (loading) {
@@ -1,6 +1,26 @@
 import axios from 'axios';
 import { API_URL } from '../utils/constants';
 import { supabase } from './supabase';
+import type {
+  DashboardData, FileRecord, Job, Page, SearchResult, TaskChanges, TaskImportSummary, UploadSession,
+} from '../types';
+
+// Keyset pagination params accepted by list endpoints
+export interface PageParams {
+  limit?: number;
+  cursor?: string;
+}
+
+// Task list filters and ordering (comma-separated values; sort like "-priority,due_date")
+export interface TaskQuery extends PageParams {
+  status?: string;
+  priority?: string;
+  assigned_to?: string;  // user ids, 'me' or 'none'
+  due_after?: string;
+  due_before?: string;
+  overdue?: boolean;
+  sort?: string;
+}
 
 // Create axios instance
 const api = axios.create({
@@ -33,16 +53,45 @@ export const projectsAPI = {
   getById: (id: number) => api.get(`/projects/${id}`),
   create: (data: any) => api.post('/projects', data),
   update: (id: number, data: any) => api.put(`/projects/${id}`, data),
-  delete: (id: number) => api.delete(`/projects/${id}`),
+  delete: (id: number) => api.delete<{ message: string; purge_job_id: string | null }>(`/projects/${id}`),
+  getStats: (id: number) => api.get(`/projects/${id}/stats`),
+  // NDJSON records, or a ZIP that also holds the stored files
+  export: (id: number, format: 'ndjson' | 'zip' = 'ndjson') =>
+    api.get<Blob>(`/projects/${id}/export`, { params: { format }, responseType: 'blob' }),
+};
+
+// Dashboard API
+export const dashboardAPI = {
+  get: () => api.get<DashboardData>('/dashboard'),
+};
+
+// Search API (tasks, files and project names in the caller's projects)
+export const searchAPI = {
+  search: (q: string, params?: PageParams & { type?: string }) =>
+    api.get<Page<SearchResult>>('/search', { params: { q, ...params } }),
 };
 
 // Tasks API
 export const tasksAPI = {
-  getByProject: (projectId: number) => api.get(`/projects/${projectId}/tasks`),
+  getByProject: (projectId: number, params?: TaskQuery) =>
+    api.get(`/projects/${projectId}/tasks`, { params }),
+  // Tasks changed since a sync cursor (empty: the full list plus a first cursor)
+  getChanges: (projectId: number, since = '') =>
+    api.get<TaskChanges>(`/projects/${projectId}/tasks`, { params: { since } }),
   create: (projectId: number, data: any) => api.post(`/projects/${projectId}/tasks`, data),
   update: (id: number, data: any) => api.put(`/tasks/${id}`, data),
   delete: (id: number) => api.delete(`/tasks/${id}`),
-  getMyTasks: () => api.get('/my-tasks'),
+  batch: (projectId: number, operations: any[]) =>
+    api.post(`/projects/${projectId}/tasks/batch`, { operations }),
+  // Bulk create from a CSV or NDJSON file (format taken from the file name)
+  import: (projectId: number, file: File) => {
+    const form = new FormData();
+    form.append('file', file);
+    return api.post<TaskImportSummary>(`/projects/${projectId}/tasks/import`, form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+  getMyTasks: (params?: TaskQuery) => api.get('/my-tasks', { params }),
 };
 
 // Members API
@@ -55,18 +104,20 @@ export const membersAPI = {
     api.delete(`/projects/${projectId}/members/${userId}`),
 };
 
-
-// Users API (for searching users)
-export const usersAPI = {
-  search: (email: string) => api.get(`/users/search?email=${encodeURIComponent(email)}`),
-  getById: (id: string) => api.get(`/users/${id}`),
-};
-
 // Files API
 export const filesAPI = {
-  getByProject: (projectId: number) => api.get(`/projects/${projectId}/files`),
+  getByProject: (projectId: number, params?: PageParams) =>
+    api.get(`/projects/${projectId}/files`, { params }),
   upload: (projectId: number, data: any) => api.post(`/projects/${projectId}/files`, data),
+  createUpload: (projectId: number, data: { filename: string; file_size: number; file_type?: string }) =>
+    api.post<UploadSession>(`/projects/${projectId}/uploads`, data),
+  completeUpload: (projectId: number, sessionId: string) =>
+    api.post<FileRecord>(`/projects/${projectId}/files`, { session_id: sessionId }),
   delete: (fileId: number) => api.delete(`/files/${fileId}`),
 };
 
+export const jobsAPI = {
+  get: (jobId: string) => api.get<Job>(`/jobs/${jobId}`),
+};
+
 export default api;
\ No newline at end of file
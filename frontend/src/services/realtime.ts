@@ -0,0 +1,124 @@
+import { useEffect, useRef, useState } from 'react';
+import { API_URL } from '../utils/constants';
+import { supabase } from './supabase';
+import type { RealtimeEvent, RealtimeEventType } from '../types';
+
+// SSE frames are named by event type; EventSource needs a listener per name
+const EVENT_TYPES: RealtimeEventType[] = [
+  'task.created', 'task.updated', 'task.deleted',
+  'file.created', 'file.deleted',
+  'member.added', 'member.updated', 'member.removed',
+  'project.updated', 'project.deleted',
+  'resync', 'revoked', 'expired',
+];
+
+// Access lost or project gone: reconnecting cannot help
+const TERMINAL: RealtimeEventType[] = ['revoked', 'project.deleted'];
+
+const RETRY_MIN_MS = 1000;
+const RETRY_MAX_MS = 30000;
+
+/**
+ * Subscribe to a project's change events over WebSocket, falling back to
+ * Server-Sent Events when a WebSocket cannot be opened. Reconnects with
+ * backoff and a fresh token, resuming after the last event received.
+ * Returns an unsubscribe function.
+ */
+export function subscribeProject(
+  projectId: number,
+  onEvent: (event: RealtimeEvent) => void,
+  onStatus?: (connected: boolean) => void,
+): () => void {
+  let stopped = false;
+  let useSse = typeof WebSocket === 'undefined';
+  let lastId: number | undefined;
+  let retryMs = RETRY_MIN_MS;
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  let socket: WebSocket | null = null;
+  let source: EventSource | null = null;
+
+  const handle = (event: RealtimeEvent) => {
+    lastId = event.id;
+    retryMs = RETRY_MIN_MS;
+    onEvent(event);
+    if (TERMINAL.includes(event.type)) {
+      stop();
+    }
+  };
+
+  const reconnect = () => {
+    onStatus?.(false);
+    if (stopped) return;
+    timer = setTimeout(connect, retryMs);
+    retryMs = Math.min(retryMs * 2, RETRY_MAX_MS);
+  };
+
+  const connect = async () => {
+    const { data: { session } } = await supabase.auth.getSession();
+    if (stopped || !session?.access_token) return;
+
+    const url = `${API_URL}/api/projects/${projectId}/events`;
+    const params = new URLSearchParams();
+    if (lastId !== undefined) params.set('since', String(lastId));
+
+    if (!useSse) {
+      // Browsers cannot set headers on a WebSocket; the token travels as a subprotocol
+      const ws = new WebSocket(`${url.replace(/^http/, 'ws')}?${params}`, ['bearer', session.access_token]);
+      let opened = false;
+      ws.onopen = () => {
+        opened = true;
+        onStatus?.(true);
+      };
+      ws.onmessage = (message) => handle(JSON.parse(message.data));
+      ws.onclose = () => {
+        if (!opened) useSse = true;
+        reconnect();
+      };
+      socket = ws;
+    } else {
+      params.set('access_token', session.access_token);
+      const es = new EventSource(`${url}?${params}`);
+      es.onopen = () => onStatus?.(true);
+      EVENT_TYPES.forEach((type) =>
+        es.addEventListener(type, (message) => handle(JSON.parse((message as MessageEvent).data)))
+      );
+      // Reconnect ourselves so a refreshed token is used
+      es.onerror = () => {
+        es.close();
+        reconnect();
+      };
+      source = es;
+    }
+  };
+
+  const stop = () => {
+    stopped = true;
+    clearTimeout(timer);
+    socket?.close();
+    source?.close();
+    onStatus?.(false);
+  };
+
+  connect();
+  return stop;
+}
+
+/**
+ * Apply a project's change events as they arrive. Returns whether the feed
+ * is connected; while it is not, callers should refetch after their own changes.
+ */
+export function useProjectEvents(
+  projectId: number | undefined,
+  onEvent: (event: RealtimeEvent) => void,
+): boolean {
+  const [connected, setConnected] = useState(false);
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    if (!projectId) return;
+    return subscribeProject(projectId, (event) => handler.current(event), setConnected);
+  }, [projectId]);
+
+  return connected;
+}
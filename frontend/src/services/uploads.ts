@@ -0,0 +1,130 @@
+import { filesAPI } from './api';
+import { supabase } from './supabase';
+import type { FileRecord, UploadSession } from '../types';
+
+const supabaseAnonKey = import.meta.env.VITE_SUPABASE_ANON_KEY;
+const STORAGE_BUCKET = 'project-files';
+const RETRY_DELAYS = [1000, 2000, 4000, 8000];
+
+type Progress = (fraction: number) => void;
+
+interface ResumeState {
+  session: UploadSession;
+  location: string | null;
+}
+
+// Unfinished resumable uploads survive a reload under a key for the selected file
+const resumeKey = (projectId: number, file: File) =>
+  `upload:${projectId}:${file.name}:${file.size}:${file.lastModified}`;
+
+const loadResume = (key: string): ResumeState | null => {
+  try {
+    const state: ResumeState | null = JSON.parse(localStorage.getItem(key) || 'null');
+    return state && new Date(state.session.expires_at) > new Date() ? state : null;
+  } catch {
+    return null;
+  }
+};
+
+const base64 = (value: string) => btoa(String.fromCharCode(...new TextEncoder().encode(value)));
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const tusHeaders = (session: UploadSession): Record<string, string> => ({
+  'Tus-Resumable': '1.0.0',
+  'x-signature': session.upload.token,
+  apikey: supabaseAnonKey,
+});
+
+async function tusRequest(url: string, init: RequestInit): Promise<Response> {
+  const response = await fetch(url, init);
+  if (!response.ok) {
+    throw new Error(`Upload failed (${response.status})`);
+  }
+  return response;
+}
+
+// Bytes the server already holds for a resumable upload
+async function tusOffset(session: UploadSession, location: string): Promise<number> {
+  const response = await tusRequest(location, { method: 'HEAD', headers: tusHeaders(session) });
+  return Number(response.headers.get('Upload-Offset') || 0);
+}
+
+// TUS 1.0 upload against Supabase Storage's signed resumable endpoint, in chunk_size PATCHes
+async function tusUpload(session: UploadSession, file: File, key: string, location: string | null, onProgress?: Progress) {
+  const headers = tusHeaders(session);
+
+  if (!location) {
+    const metadata = {
+      bucketName: session.upload.bucket,
+      objectName: session.file_path,
+      contentType: session.file_type,
+    };
+    const response = await tusRequest(session.upload.tus_endpoint!, {
+      method: 'POST',
+      headers: {
+        ...headers,
+        'Upload-Length': String(file.size),
+        'Upload-Metadata': Object.entries(metadata).map(([name, value]) => `${name} ${base64(value)}`).join(','),
+      },
+    });
+    location = new URL(response.headers.get('Location')!, session.upload.tus_endpoint!).toString();
+    localStorage.setItem(key, JSON.stringify({ session, location }));
+  }
+
+  let offset = await tusOffset(session, location);
+  let failures = 0;
+
+  while (offset < file.size) {
+    onProgress?.(offset / file.size);
+    try {
+      const response = await tusRequest(location, {
+        method: 'PATCH',
+        headers: {
+          ...headers,
+          'Upload-Offset': String(offset),
+          'Content-Type': 'application/offset+octet-stream',
+        },
+        body: file.slice(offset, offset + session.upload.chunk_size),
+      });
+      offset = Number(response.headers.get('Upload-Offset'));
+      failures = 0;
+    } catch (error) {
+      // Back off, then continue from what the server actually received
+      if (failures >= RETRY_DELAYS.length) throw error;
+      await sleep(RETRY_DELAYS[failures++]);
+      offset = await tusOffset(session, location).catch(() => offset);
+    }
+  }
+}
+
+// URL of a stored file (older records hold a data URL in file_path)
+export const fileUrl = (file: FileRecord) =>
+  /^(data|https?):/.test(file.file_path)
+    ? file.file_path
+    : supabase.storage.from(STORAGE_BUCKET).getPublicUrl(file.file_path).data.publicUrl;
+
+// Send a file straight to storage through an upload session, then record it
+export async function uploadProjectFile(projectId: number, file: File, onProgress?: Progress): Promise<FileRecord> {
+  const key = resumeKey(projectId, file);
+  const resume = loadResume(key);
+  const session = resume?.session ?? (await filesAPI.createUpload(projectId, {
+    filename: file.name,
+    file_size: file.size,
+    file_type: file.type || undefined,
+  })).data;
+
+  if (session.upload.method === 'tus') {
+    await tusUpload(session, file, key, resume?.location ?? null, onProgress);
+  } else {
+    const { error } = await supabase.storage
+      .from(session.upload.bucket)
+      .uploadToSignedUrl(session.file_path, session.upload.token, file, { contentType: session.file_type });
+    if (error) throw error;
+  }
+
+  onProgress?.(1);
+  const response = await filesAPI.completeUpload(projectId, session.id);
+  localStorage.removeItem(key);
+  return response.data;
+}
@@ -21,6 +21,16 @@ export interface Project {
   tasks?: Task[];
   members?: ProjectMember[];
   files?: FileRecord[];
+  role?: 'owner' | 'admin' | 'member';
+  is_creator?: boolean;
+  // Invited as a guest by email: the project is read-only
+  is_guest?: boolean;
+  // Rollups (present on projects returned by GET /dashboard)
+  task_counts?: Record<'todo' | 'in_progress' | 'done', number>;
+  total_tasks?: number;
+  overdue?: number;
+  member_count?: number;
+  member_emails?: (string | null)[];
 }
 
 export interface ProjectMember {
@@ -74,6 +84,115 @@ export interface FileRecord {
   };
 }
 
+// Keyset page returned when a list endpoint is called with ?limit=
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Delta sync response (GET /projects/:id/tasks?since=<cursor>); full means replace, not merge
+export interface TaskChanges {
+  tasks: Task[];
+  deleted: number[];
+  cursor: string;
+  full: boolean;
+}
+
+// Direct-to-storage upload issued by POST /projects/:id/uploads
+export interface UploadSession {
+  id: string;
+  project_id: number;
+  file_path: string;
+  filename: string;
+  file_size: number;
+  file_type: string;
+  expires_at: string;
+  upload: {
+    method: 'signed_url' | 'tus';
+    bucket: string;
+    token: string;
+    signed_url: string;
+    tus_endpoint: string | null;
+    chunk_size: number;
+  };
+}
+
+// Result of POST /projects/:id/tasks/import; errors lists the first failed rows by line number
+export interface TaskImportSummary {
+  created: number;
+  failed: number;
+  errors: { row: number | null; error: string }[];
+}
+
+// Background job status (GET /jobs/:id), e.g. the storage purge queued by deleting a project
+export interface Job {
+  id: string;
+  kind: string;
+  status: 'pending' | 'running' | 'done' | 'dead';
+  attempts: number;
+  progress: { removed: number; total: number } | null;
+  last_error: string | null;
+  created_at: string;
+  updated_at: string;
+}
+
+// Ranked match returned by GET /search
+export interface SearchResult {
+  type: 'task' | 'file' | 'project';
+  id: number;
+  project_id: number;
+  project_name: string | null;
+  title: string;
+  snippet: string | null;
+  rank: number;
+}
+
+// Dashboard bundle: projects with rollups plus the first page of assigned tasks
+export interface DashboardData {
+  projects: Project[];
+  my_tasks: Page<Task>;
+}
+
+// Realtime change feed (GET /api/projects/:id/events)
+export type RealtimeEventType =
+  | 'task.created' | 'task.updated' | 'task.deleted'
+  | 'file.created' | 'file.deleted'
+  | 'member.added' | 'member.updated' | 'member.removed'
+  | 'project.updated' | 'project.deleted'
+  // Sent by the server: refetch lists / access lost / token expired
+  | 'resync' | 'revoked' | 'expired';
+
+export interface RealtimeEvent<T = any> {
+  id: number;
+  type: RealtimeEventType;
+  project_id: number;
+  data: T;
+}
+
+// Statistics Types
+export interface ProjectStats {
+  total_tasks: number;
+  completion_rate: number;
+  by_status: Record<'todo' | 'in_progress' | 'done', number>;
+  by_priority: Record<'low' | 'medium' | 'high', number>;
+  overdue: number;
+  by_assignee: {
+    user_id: string;
+    name: string;
+    tasks: number;
+    completed: number;
+  }[];
+  created_per_day: {
+    date: string;
+    count: number;
+  }[];
+  member_count: number;
+  files: {
+    count: number;
+    total_size: number;
+  };
+}
+
 // API Response Types
 export interface ApiResponse<T> {
   data?: T;
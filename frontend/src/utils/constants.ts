@@ -1,5 +1,8 @@
 export const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
+// Largest upload accepted (MAX_FILE_SIZE in the backend config)
+export const MAX_FILE_SIZE = Number(import.meta.env.VITE_MAX_FILE_SIZE) || 10 * 1024 * 1024;
+
 export const ROUTES = {
   HOME: '/',
   DASHBOARD: '/dashboard',